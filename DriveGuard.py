@@ -17,7 +17,7 @@ RECOMMENDED WORKFLOW:
 NEW FEATURES v1.9.1:
 ✅ Auto-detect resume mode (no manual selection needed)
 ✅ Clear notifications when to stop runtime
-✅ Checkpoint after each successful file
+✅ Batched checkpoints, written at once when a rate limit pauses the run
 ✅ Smart resume - automatic state detection
 ✅ Recommends STOPPING RUNTIME instead of waiting
 
@@ -39,7 +39,8 @@ packages = [
     'google-api-python-client',
     'tqdm',
     'requests',
-    'psutil'
+    'psutil',
+    'orjson'
 ]
 
 for package in packages:
@@ -53,17 +54,18 @@ print("✅ Library installation completed!\n")
 # ============================================================
 
 import os
-import json
 import hashlib
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 import io
 import logging
 import gc
-from threading import Lock
+from threading import Lock, local
+from collections import Counter, deque
 import concurrent.futures
 import multiprocessing
+import orjson
 
 # Google Drive API
 from google.colab import auth
@@ -107,6 +109,10 @@ RATE_LIMIT_COOLDOWN_HOURS = 24          # 24-hour cooldown
 # 📝 Storage files
 LOG_FILE = 'backup_log.json'
 STATE_FILE = 'backup_state.json'
+STATE_FLUSH_EVERY = 25      # Per-file state changes between state file writes
+STATE_FLUSH_INTERVAL = 5    # Max seconds between state file writes
+LOG_FLUSH_EVERY = 50        # Backed-up files between log file writes
+LOG_FLUSH_INTERVAL = 30     # Max seconds between log file writes
 
 # 🎯 MANUAL RESUME MODE (Default)
 # True = Recommend STOPPING RUNTIME when rate limit hits (RECOMMENDED)
@@ -137,31 +143,70 @@ print("✅ Authentication successful!\n")
 # STEP 5: CLASS DEFINITIONS
 # ============================================================
 
+def _fsync_dir(path):
+    """Persist a rename by syncing the containing directory"""
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_checkpoint(path, data):
+    """Write bytes via temp file + fsync + os.replace, so a crash never leaves a torn file"""
+    temp_file = path + '.tmp'
+    with open(temp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+    _fsync_dir(path)
+
+
+def _load_checkpoint(path):
+    """Load a JSON checkpoint, falling back to the .tmp copy left by a crash before the rename"""
+    for candidate in (path, path + '.tmp'):
+        if not os.path.exists(candidate):
+            continue
+        try:
+            with open(candidate, 'rb') as f:
+                return orjson.loads(f.read())
+        except Exception as e:
+            print(f"⚠️  Cannot read {candidate}: {e}")
+    return None
+
+
 class BackupState:
     """Manage backup state with optimized manual resume"""
     
     def __init__(self, state_file='backup_state.json'):
         self.state_file = state_file
         self.state = self.load_state()
+        # Changes not yet written, and when the file was last written
+        self._dirty = 0
+        self._last_flush = time.monotonic()
     
     def load_state(self):
         """Load state from file"""
-        if os.path.exists(self.state_file):
-            try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    state = json.load(f)
-                    print(f"📂 Loaded state from {self.state_file}")
-                    return state
-            except:
-                print(f"⚠️  Cannot load state, creating new...")
+        state = _load_checkpoint(self.state_file)
+        if state is not None:
+            print(f"📂 Loaded state from {self.state_file}")
+            # Older state files stored lists of file dicts
+            for key in ('pending_files', 'failed_files'):
+                files = state.get(key) or {}
+                if isinstance(files, list):
+                    files = {f['id']: f for f in files}
+                state[key] = files
+            return state
         
         return {
             'status': 'new',
             'current_folder': None,
-            'pending_files': [],
-            'failed_files': [],
+            'pending_files': {},
+            'failed_files': {},
             'consecutive_rate_limit_errors': 0,
             'last_rate_limit_time': None,
+            'resumable_at': None,
             'backup_folder_id': None,
             'total_files_processed': 0,
             'created_at': datetime.now().isoformat(),
@@ -169,34 +214,60 @@ class BackupState:
         }
     
     def save_state(self):
-        """Save state - Checkpoint after each change"""
+        """Record a change; write once STATE_FLUSH_EVERY changes or STATE_FLUSH_INTERVAL seconds piled up"""
+        self._dirty += 1
+        if (self._dirty >= STATE_FLUSH_EVERY
+                or time.monotonic() - self._last_flush >= STATE_FLUSH_INTERVAL):
+            self._write_state()
+    
+    def flush(self):
+        """Write pending changes to disk now"""
+        if self._dirty:
+            self._write_state()
+    
+    def _write_state(self):
+        """Write state file - Checkpoint"""
         self.state['updated_at'] = datetime.now().isoformat()
-        with open(self.state_file, 'w', encoding='utf-8') as f:
-            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        _write_checkpoint(self.state_file, orjson.dumps(self.state))
+        self._dirty = 0
+        self._last_flush = time.monotonic()
     
     def update(self, **kwargs):
         """Update and save immediately"""
         self.state.update(kwargs)
-        self.save_state()
+        self._write_state()
     
     def can_resume(self):
-        """Check if resume is possible"""
-        if self.state['last_rate_limit_time']:
+        """Check if resume is possible (cooldown deadline is a unix timestamp)"""
+        resumable_at = self.state.get('resumable_at')
+        
+        if resumable_at is None and self.state.get('last_rate_limit_time'):
+            # State saved before resumable_at existed: derive the deadline once
             try:
                 last_error = datetime.fromisoformat(self.state['last_rate_limit_time'])
-                now = datetime.now()
-                hours_passed = (now - last_error).total_seconds() / 3600
-                
-                if hours_passed < RATE_LIMIT_COOLDOWN_HOURS:
-                    remaining = RATE_LIMIT_COOLDOWN_HOURS - hours_passed
-                    next_time = last_error + timedelta(hours=RATE_LIMIT_COOLDOWN_HOURS)
-                    
-                    print(f"\n⏰ NEED TO WAIT {remaining:.1f} MORE HOURS")
-                    print(f"🕐 Try again after: {next_time.strftime('%Y-%m-%d %H:%M:%S')}")
-                    print(f"💡 Recommendation: Wait full time then restart notebook\n")
-                    return False
-            except:
-                pass
+                resumable_at = last_error.timestamp() + RATE_LIMIT_COOLDOWN_HOURS * 3600
+            except (TypeError, ValueError) as e:
+                print(f"\n⚠️  Invalid last_rate_limit_time in {self.state_file}: {e}")
+                print(f"💡 Cooldown cannot be checked - fix or clear the field to resume\n")
+                return False
+        
+        if resumable_at is None:
+            return True
+        
+        try:
+            remaining = float(resumable_at) - time.time()
+        except (TypeError, ValueError) as e:
+            print(f"\n⚠️  Invalid resumable_at in {self.state_file}: {e}")
+            print(f"💡 Cooldown cannot be checked - fix or clear the field to resume\n")
+            return False
+        
+        if remaining > 0:
+            next_time = datetime.fromtimestamp(float(resumable_at))
+            
+            print(f"\n⏰ NEED TO WAIT {remaining / 3600:.1f} MORE HOURS")
+            print(f"🕐 Try again after: {next_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"💡 Recommendation: Wait full time then restart notebook\n")
+            return False
         
         return True
     
@@ -209,6 +280,9 @@ class BackupState:
         """Increment rate limit error counter"""
         self.state['consecutive_rate_limit_errors'] += 1
         self.state['last_rate_limit_time'] = datetime.now().isoformat()
+        if self.state['consecutive_rate_limit_errors'] >= MAX_CONSECUTIVE_RATE_LIMIT_ERRORS:
+            # Deadline computed once here; can_resume only compares numbers
+            self.state['resumable_at'] = time.time() + RATE_LIMIT_COOLDOWN_HOURS * 3600
         self.save_state()
         return self.state['consecutive_rate_limit_errors']
     
@@ -229,6 +303,9 @@ class DriveBackupManager:
         self.service = service
         self.log_file = log_file
         self.backup_log = self.load_log()
+        # Log entries not yet written, and when the log was last written
+        self._log_dirty = 0
+        self._last_log_flush = time.monotonic()
         self.backup_state = BackupState(state_file)
         self.local_temp_dir = '/content/temp_backup'
         os.makedirs(self.local_temp_dir, exist_ok=True)
@@ -239,11 +316,14 @@ class DriveBackupManager:
         else:
             self.max_workers = max_workers
         
+        # Workers only queue log entries; the batch loop moves them into the log
+        self._log_queue = deque()
         self.log_lock = Lock()
         self.state_lock = Lock()
         self.should_stop = False
-        self.download_stats = {'success': 0, 'failed': 0, 'skipped': 0}
-        self.upload_stats = {'success': 0, 'failed': 0}
+        # Stats: one Counter per thread, merged only when read (see stats)
+        self._thread_local = local()
+        self._stat_counters = []
     
     def _auto_detect_workers(self):
         """Auto-detect optimal worker count"""
@@ -259,14 +339,10 @@ class DriveBackupManager:
     
     def load_log(self):
         """Load backup log"""
-        if os.path.exists(self.log_file):
-            try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    log = json.load(f)
-                    print(f"📂 Loaded log from {self.log_file}")
-                    return log
-            except:
-                print("⚠️  Cannot load log, creating new...")
+        log = _load_checkpoint(self.log_file)
+        if log is not None:
+            print(f"📂 Loaded log from {self.log_file}")
+            return log
         
         return {
             'backed_up_files': {},
@@ -276,8 +352,55 @@ class DriveBackupManager:
     def save_log(self):
         """Save backup log"""
         self.backup_log['last_run'] = datetime.now().isoformat()
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            json.dump(self.backup_log, f, indent=2, ensure_ascii=False)
+        _write_checkpoint(self.log_file, orjson.dumps(self.backup_log))
+        self._log_dirty = 0
+        self._last_log_flush = time.monotonic()
+    
+    def _append_log(self, item_id, entry):
+        """Queue a log entry (deque.append is thread-safe, no lock taken)"""
+        self._log_queue.append((item_id, entry))
+    
+    def _drain_log_queue(self):
+        """Move queued entries into the log (call within log_lock)"""
+        while self._log_queue:
+            item_id, entry = self._log_queue.popleft()
+            self.backup_log['backed_up_files'][item_id] = entry
+            self._log_dirty += 1
+    
+    def _checkpoint_log(self):
+        """Drain queued entries; write once LOG_FLUSH_EVERY entries or LOG_FLUSH_INTERVAL seconds piled up"""
+        with self.log_lock:
+            self._drain_log_queue()
+            if self._log_dirty and (self._log_dirty >= LOG_FLUSH_EVERY
+                    or time.monotonic() - self._last_log_flush >= LOG_FLUSH_INTERVAL):
+                self.save_log()
+    
+    def flush_log(self):
+        """Write pending log entries to disk now"""
+        with self.log_lock:
+            self._drain_log_queue()
+            if self._log_dirty:
+                self.save_log()
+    
+    def _count(self, op, outcome, n=1):
+        """Add to this thread's stat counter (no shared lock or dict)"""
+        counter = getattr(self._thread_local, 'stats', None)
+        if counter is None:
+            counter = Counter()
+            self._thread_local.stats = counter
+            self._stat_counters.append(counter)
+        counter[op, outcome] += n
+    
+    @property
+    def stats(self):
+        """Per-thread counters merged into {op: {outcome: count}}"""
+        totals = Counter()
+        for counter in list(self._stat_counters):
+            totals.update(dict(counter))
+        return {
+            'download': {k: totals['download', k] for k in ('success', 'failed', 'skipped')},
+            'upload': {k: totals['upload', k] for k in ('success', 'failed')}
+        }
     
     def get_file_info(self, file_id):
         """Get file/folder information"""
@@ -291,7 +414,7 @@ class DriveBackupManager:
             return None
     
     def list_files(self, folder_id, page_size=1000):
-        """List all files in folder"""
+        """List all files in folder (None if the listing failed)"""
         query = f"'{folder_id}' in parents and trashed=false"
         all_items = []
         page_token = None
@@ -318,7 +441,7 @@ class DriveBackupManager:
                 self._handle_rate_limit()
             else:
                 print(f"❌ Error listing files: {e}")
-            return []
+            return None
     
     def create_folder(self, folder_name, parent_id):
         """Create new folder"""
@@ -347,6 +470,9 @@ class DriveBackupManager:
     def _handle_rate_limit(self):
         """Handle rate limit errors"""
         error_count = self.backup_state.increment_rate_limit_error()
+        self.backup_state.flush()
+        # Files finished before the rate limit must not be redone after the pause
+        self.flush_log()
         
         print(f"\n{'='*80}")
         print(f"⚠️  RATE LIMIT - Occurrence {error_count}/{MAX_CONSECUTIVE_RATE_LIMIT_ERRORS}")
@@ -365,10 +491,10 @@ class DriveBackupManager:
                 print("="*80)
                 
                 # Save paused state
-                pending_files = []
+                pending_files = {}
                 with self.state_lock:
                     if hasattr(self, 'current_batch'):
-                        pending_files = self.current_batch
+                        pending_files = {f['id']: f for f in self.current_batch}
                 
                 self.backup_state.update(
                     status='paused',
@@ -393,21 +519,21 @@ class DriveBackupManager:
                 while not done:
                     status, done = downloader.next_chunk()
             
-            self.download_stats['success'] += 1
+            self._count('download', 'success')
             return True
             
         except HttpError as e:
             if e.resp.status == 429:
                 self._handle_rate_limit()
-                self.download_stats['failed'] += 1
+                self._count('download', 'failed')
                 return False
             else:
                 print(f"❌ Error downloading {file_name}: {e}")
-                self.download_stats['failed'] += 1
+                self._count('download', 'failed')
                 return False
         except Exception as e:
             print(f"❌ Unknown error: {e}")
-            self.download_stats['failed'] += 1
+            self._count('download', 'failed')
             return False
     
     def upload_file(self, local_path, file_name, parent_id):
@@ -430,21 +556,21 @@ class DriveBackupManager:
                 fields='id'
             ).execute()
             
-            self.upload_stats['success'] += 1
+            self._count('upload', 'success')
             return file.get('id')
             
         except HttpError as e:
             if e.resp.status == 429:
                 self._handle_rate_limit()
-                self.upload_stats['failed'] += 1
+                self._count('upload', 'failed')
                 return None
             else:
                 print(f"❌ Error uploading {file_name}: {e}")
-                self.upload_stats['failed'] += 1
+                self._count('upload', 'failed')
                 return None
         except Exception as e:
             print(f"❌ Unknown error: {e}")
-            self.upload_stats['failed'] += 1
+            self._count('upload', 'failed')
             return None
     
     def _process_single_file(self, file_item, backup_folder_id):
@@ -457,7 +583,7 @@ class DriveBackupManager:
         
         # Check if already backed up
         if file_id in self.backup_log['backed_up_files']:
-            self.download_stats['skipped'] += 1
+            self._count('download', 'skipped')
             return None
         
         # Create temporary local path
@@ -477,20 +603,13 @@ class DriveBackupManager:
             pass
         
         if new_file_id:
-            # Save to log immediately
-            with self.log_lock:
-                self.backup_log['backed_up_files'][file_id] = {
-                    'name': file_name,
-                    'type': 'file',
-                    'backup_id': new_file_id,
-                    'backup_time': datetime.now().isoformat()
-                }
-                self.save_log()
-            
-            # Update state
-            with self.state_lock:
-                self.backup_state.state['total_files_processed'] += 1
-                self.backup_state.save_state()
+            # Queue for the log; the batch loop records it (see _checkpoint_log)
+            self._append_log(file_id, {
+                'name': file_name,
+                'type': 'file',
+                'backup_id': new_file_id,
+                'backup_time': datetime.now().isoformat()
+            })
             
             return {'id': file_id, 'name': file_name, 'status': 'success'}
         else:
@@ -503,13 +622,26 @@ class DriveBackupManager:
         
         print(f"\n📥 Processing {len(files)} files...")
         
+        # Already backed up (resume): skip here instead of submitting them
+        backed_up = self.backup_log['backed_up_files']
+        todo = [f for f in files if f['id'] not in backed_up]
+        skipped = len(files) - len(todo)
+        if skipped:
+            self._count('download', 'skipped', skipped)
+            print(f"⏭️  Skipped {skipped} already backed up files")
+        files = todo
+        if not files:
+            return
+        
         # Save current batch
         self.current_batch = files
         
-        failed_files = []
+        failed_files = {}
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            with tqdm(total=len(files), desc="Progress") as pbar:
+            # One bar for the batch, advanced by each finished file's size
+            with tqdm(total=sum(int(f.get('size') or 0) for f in files),
+                      desc=f"📥 {len(files)} files", unit='B', unit_scale=True) as pbar:
                 futures = {
                     executor.submit(self._process_single_file, f, backup_folder_id): f 
                     for f in files
@@ -520,69 +652,92 @@ class DriveBackupManager:
                         executor.shutdown(wait=False, cancel_futures=True)
                         break
                     
+                    file_item = futures[future]
                     try:
                         result = future.result()
                         if result and result['status'] == 'failed':
-                            failed_files.append(futures[future])
+                            failed_files[file_item['id']] = file_item
+                        elif result:
+                            # Only this loop updates the count, so workers never wait on state_lock
+                            with self.state_lock:
+                                self.backup_state.state['total_files_processed'] += 1
+                                self.backup_state.save_state()
                     except Exception as e:
                         print(f"❌ Processing error: {e}")
-                        failed_files.append(futures[future])
+                        failed_files[file_item['id']] = file_item
                     
-                    pbar.update(1)
-                    
-                    # Memory cleanup
-                    if pbar.n % 10 == 0:
-                        gc.collect()
+                    pbar.set_postfix_str(file_item['name'][:40], refresh=False)
+                    pbar.update(int(file_item.get('size') or 0))
+                    self._checkpoint_log()
         
         # Save failed files to state
         if failed_files:
             with self.state_lock:
-                current_failed = self.backup_state.state.get('failed_files', [])
-                current_failed.extend(failed_files)
+                # Keyed by file ID: a file failing again replaces its entry
+                current_failed = self.backup_state.state.get('failed_files', {})
+                current_failed.update(failed_files)
                 self.backup_state.update(failed_files=current_failed)
     
-    def _backup_folder_recursive(self, source_folder_id, backup_folder_id):
-        """Recursively backup folder"""
-        if self.should_stop:
-            return
-        
-        # Get items list
+    def _open_folder(self, source_folder_id, backup_folder_id, folder_item):
+        """List a folder into one stack frame of the walk"""
         items = self.list_files(source_folder_id)
-        
-        if not items:
-            return
+        listed = items is not None
+        items = items or []
         
         # Categorize
         folders = [i for i in items if i['mimeType'] == 'application/vnd.google-apps.folder']
         files = [i for i in items if i['mimeType'] != 'application/vnd.google-apps.folder']
         
-        # Process folders first
-        for folder_item in folders:
-            if self.should_stop:
-                break
-            
-            item_id = folder_item['id']
-            item_name = folder_item['name']
+        return {
+            'item': folder_item,  # None for the root folder
+            'backup_id': backup_folder_id,
+            'folders': iter(folders),
+            'files': files,
+            'listed': listed  # False: listing failed, so never mark the folder done
+        }
+    
+    def _backup_folder_recursive(self, source_folder_id, backup_folder_id):
+        """
+        Backup folder tree depth-first (subfolders first, then files)
+        Walks with an explicit stack, so deep trees never hit the recursion limit.
+        A folder is logged only once it was listed and finished without a stop.
+        """
+        if self.should_stop:
+            return
+        
+        stack = [self._open_folder(source_folder_id, backup_folder_id, None)]
+        
+        while stack and not self.should_stop:
+            frame = stack[-1]
             
-            if item_id in self.backup_log['backed_up_files']:
+            # Process folders first
+            folder_item = next(frame['folders'], None)
+            if folder_item is not None:
+                item_id = folder_item['id']
+                item_name = folder_item['name']
+                
+                if item_id in self.backup_log['backed_up_files']:
+                    continue
+                
+                print(f"\n📁 Processing: {item_name}")
+                new_folder_id = self.create_folder(item_name, frame['backup_id'])
+                
+                if new_folder_id:
+                    stack.append(self._open_folder(item_id, new_folder_id, folder_item))
                 continue
             
-            print(f"\n📁 Processing: {item_name}")
-            new_folder_id = self.create_folder(item_name, backup_folder_id)
+            # Subfolders done: process files
+            stack.pop()
+            if frame['files'] and not self.should_stop:
+                self._process_files_batch(frame['files'], frame['backup_id'])
             
-            if new_folder_id:
-                self._backup_folder_recursive(item_id, new_folder_id)
-                
-                with self.log_lock:
-                    self.backup_log['backed_up_files'][item_id] = {
-                        'name': item_name,
-                        'type': 'folder',
-                        'backup_time': datetime.now().isoformat()
-                    }
-        
-        # Process files
-        if files and not self.should_stop:
-            self._process_files_batch(files, backup_folder_id)
+            if frame['item'] is not None and frame['listed'] and not self.should_stop:
+                self._append_log(frame['item']['id'], {
+                    'name': frame['item']['name'],
+                    'type': 'folder',
+                    'backup_time': datetime.now().isoformat()
+                })
+                self._checkpoint_log()
     
     def smart_backup(self):
         """
@@ -610,12 +765,13 @@ class DriveBackupManager:
             
             print(f"📁 Backup folder: {backup_folder_id}")
             
-            pending = self.backup_state.state.get('pending_files', [])
-            failed = self.backup_state.state.get('failed_files', [])
+            pending = self.backup_state.state.get('pending_files', {})
+            failed = self.backup_state.state.get('failed_files', {})
             
             print(f"📊 Pending: {len(pending)} | Failed: {len(failed)}")
             
-            all_retry = pending + failed
+            # A file both pending and failed is retried once
+            all_retry = list({**pending, **failed}.values())
             
             if all_retry:
                 print(f"\n🔄 Retrying {len(all_retry)} files...")
@@ -623,8 +779,8 @@ class DriveBackupManager:
                 
                 if not self.should_stop:
                     self.backup_state.update(
-                        pending_files=[],
-                        failed_files=[],
+                        pending_files={},
+                        failed_files={},
                         status='completed'
                     )
                     print("\n✅ Resume completed!")
@@ -632,6 +788,8 @@ class DriveBackupManager:
                 print("\n✅ No files need retry!")
                 self.backup_state.update(status='completed')
             
+            self.flush_log()
+            self.backup_state.flush()
             return backup_folder_id
         
         # New backup
@@ -656,12 +814,15 @@ class DriveBackupManager:
             current_folder=SOURCE_FOLDER_ID
         )
         
-        self.download_stats = {'success': 0, 'failed': 0, 'skipped': 0}
-        self.upload_stats = {'success': 0, 'failed': 0}
+        self._thread_local = local()
+        self._stat_counters = []
         
         self._backup_folder_recursive(SOURCE_FOLDER_ID, backup_folder_id)
         
-        self.save_log()
+        with self.log_lock:
+            self._drain_log_queue()
+            self.save_log()
+        self.backup_state.flush()
         
         if self.should_stop:
             print(f"\n⏸️  BACKUP PAUSED")
@@ -669,9 +830,10 @@ class DriveBackupManager:
             self.backup_state.update(status='completed')
             print(f"\n✅ BACKUP COMPLETED!")
         
-        print(f"\n📊 Download: ✅ {self.download_stats['success']} | "
-              f"❌ {self.download_stats['failed']} | ⏭️ {self.download_stats['skipped']}")
-        print(f"📊 Upload: ✅ {self.upload_stats['success']} | ❌ {self.upload_stats['failed']}")
+        stats = self.stats
+        print(f"\n📊 Download: ✅ {stats['download']['success']} | "
+              f"❌ {stats['download']['failed']} | ⏭️ {stats['download']['skipped']}")
+        print(f"📊 Upload: ✅ {stats['upload']['success']} | ❌ {stats['upload']['failed']}")
         
         return backup_folder_id
     
@@ -729,7 +891,18 @@ print("🚀 STARTING BACKUP...")
 start_time = time.time()
 
 # SMART BACKUP - Auto-detect resume or new backup
-backup_folder_id = backup_manager.smart_backup()
+# Full collections stop every worker; a high gen0 threshold lets the
+# generational GC run rarely and amortized, with one collection at the
+# end. freeze() keeps the loaded log out of those collections.
+_gc_threshold = gc.get_threshold()
+gc.freeze()
+gc.set_threshold(50000, 20, 20)
+try:
+    backup_folder_id = backup_manager.smart_backup()
+finally:
+    gc.set_threshold(*_gc_threshold)
+    gc.unfreeze()
+    gc.collect()
 
 end_time = time.time()
 
@@ -763,16 +936,16 @@ else:
 def view_state():
     """View backup state"""
     if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, 'r') as f:
-            state = json.load(f)
+        with open(STATE_FILE, 'rb') as f:
+            state = orjson.loads(f.read())
             print("\n📊 BACKUP STATE:")
-            print(json.dumps(state, indent=2, ensure_ascii=False))
+            print(orjson.dumps(state, option=orjson.OPT_INDENT_2).decode())
 
 def view_log():
     """View backup log"""
     if os.path.exists(LOG_FILE):
-        with open(LOG_FILE, 'r') as f:
-            log = json.load(f)
+        with open(LOG_FILE, 'rb') as f:
+            log = orjson.loads(f.read())
             print(f"\n📊 BACKUP LOG:")
             print(f"Total backed up files: {len(log['backed_up_files'])}")
 
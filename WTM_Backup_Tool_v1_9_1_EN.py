@@ -49,19 +49,33 @@ MEMORY OPTIMIZATIONS:
 print("📦 Installing dependencies...")
 import subprocess
 import sys
+import importlib.util
+
+# pip package -> import name
+packages = {
+    'google-auth': 'google.auth',
+    'google-auth-oauthlib': 'google_auth_oauthlib',
+    'google-auth-httplib2': 'google_auth_httplib2',
+    'google-api-python-client': 'googleapiclient',
+    'tqdm': 'tqdm',
+    'requests': 'requests',
+    'psutil': 'psutil',
+    'orjson': 'orjson',
+    'blake3': 'blake3'
+}
+
+
+def _is_installed(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
 
-packages = [
-    'google-auth',
-    'google-auth-oauthlib',
-    'google-auth-httplib2',
-    'google-api-python-client',
-    'tqdm',
-    'requests',
-    'psutil'
-]
 
-for package in packages:
-    subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-q', package])
+# One pip run for the missing packages only (Colab preinstalls most)
+missing = [package for package, module in packages.items() if not _is_installed(module)]
+if missing:
+    subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-q', *missing])
 
 print("✅ Dependencies installed!\n")
 
@@ -70,40 +84,126 @@ print("✅ Dependencies installed!\n")
 # ============================================================
 
 import os
-import json
 import hashlib
 import time
 import random
-from datetime import datetime, timedelta
-from pathlib import Path
-import io
+import tempfile
+import mmap
+import zipfile
+import shutil
+from datetime import datetime, timedelta, timezone
 import logging
+import logging.handlers
+import queue
 import gc
 import signal
 import atexit
-from threading import Lock, Event, RLock
-from contextlib import contextmanager
+from threading import Lock, Event, RLock, Condition, local
+from contextlib import contextmanager, nullcontext
 import concurrent.futures
 import multiprocessing
-from collections import deque
+from collections import Counter, deque
 from typing import Optional, Dict, List, Any, Tuple
 
 # Google Drive API
-from google.colab import auth
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
+from google.colab import auth, files
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import MediaFileUpload, MediaUpload
 from googleapiclient.errors import HttpError
 from google.auth import default
+from google.auth.transport.requests import AuthorizedSession
+import httplib2
+import google_auth_httplib2
 
-# Progress bar
-from tqdm.notebook import tqdm
+# Pooled HTTP for media downloads
+import requests
 
 # System monitoring
 import psutil
 
+# Fast JSON (C extension) for the backup log
+import orjson
+
+# SIMD hashing for the local integrity ledger
+from blake3 import blake3
+
 # Suppress warnings
 logging.getLogger('google_auth_httplib2').setLevel(logging.ERROR)
 
+# Per-file messages: workers only enqueue records, one listener thread prints them
+logger = logging.getLogger('driveguard')
+
+
+class _RecentEventsHandler(logging.Handler):
+    """Keep the last per-file events in memory for view_log()"""
+
+    def __init__(self, events: deque):
+        super().__init__()
+        self.events = events
+
+    def emit(self, record):
+        self.events.append(self.format(record))
+
+
+if not logger.handlers:
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    _log_queue = queue.Queue()
+    _recent_events = deque(maxlen=200)
+    _console_handler = logging.StreamHandler(sys.stdout)
+    _console_handler.setFormatter(logging.Formatter('%(message)s'))
+    # Per-file successes only reach the console in verbose mode; the progress bar covers them
+    _console_handler.addFilter(lambda record: VERBOSE_FILE_LOG or record.levelno >= logging.WARNING)
+    _recent_handler = _RecentEventsHandler(_recent_events)
+    _recent_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s', '%H:%M:%S'))
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _console_handler, _recent_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# ============================================================
+# CONSOLE BANNERS
+# ============================================================
+
+_RULE = "=" * 80
+
+_WORKFLOW_BANNER = (
+    f"\n{_RULE}\n"
+    "🎯 RECOMMENDED WORKFLOW:\n"
+    f"{_RULE}\n"
+    "1. Run backup normally\n"
+    "2. If rate limit occurs → STOP RUNTIME\n"
+    "3. Wait 24 hours\n"
+    "4. Restart notebook → Auto-resume\n"
+    f"{_RULE}\n"
+)
+
+_NEXT_STEPS_BANNER = (
+    "\n💡 NEXT STEPS:\n"
+    f"{_RULE}\n"
+    "✅ State saved safely\n"
+    "✅ STOP RUNTIME NOW (Runtime → Disconnect)\n"
+    "✅ Wait 24 hours\n"
+    "✅ Reopen notebook → Run all → Auto-resume\n"
+    f"{_RULE}\n"
+)
+
+_UTILITIES_BANNER = (
+    f"\n{_RULE}\n"
+    "                        UTILITIES\n"
+    f"{_RULE}\n"
+    "\n"
+    "view_state()                    # View current backup state\n"
+    "view_log()                      # View backup log + recent events\n"
+    "view_all()                      # Both of the above (files read in parallel)\n"
+    "download_files()                # Download state + log files\n"
+    "get_circuit_breaker_status()    # Check circuit breaker\n"
+    "force_reset_circuit_breaker()   # Reset circuit breaker (caution!)\n"
+    "\n"
+    f"{_RULE}\n"
+)
+
 # ============================================================
 # CONFIGURATION
 # ============================================================
@@ -115,6 +215,7 @@ BACKUP_PARENT_ID = '1l22lxlpDoK6987665422iiiooooaab'  # ⚠️ CHANGE THIS
 # 🏷️ Settings
 FOLDER_SUFFIX = '_BACKUP'
 MAX_WORKERS = None  # Auto-detect
+SERVER_SIDE_COPY = True  # Copy inside Drive first, download + upload only as fallback
 
 # 🛡️ Rate Limit Protection (Circuit Breaker Pattern)
 RATE_LIMIT_THRESHOLD = 3          # Failures before circuit opens
@@ -130,35 +231,58 @@ MANUAL_RESUME_MODE = True
 
 # 🔧 Advanced Settings
 CHUNK_SIZE = 10 * 1024 * 1024      # 10MB chunks
+MIN_CHUNK_SIZE = 256 * 1024         # Adaptive upload chunk lower bound
+MAX_CHUNK_SIZE = 32 * 1024 * 1024   # Adaptive upload chunk upper bound
+MEDIA_READ_SIZE = 1024 * 1024       # Download read size (single streamed GET per file)
+HTTP_TIMEOUT = 120                  # Seconds without data before a download fails
 MAX_RETRIES = 3                     # Per operation retries
 INITIAL_BACKOFF = 5                 # Initial backoff seconds (increased from 2)
 MAX_BACKOFF = 300                   # Max backoff seconds
 MEMORY_CLEANUP_THRESHOLD = 80       # RAM % threshold for cleanup
+MEMORY_CHECK_EVERY = 200            # Files between RAM checks (each reads /proc)
 MAX_FILE_HANDLES = 10               # Max concurrent file handles
+VERBOSE_FILE_LOG = False            # Print every per-file event (else warnings; view_log() shows recent)
+LOG_PRETTY_JSON = False             # Indent log snapshot and state file (debugging only)
+LOG_FLUSH_EVERY = 50                # Files between journal fsyncs
+LOG_FLUSH_INTERVAL = 30             # Max seconds between journal fsyncs
+LOG_COMPACT_EVERY = 1000            # Min journal entries between log snapshots (or 1/4 of the log)
+LOG_IO_BUFFER = 1 << 20             # Journal read/append buffer (default 8 KB means many small syscalls)
+JSON_MMAP_MIN_SIZE = 1 << 20        # JSON files at least this big are parsed from mmap, not a copy
+STATE_FLUSH_EVERY = 25              # Per-file state changes between state file writes
+STATE_FLUSH_INTERVAL = 5            # Max seconds between state file writes
+LIST_BATCH_FOLDERS = 50             # Sibling folders listed per query
+COPY_BATCH_SIZE = 100               # Server-side copies per batch HTTP request (Drive max 100)
+STREAM_SPOOL_SIZE = 4 * CHUNK_SIZE  # Per-file RAM buffer before spilling to disk
+SIMPLE_UPLOAD_MAX = 5 * 1024 * 1024 # Smaller files upload in one multipart POST
 
 # 🚦 Global Rate Limiting (NEW - prevents API quota exceeded)
 GLOBAL_RATE_LIMIT_DELAY = 1.0      # Seconds between API calls (global)
+GLOBAL_RATE_LIMIT_BURST = 3        # API calls allowed back-to-back before pacing
 MAX_CONCURRENT_WORKERS = 3          # Max concurrent workers (user preference)
+DRIVE_QPS_LIMIT = 10                # Drive API quota per user (queries/second)
+
+# Drive MIME type for folders
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+
+# HTTP statuses worth retrying for plain API calls
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Drive error reasons that count as rate limiting
+RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded', 'quotaExceeded'})
+
+_CONFIG_BANNER = (
+    f"{_RULE}\n"
+    "⚙️  CONFIGURATION:\n"
+    f"{_RULE}\n"
+    f"📁 Source: {SOURCE_FOLDER_ID}\n"
+    f"📁 Backup Parent: {BACKUP_PARENT_ID}\n"
+    f"🎯 Mode: {'MANUAL RESUME' if MANUAL_RESUME_MODE else 'AUTO RESUME'}\n"
+    f"🛡️ Rate Limit: {RATE_LIMIT_THRESHOLD} errors in {RATE_LIMIT_WINDOW_SECONDS}s\n"
+    f"💾 Chunk Size: {CHUNK_SIZE / (1024*1024):.0f}MB\n"
+    f"{_RULE}\n"
+)
 
-print("="*80)
-print("⚙️  CONFIGURATION:")
-print("="*80)
-print(f"📁 Source: {SOURCE_FOLDER_ID}")
-print(f"📁 Backup Parent: {BACKUP_PARENT_ID}")
-print(f"🎯 Mode: {'MANUAL RESUME' if MANUAL_RESUME_MODE else 'AUTO RESUME'}")
-print(f"🛡️ Rate Limit: {RATE_LIMIT_THRESHOLD} errors in {RATE_LIMIT_WINDOW_SECONDS}s")
-print(f"💾 Chunk Size: {CHUNK_SIZE / (1024*1024):.0f}MB")
-print("="*80 + "\n")
-
-# ============================================================
-# AUTHENTICATION
-# ============================================================
-
-print("🔐 Authenticating with Google Drive...")
-auth.authenticate_user()
-creds, _ = default()
-drive_service = build('drive', 'v3', credentials=creds)
-print("✅ Authentication successful!\n")
+print(_CONFIG_BANNER)
 
 # ============================================================
 # UTILITY CLASSES
@@ -168,7 +292,10 @@ class CircuitBreaker:
     """
     Circuit breaker pattern for rate limit protection.
 
-    States:
+    Scoped per operation ('download', 'upload', 'copy'): Drive applies
+    separate quotas, so one exhausted operation does not block the others.
+
+    States (per operation):
     - CLOSED: Normal operation
     - OPEN: Too many failures, block all requests
     - HALF_OPEN: Testing if service recovered
@@ -179,19 +306,29 @@ class CircuitBreaker:
         self.window_seconds = window_seconds
         self.cooldown_seconds = cooldown_hours * 3600
 
-        self.state = 'CLOSED'
-        self.failures = deque()  # Timestamps of failures
-        self.last_failure_time = None
+        # op -> 'CLOSED' | 'OPEN' | 'HALF_OPEN' (missing means CLOSED)
+        self.state = {}
+        self.failures = {}  # op -> timestamps of failures
+        # Monotonic clock for interval math, wall clock only for display
+        self.last_failure_time = {}
+        self.last_failure_wall_time = {}
         self.lock = RLock()
 
-    def record_success(self):
-        """Record successful operation"""
+    def record_success(self, op: str) -> bool:
+        """
+        Record successful operation
+
+        Returns:
+            bool: True if the circuit just closed again (recovered)
+        """
         with self.lock:
-            if self.state == 'HALF_OPEN':
-                self.state = 'CLOSED'
-                self.failures.clear()
+            if self.state.get(op) == 'HALF_OPEN':
+                self.state[op] = 'CLOSED'
+                self.failures[op].clear()
+                return True
+            return False
 
-    def record_failure(self) -> bool:
+    def record_failure(self, op: str) -> bool:
         """
         Record failure and return True if circuit should open.
 
@@ -199,65 +336,82 @@ class CircuitBreaker:
             bool: True if circuit breaker tripped
         """
         with self.lock:
-            now = time.time()
-            self.last_failure_time = now
-            self.failures.append(now)
+            now = time.monotonic()
+            self.last_failure_time[op] = now
+            self.last_failure_wall_time[op] = time.time()
+            failures = self.failures.setdefault(op, deque())
+            failures.append(now)
 
             # Remove old failures outside window
             cutoff = now - self.window_seconds
-            while self.failures and self.failures[0] < cutoff:
-                self.failures.popleft()
+            while failures and failures[0] < cutoff:
+                failures.popleft()
 
             # Check if threshold exceeded
-            if len(self.failures) >= self.threshold:
-                self.state = 'OPEN'
+            if len(failures) >= self.threshold:
+                self.state[op] = 'OPEN'
                 return True
 
             return False
 
-    def can_proceed(self) -> Tuple[bool, Optional[str]]:
+    def can_proceed(self, op: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
         Check if operation can proceed.
 
+        With no `op`, every operation's circuit must allow it.
+
         Returns:
             Tuple[bool, Optional[str]]: (can_proceed, reason_if_blocked)
         """
         with self.lock:
-            if self.state == 'CLOSED':
-                return True, None
+            for name in ([op] if op else list(self.state)):
+                state = self.state.get(name, 'CLOSED')
 
-            if self.state == 'OPEN':
-                if self.last_failure_time:
-                    elapsed = time.time() - self.last_failure_time
+                if state == 'OPEN':
+                    elapsed = time.monotonic() - self.last_failure_time[name]
 
                     if elapsed >= self.cooldown_seconds:
-                        self.state = 'HALF_OPEN'
-                        return True, None
+                        self.state[name] = 'HALF_OPEN'
+                        continue
 
                     remaining = self.cooldown_seconds - elapsed
                     next_time = datetime.fromtimestamp(
-                        self.last_failure_time + self.cooldown_seconds
+                        self.last_failure_wall_time[name] + self.cooldown_seconds
                     )
 
                     return False, (
-                        f"Circuit breaker OPEN. "
+                        f"Circuit breaker OPEN ({name}). "
                         f"Wait {remaining/3600:.1f}h more. "
                         f"Resume after: {next_time.strftime('%Y-%m-%d %H:%M:%S')}"
                     )
 
-            if self.state == 'HALF_OPEN':
-                return True, None
+            return True, None
 
-            return False, "Unknown circuit breaker state"
+    def reset(self):
+        """Close every circuit and forget recorded failures"""
+        with self.lock:
+            self.state.clear()
+            self.failures.clear()
 
     def get_status(self) -> Dict[str, Any]:
-        """Get current status"""
+        """Get current status (overall plus per operation)"""
         with self.lock:
+            ops = {
+                name: {
+                    'state': self.state.get(name, 'CLOSED'),
+                    'failures_in_window': len(self.failures.get(name, ())),
+                    'last_failure': self.last_failure_wall_time.get(name)
+                }
+                for name in sorted(set(self.state) | set(self.failures))
+            }
+            states = {status['state'] for status in ops.values()}
+            overall = next((st for st in ('OPEN', 'HALF_OPEN') if st in states), 'CLOSED')
             return {
-                'state': self.state,
-                'failures_in_window': len(self.failures),
+                'state': overall,
+                'failures_in_window': max((st['failures_in_window'] for st in ops.values()), default=0),
                 'threshold': self.threshold,
-                'last_failure': self.last_failure_time
+                'last_failure': max((st['last_failure'] for st in ops.values() if st['last_failure']), default=None),
+                'ops': ops
             }
 
 
@@ -329,9 +483,9 @@ class MemoryMonitor:
             bool: True if cleanup was performed
         """
         try:
-            mem = psutil.virtual_memory()
-            if mem.percent > self.threshold:
-                gc.collect()
+            # System-wide RAM %, the same figure get_usage() and print_stats report
+            if psutil.virtual_memory().percent > self.threshold:
+                gc.collect(generation=2)
                 return True
         except:
             pass
@@ -352,85 +506,448 @@ class MemoryMonitor:
 
 class GlobalRateLimiter:
     """
-    Global rate limiter to control API call frequency across all threads.
-    Prevents hitting Google Drive quota limits.
+    Global token bucket shared by all threads.
+
+    One token is added every `min_delay` seconds, up to `burst` tokens, so
+    short bursts pass at once while the long-run rate stays at or below
+    1/min_delay calls per second. Waiting happens outside the lock.
     """
 
-    def __init__(self, min_delay: float = 1.0):
+    def __init__(self, min_delay: float = 1.0, burst: int = 1):
         self.min_delay = min_delay
-        self.last_call_time = 0.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
         self.lock = Lock()
 
-    def acquire(self):
+    def _refill(self):
+        """Add tokens earned since the last refill (must be called within lock)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) / self.min_delay)
+        self.last_refill = now
+
+    def acquire(self, n: int = 1):
         """
-        Wait if necessary to respect rate limit.
-        Thread-safe - only one thread can pass at a time.
+        Take `n` tokens (one per API call), waiting until they are available.
+        Thread-safe - a negative balance queues callers without holding the lock.
         """
         with self.lock:
-            now = time.time()
-            elapsed = now - self.last_call_time
-
-            if elapsed < self.min_delay:
-                sleep_time = self.min_delay - elapsed
-                time.sleep(sleep_time)
+            self._refill()
+            self.tokens -= n
+            wait = -self.tokens * self.min_delay if self.tokens < 0 else 0.0
 
-            self.last_call_time = time.time()
+        if wait > 0:
+            time.sleep(wait)
 
     def set_delay(self, delay: float):
         """Dynamically adjust delay (e.g., increase after rate limit errors)"""
         with self.lock:
+            self._refill()
             self.min_delay = delay
 
 
+class BackoffScheduler:
+    """
+    Retry scheduler using "decorrelated jitter" backoff.
+
+    sleep = min(cap, uniform(base, previous_sleep * 3))
+
+    Each worker thread keeps its own sleep series (thread-local), so workers
+    that hit a rate limit at the same moment do not retry at the same moment.
+    """
+
+    def __init__(self, base: float, cap: float):
+        self.base = base
+        self.cap = cap
+        self._local = local()  # Last sleep of the current thread
+        self._generation = 0   # Bumped by reset_all() to restart every series
+
+    def next_sleep(self) -> float:
+        """
+        Compute next sleep for the current thread.
+
+        Returns:
+            float: Seconds to wait before retrying
+        """
+        prev = self.base
+        if getattr(self._local, 'generation', None) == self._generation:
+            prev = self._local.sleep
+
+        sleep = min(self.cap, random.uniform(self.base, prev * 3))
+        self._local.sleep = sleep
+        self._local.generation = self._generation
+        return sleep
+
+    def reset(self):
+        """Reset the current thread's series after a successful operation"""
+        self._local.generation = None
+
+    def reset_all(self):
+        """Reset every thread's series (e.g. circuit breaker recovered)"""
+        self._generation += 1
+
+
+class ChunkSizer:
+    """
+    AIMD chunk size for resumable uploads (one per worker thread).
+
+    Grows by 25% after `grow_after` successful chunks in a row, halves on
+    timeouts and rate limits. Always a multiple of 256KB (Drive requirement).
+    """
+
+    QUANTUM = 256 * 1024
+
+    def __init__(self, initial: int, minimum: int, maximum: int, grow_after: int = 3):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.grow_after = grow_after
+        self.value = self._clamp(initial)
+        self._streak = 0
+
+    def _clamp(self, size: int) -> int:
+        size = max(self.minimum, min(self.maximum, size))
+        return max(self.QUANTUM, size - size % self.QUANTUM)
+
+    def record_success(self):
+        """Chunk uploaded"""
+        self._streak += 1
+        if self._streak >= self.grow_after:
+            self._streak = 0
+            self.value = self._clamp(self.value + self.value // 4)
+
+    def record_failure(self):
+        """Timeout or rate limit"""
+        self._streak = 0
+        self.value = self._clamp(self.value // 2)
+
+
+class HashingWriter:
+    """
+    File-like proxy that hashes bytes while they are written.
+
+    MD5 is compared with Drive's md5Checksum, so it is only computed when
+    there is a checksum to compare (`md5=True`); BLAKE3 goes to the backup
+    log as a faster local integrity record.
+    """
+
+    def __init__(self, inner, md5: bool = True):
+        self.inner = inner
+        self._md5 = hashlib.md5() if md5 else None
+        self._blake3 = blake3()
+
+    def write(self, data: bytes) -> int:
+        if self._md5 is not None:
+            self._md5.update(data)
+        self._blake3.update(data)
+        return self.inner.write(data)
+
+    def md5_hexdigest(self) -> Optional[str]:
+        return self._md5.hexdigest() if self._md5 is not None else None
+
+    def blake3_hexdigest(self) -> str:
+        return self._blake3.hexdigest()
+
+
+class TransferAborted(Exception):
+    """Streaming transfer cancelled (shutdown, or the other side gave up)"""
+
+
+class StreamingMedia(MediaUpload):
+    """
+    Buffer shared by a download and an upload of the same file.
+
+    The download writes sequentially into it (file-like write()), while the
+    resumable upload reads byte ranges through getbytes(), blocking until
+    each range has arrived. Data stays in RAM up to `spool_size` bytes,
+    then spills to a temp file. Spilled bytes use positional I/O outside
+    the lock, so the upload reads earlier ranges from disk while the
+    download is still appending later ones.
+
+    MD5 is computed as bytes arrive. The last chunk is only released once
+    the download is complete, so a failed download never finalizes the
+    uploaded file. With `resumable=False` the upload reads the whole file
+    in one getbytes() call, i.e. it waits for the download to finish.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        chunksize: int,
+        spool_size: int,
+        temp_dir: str,
+        mimetype: str = 'application/octet-stream',
+        md5: bool = True,
+        resumable: bool = True
+    ):
+        self._size = size
+        self._resumable = resumable
+        self._chunksize = chunksize
+        self._mimetype = mimetype
+        self._spool_size = spool_size
+        self._temp_dir = temp_dir
+        self._mem = bytearray()   # Buffer until spool_size is exceeded
+        self._file = None         # Temp file after spilling
+        self._md5 = hashlib.md5() if md5 else None
+        self._blake3 = blake3()
+        self._write_pos = 0   # Download cursor
+        self._available = 0   # Bytes readable by the upload
+        self._complete = False
+        self._error = None
+        self._cond = Condition()
+
+    # Download side
+
+    def write(self, data: bytes) -> int:
+        """Append downloaded bytes"""
+        # Hash outside the lock (hashers belong to the download thread, and
+        # release the GIL), so the upload's getbytes() is not blocked meanwhile
+        if self._md5 is not None:
+            self._md5.update(data)
+        self._blake3.update(data)
+
+        pos = self._write_pos
+        end = pos + len(data)
+        with self._cond:
+            if self._error is not None:
+                raise TransferAborted(str(self._error))
+
+            if self._file is None and end > self._spool_size:
+                self._file = tempfile.TemporaryFile(dir=self._temp_dir)
+                self._file.write(self._mem)
+                self._file.flush()
+                self._mem = bytearray()
+
+            if self._file is None:
+                self._mem[pos:end] = data
+            else:
+                fd = self._file.fileno()
+
+        if self._file is not None:
+            # Only the download thread writes, beyond the readable range (or the
+            # same bytes again after a rewind), so the disk write needs no lock
+            os.pwrite(fd, data, pos)
+
+        with self._cond:
+            self._write_pos = end
+            if end > self._available:
+                self._available = end
+                self._cond.notify_all()
+
+        return len(data)
+
+    def rewind(self):
+        """Restart download from byte 0 (bytes already received stay readable)"""
+        with self._cond:
+            self._write_pos = 0
+            if self._md5 is not None:
+                self._md5 = hashlib.md5()
+            self._blake3 = blake3()
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """Error that aborted the transfer, if any"""
+        return self._error
+
+    @property
+    def received(self) -> int:
+        """Bytes written by the current download attempt"""
+        return self._write_pos
+
+    def md5_hexdigest(self) -> Optional[str]:
+        """MD5 of the bytes written by the current download attempt (None if disabled)"""
+        with self._cond:
+            return self._md5.hexdigest() if self._md5 is not None else None
+
+    def blake3_hexdigest(self) -> str:
+        """BLAKE3 of the bytes written by the current download attempt"""
+        with self._cond:
+            return self._blake3.hexdigest()
+
+    def finish(self):
+        """Mark download as complete and release the last chunk"""
+        with self._cond:
+            self._complete = True
+            self._cond.notify_all()
+
+    def abort(self, error: Exception):
+        """Fail both sides of the transfer"""
+        with self._cond:
+            if self._error is None and not self._complete:
+                self._error = error
+            self._cond.notify_all()
+
+    def close(self):
+        """Release buffer"""
+        self._mem = bytearray()
+        if self._file is not None:
+            self._file.close()
+
+    # Upload side (googleapiclient MediaUpload interface)
+
+    def chunksize(self) -> int:
+        return self._chunksize
+
+    def set_chunksize(self, chunksize: int):
+        """Chunk size for the next upload attempt"""
+        self._chunksize = chunksize
+
+    def mimetype(self) -> str:
+        return self._mimetype
+
+    def size(self) -> int:
+        return self._size
+
+    def resumable(self) -> bool:
+        return self._resumable
+
+    def has_stream(self) -> bool:
+        return False
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        """Return bytes [begin, begin + length), waiting for the download"""
+        end = min(begin + length, self._size)
+
+        with self._cond:
+            while self._error is None:
+                if self._complete:
+                    break
+                if end < self._size and self._available >= end:
+                    break
+                self._cond.wait()
+
+            if self._error is not None:
+                raise TransferAborted(str(self._error))
+
+            if self._file is None:
+                return bytes(self._mem[begin:end])
+            fd = self._file.fileno()
+
+        # Read from disk without blocking the download's next write
+        return os.pread(fd, end - begin, begin)
+
+
 # ============================================================
 # STATE MANAGEMENT
 # ============================================================
 
+def _fsync_dir(path: str):
+    """Persist a rename by syncing the containing directory"""
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_json(path: str) -> Any:
+    """
+    Parse a JSON file in one unbuffered read (no isatty or lseek).
+
+    Files of JSON_MMAP_MIN_SIZE or more, i.e. large log snapshots, are parsed
+    straight from an mmap instead of first being copied into a bytes object.
+    """
+    with open(path, 'rb', buffering=0) as f:
+        if os.fstat(f.fileno()).st_size < JSON_MMAP_MIN_SIZE:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def _load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a JSON file written via temp file + os.replace.
+
+    Falls back to the '.tmp' copy, which is complete when a crash hit between
+    its fsync and the rename. Returns None if neither parses.
+    """
+    for candidate in (path, path + '.tmp'):
+        try:
+            return _read_json(candidate)
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            print(f"⚠️ Failed to read {candidate}: {e}")
+    return None
+
+
 class BackupState:
     """Thread-safe backup state management with atomic updates"""
 
     def __init__(self, state_file: str = 'backup_state.json'):
         self.state_file = state_file
         self.lock = RLock()
+        # Mutations not yet written, and when the file was last written
+        self._dirty = 0
+        self._last_flush = time.monotonic()
         self.state = self._load_state()
 
     def _load_state(self) -> Dict[str, Any]:
         """Load state from file"""
-        if os.path.exists(self.state_file):
-            try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    state = json.load(f)
-                    print(f"📂 Loaded state from {self.state_file}")
-                    return state
-            except Exception as e:
-                print(f"⚠️ Failed to load state: {e}")
-
+        state = _load_checkpoint(self.state_file)
+        if state is not None:
+            print(f"📂 Loaded state from {self.state_file}")
+            # Older state files stored lists of file dicts
+            for key in ('pending_files', 'failed_files'):
+                files = state.get(key) or {}
+                if isinstance(files, list):
+                    files = {f['id']: f for f in files}
+                state[key] = files
+            return state
+
+        now = self._format_ts(time.time())
         return {
             'status': 'new',
             'version': '2.0',
             'backup_folder_id': None,
             'current_folder': None,
-            'pending_files': [],
-            'failed_files': [],
+            'pending_files': {},
+            'failed_files': {},
             'total_files_processed': 0,
             'circuit_breaker_state': 'CLOSED',
             'last_rate_limit_time': None,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
+            'resumable_at': None,
+            'created_at': now,
+            'updated_at': now
         }
 
+    @staticmethod
+    def _format_ts(ts: float) -> str:
+        """Format unix timestamp as UTC ISO string (second precision)"""
+        return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec='seconds')
+
     def _save_state(self):
+        """Record a mutation; write once enough have piled up (must be called within lock)"""
+        self._dirty += 1
+        if (self._dirty >= STATE_FLUSH_EVERY
+                or time.monotonic() - self._last_flush >= STATE_FLUSH_INTERVAL):
+            self._write_state()
+
+    def flush(self):
+        """Write pending mutations to disk now"""
+        with self.lock:
+            if self._dirty:
+                self._write_state()
+
+    def _write_state(self):
         """Save state to file (must be called within lock)"""
         try:
-            self.state['updated_at'] = datetime.now().isoformat()
+            # Stamped per write: batched mutations share the timestamp of the last one
+            self.state['updated_at'] = self._format_ts(time.time())
 
             # Atomic write using temp file
             temp_file = self.state_file + '.tmp'
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, indent=2, ensure_ascii=False)
+            with open(temp_file, 'wb') as f:
+                options = orjson.OPT_INDENT_2 if LOG_PRETTY_JSON else 0
+                f.write(orjson.dumps(self.state, option=options))
+                # Durable before the rename, so a crash never leaves a torn checkpoint
+                f.flush()
+                os.fsync(f.fileno())
 
             # Atomic rename
             os.replace(temp_file, self.state_file)
+            _fsync_dir(self.state_file)
+            self._dirty = 0
+            self._last_flush = time.monotonic()
 
         except Exception as e:
             print(f"⚠️ Failed to save state: {e}")
@@ -439,30 +956,37 @@ class BackupState:
         """Thread-safe atomic update"""
         with self.lock:
             self.state.update(kwargs)
-            self._save_state()
+            # Status changes (pause, completion) must be durable right away
+            self._write_state()
 
     def add_pending(self, file_item: Dict[str, Any]):
         """Add file to pending list"""
         with self.lock:
-            if file_item not in self.state['pending_files']:
-                self.state['pending_files'].append(file_item)
+            if file_item['id'] not in self.state['pending_files']:
+                self.state['pending_files'][file_item['id']] = file_item
+                self._save_state()
+
+    def add_pending_many(self, file_items: List[Dict[str, Any]]):
+        """Add several files to pending list with a single save"""
+        with self.lock:
+            pending = self.state['pending_files']
+            added = {f['id']: f for f in file_items if f['id'] not in pending}
+            if added:
+                pending.update(added)
                 self._save_state()
 
     def add_failed(self, file_item: Dict[str, Any]):
         """Add file to failed list"""
         with self.lock:
-            if file_item not in self.state['failed_files']:
-                self.state['failed_files'].append(file_item)
+            if file_item['id'] not in self.state['failed_files']:
+                self.state['failed_files'][file_item['id']] = file_item
                 self._save_state()
 
     def remove_from_pending(self, file_id: str):
         """Remove file from pending by ID"""
         with self.lock:
-            self.state['pending_files'] = [
-                f for f in self.state['pending_files']
-                if f.get('id') != file_id
-            ]
-            self._save_state()
+            if self.state['pending_files'].pop(file_id, None) is not None:
+                self._save_state()
 
     def increment_processed(self):
         """Increment processed counter"""
@@ -473,7 +997,10 @@ class BackupState:
     def get_snapshot(self) -> Dict[str, Any]:
         """Get thread-safe snapshot of state"""
         with self.lock:
-            return self.state.copy()
+            snapshot = self.state.copy()
+            snapshot['pending_files'] = dict(self.state['pending_files'])
+            snapshot['failed_files'] = dict(self.state['failed_files'])
+            return snapshot
 
 
 # ============================================================
@@ -491,15 +1018,31 @@ class DriveBackupManager:
         log_file: str = 'backup_log.json',
         state_file: str = 'backup_state.json',
         max_workers: Optional[int] = None,
-        manual_mode: bool = True
+        manual_mode: bool = True,
+        preloaded: Optional[Tuple['BackupState', Dict[str, Any], int]] = None
     ):
         self.service = service
         self.log_file = log_file
+        self.journal_file = os.path.splitext(log_file)[0] + '.jsonl'
+        self.summary_file = os.path.splitext(log_file)[0] + '.summary.json'
+        self._journal_entries = 0
+        self._journal_buffer = []
+        # Workers enqueue (id, entry, line); the batch thread applies them in _flush_log
+        self._log_queue = queue.SimpleQueue()
+        self._last_flush = time.monotonic()
+        self._iso_cache = (0, '')  # (second, ISO string) for _now_iso
         self.manual_mode = manual_mode
 
         # State management
-        self.backup_state = BackupState(state_file)
-        self.backup_log = self._load_log()
+        if preloaded is not None:
+            self.backup_state, self.backup_log, self._journal_entries = preloaded
+        else:
+            self.backup_state = BackupState(state_file)
+            self.backup_log, self._journal_entries = self._read_log(
+                self.log_file, self.journal_file
+            )
+        # Read-mostly ID set for lock-free 'already backed up' checks
+        self._backed_up_ids = set(self.backup_log['backed_up_files'])
         self.log_lock = RLock()
 
         # Circuit breaker for rate limiting
@@ -514,7 +1057,16 @@ class DriveBackupManager:
         self.memory_monitor = MemoryMonitor(MEMORY_CLEANUP_THRESHOLD)
         
         # Global rate limiter (NEW - prevents API quota exceeded)
-        self.global_rate_limiter = GlobalRateLimiter(GLOBAL_RATE_LIMIT_DELAY)
+        self.global_rate_limiter = GlobalRateLimiter(GLOBAL_RATE_LIMIT_DELAY, GLOBAL_RATE_LIMIT_BURST)
+
+        # Retry backoff (decorrelated jitter, per worker thread)
+        self.backoff = BackoffScheduler(INITIAL_BACKOFF, MAX_BACKOFF)
+
+        # Sibling folder ID -> future of its group's listing (listed ahead)
+        self._listing_cache = {}
+
+        # Files Drive refused to copy (batch pass): go straight to download + upload
+        self._no_copy_ids = set()
 
         # Working directory
         self.local_temp_dir = '/content/temp_backup'
@@ -526,18 +1078,46 @@ class DriveBackupManager:
         else:
             self.max_workers = min(max_workers, MAX_CONCURRENT_WORKERS)
 
+        # Persistent worker pools: threads (and their Drive services) outlive
+        # each batch. Streaming downloads run beside the batch workers.
+        self.file_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='backup'
+        )
+        self.download_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='download'
+        )
+        # Sibling folder listings run ahead of the folder being processed
+        self.listing_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='listing'
+        )
+
         # Shutdown handling
         self.shutdown_event = Event()
         self._setup_signal_handlers()
 
-        # Stats
-        self.stats = {
-            'download': {'success': 0, 'failed': 0, 'skipped': 0},
-            'upload': {'success': 0, 'failed': 0}
-        }
+        # Stats: one Counter per thread, merged only when read (see stats)
+        self._stat_counters = []
+
+        # Aggregate byte progress bar for the running batch
+        self._pbar = None
+        # Files finished since the last memory check / manual GC
+        self._files_since_mem_check = 0
 
         # Credentials for thread-local services
         self.creds, _ = default()
+        self._thread_local = local()
+        # Drive discovery document, read from disk once for every worker's service
+        self._drive_doc = get_static_doc('drive', 'v3')
+
+        # Pooled, keep-alive session for media downloads (shared by all threads)
+        self.media_session = AuthorizedSession(self.creds)
+        self.media_session.mount('https://', requests.adapters.HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers * 4
+        ))
 
         print(f"🚀 Workers: {self.max_workers}")
         print(f"🎯 Mode: {'MANUAL' if manual_mode else 'AUTO'}")
@@ -546,7 +1126,7 @@ class DriveBackupManager:
 
     def __del__(self):
         """Cleanup on deletion"""
-        self._cleanup()
+        self.close()
 
     def _setup_signal_handlers(self):
         """Setup graceful shutdown handlers"""
@@ -560,21 +1140,19 @@ class DriveBackupManager:
         except:
             pass  # Signals might not work in Colab
 
-        atexit.register(self._cleanup)
+        atexit.register(self.close)
 
-    def _cleanup(self):
-        """Cleanup resources"""
+    def close(self):
+        """Flush state, stop worker pools and remove temp files (safe to call twice)"""
         try:
+            self._flush_log()
+            self.backup_state.flush()
+            self.file_executor.shutdown(wait=False, cancel_futures=True)
+            self.download_executor.shutdown(wait=False, cancel_futures=True)
+            self.listing_executor.shutdown(wait=False, cancel_futures=True)
             self.resource_manager.cleanup_all()
 
-            if os.path.exists(self.local_temp_dir):
-                for file in os.listdir(self.local_temp_dir):
-                    try:
-                        os.remove(os.path.join(self.local_temp_dir, file))
-                    except:
-                        pass
-
-            gc.collect()
+            shutil.rmtree(self.local_temp_dir, ignore_errors=True)
         except:
             pass
 
@@ -586,46 +1164,188 @@ class DriveBackupManager:
             cpu_count = multiprocessing.cpu_count()
 
             workers_by_ram = max(1, int(available_gb / 0.3))
-            workers_by_cpu = cpu_count
-            optimal = max(3, min(workers_by_ram, workers_by_cpu, 8))
+            # Workers wait on network I/O: bounded by the Drive per-user QPS quota, not by cores
+            workers_by_io = min(DRIVE_QPS_LIMIT, cpu_count * 2)
+            optimal = max(3, min(workers_by_ram, workers_by_io))
 
             print(f"💾 RAM: {available_gb:.1f}GB | 🖥️ CPU: {cpu_count}")
             return optimal
         except:
             return 4
 
-    def _load_log(self) -> Dict[str, Any]:
-        """Load backup log"""
-        if os.path.exists(self.log_file):
+    @staticmethod
+    def preload(log_file: str, state_file: str) -> Tuple['BackupState', Dict[str, Any], int]:
+        """Read state and log files; safe to run off the main thread"""
+        journal_file = os.path.splitext(log_file)[0] + '.jsonl'
+        return (BackupState(state_file),) + DriveBackupManager._read_log(log_file, journal_file)
+
+    @staticmethod
+    def _read_log(log_file: str, journal_file: str) -> Tuple[Dict[str, Any], int]:
+        """
+        Load backup log snapshot, then replay the journal written since.
+
+        Static so it can run on the preload thread before the manager
+        exists. Returns the log and the number of journal entries replayed.
+        """
+        log = _load_checkpoint(log_file)
+        journal_entries = 0
+        if log is None:
+            log = {
+                'version': '2.0',
+                'backed_up_files': {},
+                'last_run': None
+            }
+
+        if os.path.exists(journal_file):
             try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                pass
+                with open(journal_file, 'rb+', buffering=LOG_IO_BUFFER) as f:
+                    valid_bytes = 0
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            break  # Torn write from a crash
+                        try:
+                            entry = orjson.loads(line)
+                        except ValueError:
+                            break
 
-        return {
-            'version': '2.0',
-            'backed_up_files': {},
-            'last_run': None
-        }
+                        log['backed_up_files'][entry.pop('id')] = entry
+                        valid_bytes += len(line)
+                        journal_entries += 1
+
+                    # Drop torn tail so the next append starts on a fresh line
+                    f.truncate(valid_bytes)
+            except Exception as e:
+                print(f"⚠️ Failed to read log journal: {e}")
+
+        return log, journal_entries
 
     def _save_log(self):
-        """Save backup log with atomic write"""
+        """
+        Write full log snapshot atomically, then truncate the journal.
+
+        Compaction step only - per-item progress goes through _append_log.
+        """
         with self.log_lock:
+            self._drain_log_queue()
             try:
-                self.backup_log['last_run'] = datetime.now().isoformat()
+                self.backup_log['last_run'] = self._now_iso()
+
+                options = orjson.OPT_NON_STR_KEYS
+                if LOG_PRETTY_JSON:
+                    options |= orjson.OPT_INDENT_2
 
                 temp_file = self.log_file + '.tmp'
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.backup_log, f, indent=2, ensure_ascii=False)
+                with open(temp_file, 'wb') as f:
+                    f.write(orjson.dumps(self.backup_log, option=options))
+                    f.flush()
+                    os.fsync(f.fileno())
 
                 os.replace(temp_file, self.log_file)
+                _fsync_dir(self.log_file)
+
+                # Snapshot now holds every journaled and buffered entry
+                with open(self.journal_file, 'w', encoding='utf-8'):
+                    pass
+                self._journal_entries = 0
+                self._journal_buffer.clear()
+
+                # Sidecar for view_log: count and last run without parsing the snapshot
+                with open(self.summary_file, 'wb') as f:
+                    f.write(orjson.dumps({
+                        'backed_up_files': len(self.backup_log['backed_up_files']),
+                        'last_run': self.backup_log['last_run']
+                    }))
             except Exception as e:
                 print(f"⚠️ Failed to save log: {e}")
 
+    def _append_log(self, item_id: str, entry: Dict[str, Any]):
+        """
+        Queue backed-up item for the log (lock-free; safe from any worker).
+
+        The log dict and journal buffer are only touched by _drain_log_queue
+        under log_lock, so workers never contend on them per file.
+        """
+        line = orjson.dumps({'id': item_id, **entry}, option=orjson.OPT_NON_STR_KEYS)
+        self._log_queue.put((item_id, entry, line + b'\n'))
+        self._backed_up_ids.add(item_id)
+
+    def _drain_log_queue(self):
+        """Apply queued entries to the log and journal buffer (hold log_lock)"""
+        backed_up_files = self.backup_log['backed_up_files']
+        while True:
+            try:
+                item_id, entry, line = self._log_queue.get_nowait()
+            except queue.Empty:
+                return
+            backed_up_files[item_id] = entry
+            self._journal_buffer.append(line)
+
+    def _flush_log(self):
+        """Append queued entries to the journal with a single fsync"""
+        with self.log_lock:
+            self._drain_log_queue()
+            if self._journal_buffer:
+                try:
+                    with open(self.journal_file, 'ab', buffering=LOG_IO_BUFFER) as f:
+                        f.writelines(self._journal_buffer)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._journal_entries += len(self._journal_buffer)
+                    self._journal_buffer.clear()
+                except Exception as e:
+                    print(f"⚠️ Failed to append log entries: {e}")
+
+            self._last_flush = time.monotonic()
+
+            # Snapshot interval grows with the log, so total bytes rewritten stay
+            # linear in the number of files (a fixed interval made it quadratic)
+            backed_up = len(self.backup_log['backed_up_files'])
+            if self._journal_entries >= max(LOG_COMPACT_EVERY, backed_up // 4):
+                self._save_log()
+
     def _get_thread_local_service(self):
-        """Get thread-local Drive service"""
-        return build('drive', 'v3', credentials=self.creds)
+        """Get thread-local Drive service (built once per worker thread)"""
+        service = getattr(self._thread_local, 'service', None)
+        if service is None:
+            # httplib2 is not thread-safe: one keep-alive connection per worker
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.creds, http=httplib2.Http(timeout=HTTP_TIMEOUT)
+            )
+            if self._drive_doc:
+                service = build_from_document(self._drive_doc, http=http)
+            else:
+                service = build('drive', 'v3', http=http, cache_discovery=False)
+            self._thread_local.service = service
+        return service
+
+    def _get_chunk_sizer(self) -> ChunkSizer:
+        """Get this worker thread's adaptive upload chunk size"""
+        sizer = getattr(self._thread_local, 'chunk_sizer', None)
+        if sizer is None:
+            sizer = ChunkSizer(CHUNK_SIZE, MIN_CHUNK_SIZE, MAX_CHUNK_SIZE)
+            self._thread_local.chunk_sizer = sizer
+        return sizer
+
+    def _count(self, op: str, outcome: str, n: int = 1):
+        """Add to this thread's stat counter (no shared lock or dict)"""
+        counter = getattr(self._thread_local, 'stats', None)
+        if counter is None:
+            counter = Counter()
+            self._thread_local.stats = counter
+            self._stat_counters.append(counter)
+        counter[op, outcome] += n
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-thread counters merged into {op: {outcome: count}}"""
+        totals = Counter()
+        for counter in list(self._stat_counters):
+            totals.update(dict(counter))
+        return {
+            'download': {k: totals['download', k] for k in ('success', 'failed', 'skipped')},
+            'upload': {k: totals['upload', k] for k in ('success', 'failed')},
+            'copy': {'success': totals['copy', 'success']}
+        }
 
     def _is_rate_limit_error(self, error: Exception) -> bool:
         """
@@ -636,27 +1356,67 @@ class DriveBackupManager:
         - userRateLimitExceeded (user-specific limit)
         - quotaExceeded (general quota)
         """
-        if isinstance(error, HttpError):
-            error_str = str(error).lower()
-            return (
-                error.resp.status == 403 and
-                ('ratelimitexceeded' in error_str or 
-                 'userratelimitexceeded' in error_str or
-                 'quotaexceeded' in error_str or
-                 'quota exceeded' in error_str)
-            )
-        return False
+        if not isinstance(error, HttpError) or error.resp.status != 403:
+            return False
 
-    def _exponential_backoff(self, attempt: int, jitter: bool = True) -> float:
-        """Calculate backoff time with optional jitter"""
-        backoff = min(INITIAL_BACKOFF * (2 ** attempt), MAX_BACKOFF)
+        # HttpError parsed the body once already; never render str(error)
+        details = error.error_details
+        if isinstance(details, list):
+            for detail in details:
+                if isinstance(detail, dict) and detail.get('reason') in RATE_LIMIT_REASONS:
+                    return True
+        return 'quota exceeded' in error.reason.lower()
+
+    def _now_iso(self) -> str:
+        """UTC ISO timestamp at 1-second resolution, formatted once per second"""
+        second = int(time.time())
+        cached_second, text = self._iso_cache
+        if cached_second != second:
+            text = datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+            self._iso_cache = (second, text)
+        return text
+
+    def _record_success(self, op: str):
+        """Record success in circuit breaker and reset retry backoff"""
+        if self.circuit_breaker.record_success(op):
+            # Circuit recovered: every worker starts a fresh backoff series
+            self.backoff.reset_all()
+        else:
+            self.backoff.reset()
 
-        if jitter:
-            backoff = backoff * (0.5 + random.random())
+    def _record_progress(self, op: str):
+        """Count transfer progress as a breaker success, without ending the retry series"""
+        if self.circuit_breaker.record_success(op):
+            self.backoff.reset_all()
+
+    def _advance_progress(self, nbytes):
+        """Move the shared batch progress bar (negative rolls back a failed attempt)"""
+        pbar = self._pbar
+        if pbar is not None and nbytes:
+            pbar.update(int(nbytes))
+
+    def _execute_with_retry(self, request, max_retries: int = MAX_RETRIES):
+        """
+        Execute a Drive API request, retrying 429/5xx and rate-limit 403s.
 
-        return backoff
+        Uses exponential backoff with up to 1s of random jitter
+        (min(MAX_BACKOFF, INITIAL_BACKOFF * 2^n) + U(0, 1)). The request
+        object is re-executed as is, so it must not be consumed by a
+        closure.
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                return request.execute()
+            except HttpError as e:
+                retryable = (
+                    e.resp.status in RETRYABLE_STATUSES or
+                    self._is_rate_limit_error(e)
+                )
+                if not retryable or attempt == max_retries or self.shutdown_event.is_set():
+                    raise
+                time.sleep(min(MAX_BACKOFF, INITIAL_BACKOFF * 2 ** attempt) + random.random())
 
-    def _handle_rate_limit(self) -> bool:
+    def _handle_rate_limit(self, op: str) -> bool:
         """
         Handle rate limit error.
 
@@ -664,18 +1424,25 @@ class DriveBackupManager:
             bool: True if should stop execution
         """
         # Record failure in circuit breaker
-        circuit_tripped = self.circuit_breaker.record_failure()
+        circuit_tripped = self.circuit_breaker.record_failure(op)
+
+        if circuit_tripped and op == 'copy':
+            # Copies have a download + upload fallback: keep the backup running
+            print(f"\n⚠️ Copy quota exhausted - using download + upload for {RATE_LIMIT_COOLDOWN_HOURS}h")
+            return False
 
         if circuit_tripped:
             self.backup_state.update(
                 status='paused',
                 circuit_breaker_state='OPEN',
-                last_rate_limit_time=datetime.now().isoformat()
+                last_rate_limit_time=self._now_iso(),
+                resumable_at=time.time() + RATE_LIMIT_COOLDOWN_HOURS * 3600
             )
+            self._flush_log()
 
-            print("\n" + "="*80)
+            print("\n" + _RULE)
             print("🚫 RATE LIMIT CIRCUIT BREAKER TRIPPED")
-            print("="*80)
+            print(_RULE)
             print(f"❌ Detected {RATE_LIMIT_THRESHOLD} rate limit errors in {RATE_LIMIT_WINDOW_SECONDS}s")
             print(f"💾 State saved to: {self.backup_state.state_file}")
 
@@ -684,7 +1451,7 @@ class DriveBackupManager:
             else:
                 print(f"\n⏰ Auto-resume after {RATE_LIMIT_COOLDOWN_HOURS}h")
 
-            print("="*80 + "\n")
+            print(_RULE + "\n")
 
             self.shutdown_event.set()
             return True
@@ -696,7 +1463,7 @@ class DriveBackupManager:
         next_run = datetime.now() + timedelta(hours=RATE_LIMIT_COOLDOWN_HOURS)
 
         print("\n🎯 MANUAL RESUME INSTRUCTIONS:")
-        print("="*80)
+        print(_RULE)
         print("1️⃣ STOP RUNTIME NOW:")
         print("   → Runtime → Disconnect and delete runtime")
         print()
@@ -709,18 +1476,19 @@ class DriveBackupManager:
         print("📊 PROGRESS SAVED:")
 
         snapshot = self.backup_state.get_snapshot()
-        print(f"   ✅ Completed: {len(self.backup_log['backed_up_files'])}")
+        print(f"   ✅ Completed: {len(self._backed_up_ids)}")
         print(f"   ⏳ Pending: {len(snapshot['pending_files'])}")
         print(f"   ❌ Failed: {len(snapshot['failed_files'])}")
-        print("="*80)
+        print(_RULE)
 
     def get_file_info(self, file_id: str) -> Optional[Dict[str, Any]]:
         """Get file metadata"""
         try:
-            return self.service.files().get(
+            self.global_rate_limiter.acquire()
+            return self._execute_with_retry(self.service.files().get(
                 fileId=file_id,
                 fields='id, name, size, md5Checksum, mimeType'
-            ).execute()
+            ))
         except HttpError as e:
             print(f"❌ Error getting file info: {e}")
             return None
@@ -730,125 +1498,169 @@ class DriveBackupManager:
         file_id: str,
         file_name: str,
         file_size: Optional[str] = None,
-        service=None
-    ) -> Optional[str]:
+        media: Optional[StreamingMedia] = None,
+        original_md5: Optional[str] = None,
+        digests: Optional[Dict[str, str]] = None
+    ) -> Optional[Tuple[str, int]]:
         """
         Download file with proper error handling and resource management.
 
+        The file is fetched with one streamed GET on the pooled media
+        session, instead of one request per chunk.
+
+        MD5 is computed while downloading and verified against
+        `original_md5`. When `media` is given, bytes are streamed into it
+        instead of a local file. If `digests` is given, it receives the
+        computed 'md5' and 'blake3' hex digests.
+
         Returns:
-            Optional[str]: Local path if successful, None otherwise
+            Optional[Tuple[str, int]]: (local path, size in bytes) if
+            successful, None otherwise
         """
         if self.shutdown_event.is_set():
             return None
 
         # Check circuit breaker
-        can_proceed, reason = self.circuit_breaker.can_proceed()
+        can_proceed, reason = self.circuit_breaker.can_proceed('download')
         if not can_proceed:
-            print(f"🚫 {reason}")
+            logger.warning(f"🚫 {reason}")
             return None
 
-        if service is None:
-            service = self.service
-
         local_path = os.path.join(self.local_temp_dir, file_name)
 
         for attempt in range(MAX_RETRIES):
             fh = None
-            pbar = None
+            received = 0  # Bytes added to the progress bar (rolled back on failure)
+            size = 0
+            created = False  # Local file exists, so failures must remove it
 
             try:
                 # Apply global rate limit before API call
                 self.global_rate_limiter.acquire()
                 
-                request = service.files().get_media(fileId=file_id)
+                url = f"https://www.googleapis.com/drive/v3/files/{file_id}?alt=media"
 
-                with self.resource_manager.get_file_handle(local_path, 'wb') as fh:
-                    downloader = MediaIoBaseDownload(
-                        fh,
-                        request,
-                        chunksize=CHUNK_SIZE
-                    )
+                if media is not None:
+                    media.rewind()
+                    sink = nullcontext(media)
+                else:
+                    sink = self.resource_manager.get_file_handle(local_path, 'wb')
 
+                with sink as fh:
+                    created = media is None
+                    writer = media if media is not None else HashingWriter(fh, md5=bool(original_md5))
                     done = False
-                    pbar = tqdm(
-                        total=100,
-                        desc=f"📥 {file_name[:30]}",
-                        unit='%',
-                        leave=False
-                    )
-
-                    while not done and not self.shutdown_event.is_set():
-                        status, done = downloader.next_chunk()
-                        if status:
-                            progress = int(status.progress() * 100)
-                            pbar.update(progress - pbar.n)
 
-                    if pbar:
-                        pbar.close()
-                        pbar = None
+                    with self.media_session.get(url, stream=True, timeout=HTTP_TIMEOUT) as response:
+                        if response.status_code >= 400:
+                            # Same error type as API calls, so rate limits are detected
+                            raise HttpError(
+                                httplib2.Response({'status': response.status_code}),
+                                response.content,
+                                uri=url
+                            )
+
+                        unreported = 0
+                        for data in response.iter_content(chunk_size=MEDIA_READ_SIZE):
+                            if self.shutdown_event.is_set():
+                                break
+                            writer.write(data)
+                            size += len(data)
+                            # Shared bar and breaker are fed every CHUNK_SIZE bytes, not per read
+                            unreported += len(data)
+                            if unreported >= CHUNK_SIZE:
+                                self._advance_progress(unreported)
+                                received += unreported
+                                unreported = 0
+                                self._record_progress('download')
+                        else:
+                            done = True
+                            self._advance_progress(unreported)
+                            received += unreported
+
+                if not done:
+                    raise TransferAborted("Shutdown requested")
 
                 # Verify size if provided
                 if file_size:
-                    local_size = os.path.getsize(local_path)
-                    if local_size != int(file_size):
+                    if size != int(file_size):
                         raise Exception(
-                            f"Size mismatch: expected {file_size}, got {local_size}"
+                            f"Size mismatch: expected {file_size}, got {size}"
                         )
 
+                # Verify MD5 computed while downloading (no re-read; when
+                # streaming, before the upload is finalized)
+                if original_md5 and writer.md5_hexdigest() != original_md5:
+                    raise Exception("MD5 checksum mismatch")
+
+                if digests is not None:
+                    digests['md5'] = writer.md5_hexdigest()
+                    digests['blake3'] = writer.blake3_hexdigest()
+
                 # Success - record in circuit breaker
-                self.circuit_breaker.record_success()
-                print(f"✅ Downloaded: {file_name}")
-                return local_path
+                self._record_success('download')
+                logger.info(f"✅ Downloaded: {file_name}")
+                return local_path, size
+
+            except TransferAborted:
+                self._advance_progress(-received)
+                if created:
+                    try:
+                        os.unlink(local_path)
+                    except OSError:
+                        pass
+                return None
 
             except Exception as e:
                 # Handle rate limit
                 if self._is_rate_limit_error(e):
-                    print(f"🚫 Rate limit on download: {file_name}")
+                    logger.warning(f"🚫 Rate limit on download: {file_name}")
                     # Increase global delay when rate limited
                     self.global_rate_limiter.set_delay(min(self.global_rate_limiter.min_delay * 2, 10.0))
-                    if self._handle_rate_limit():
+                    if self._handle_rate_limit('download'):
                         return None
 
-                print(f"⚠️ Download attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
+                logger.warning(f"⚠️ Download attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
+
+                self._advance_progress(-received)
 
                 # Cleanup failed download
-                if os.path.exists(local_path):
+                if created:
                     try:
-                        os.remove(local_path)
-                    except:
+                        os.unlink(local_path)
+                    except OSError:
                         pass
 
                 # Retry with backoff (increased delay for rate limit errors)
                 if attempt < MAX_RETRIES - 1:
-                    backoff = self._exponential_backoff(attempt)
+                    backoff = self.backoff.next_sleep()
                     if self._is_rate_limit_error(e):
                         backoff = max(backoff, 30)  # At least 30s for rate limits
-                    print(f"⏳ Retrying in {backoff:.1f}s...")
+                    logger.info(f"⏳ Retrying in {backoff:.1f}s...")
                     time.sleep(backoff)
                 else:
-                    print(f"❌ Download failed: {file_name}")
+                    logger.error(f"❌ Download failed: {file_name}")
                     return None
 
-            finally:
-                if pbar:
-                    try:
-                        pbar.close()
-                    except:
-                        pass
-
         return None
 
     def upload_file(
         self,
-        local_path: str,
+        local_path: Optional[str],
         file_name: str,
         parent_folder_id: str,
         original_md5: Optional[str] = None,
-        service=None
+        service=None,
+        media: Optional[StreamingMedia] = None,
+        local_size: Optional[int] = None
     ) -> Optional[str]:
         """
         Upload file with proper error handling.
 
+        When `media` is given, `local_path` is ignored and bytes are read
+        from the streaming buffer while the download is still running.
+        `local_size` is the size of `local_path` when already known.
+
         Returns:
             Optional[str]: Uploaded file ID if successful, None otherwise
         """
@@ -856,14 +1668,19 @@ class DriveBackupManager:
             return None
 
         # Check circuit breaker
-        can_proceed, reason = self.circuit_breaker.can_proceed()
+        can_proceed, reason = self.circuit_breaker.can_proceed('upload')
         if not can_proceed:
-            print(f"🚫 {reason}")
+            logger.warning(f"🚫 {reason}")
             return None
 
         if service is None:
             service = self.service
 
+        chunk_sizer = self._get_chunk_sizer()
+
+        if media is None and local_size is None:
+            local_size = os.path.getsize(local_path)
+
         for attempt in range(MAX_RETRIES):
             uploaded_file_id = None
 
@@ -876,17 +1693,32 @@ class DriveBackupManager:
                     'parents': [parent_folder_id]
                 }
 
-                media = MediaFileUpload(
-                    local_path,
-                    resumable=True,
-                    chunksize=CHUNK_SIZE
-                )
+                media_body = media
+                if media_body is None:
+                    media_body = MediaFileUpload(
+                        local_path,
+                        resumable=local_size >= SIMPLE_UPLOAD_MAX,
+                        chunksize=chunk_sizer.value
+                    )
+                elif media_body.resumable():
+                    media_body.set_chunksize(chunk_sizer.value)
 
-                file = service.files().create(
+                request = service.files().create(
                     body=file_metadata,
-                    media_body=media,
-                    fields='id, name, size, md5Checksum'
-                ).execute()
+                    media_body=media_body,
+                    fields='id, md5Checksum'
+                )
+
+                if media_body.resumable():
+                    # Drive the resumable upload chunk by chunk to adapt the chunk size
+                    file = None
+                    while file is None:
+                        _, file = request.next_chunk()
+                        chunk_sizer.record_success()
+                        self._record_progress('upload')
+                else:
+                    # Small file: one multipart POST, no session initiation round trip
+                    file = request.execute()
 
                 uploaded_file_id = file['id']
 
@@ -899,14 +1731,20 @@ class DriveBackupManager:
                     raise Exception("MD5 checksum mismatch")
 
                 # Success
-                self.circuit_breaker.record_success()
-                print(f"✅ Uploaded: {file_name}")
+                self._record_success('upload')
+                logger.info(f"✅ Uploaded: {file_name}")
                 return uploaded_file_id
 
+            except TransferAborted:
+                return None
+
             except Exception as e:
+                if isinstance(e, TimeoutError) or self._is_rate_limit_error(e):
+                    chunk_sizer.record_failure()
+
                 # Handle rate limit
                 if self._is_rate_limit_error(e):
-                    print(f"🚫 Rate limit on upload: {file_name}")
+                    logger.warning(f"🚫 Rate limit on upload: {file_name}")
                     # Increase global delay when rate limited
                     self.global_rate_limiter.set_delay(min(self.global_rate_limiter.min_delay * 2, 10.0))
 
@@ -917,10 +1755,10 @@ class DriveBackupManager:
                         except:
                             pass
 
-                    if self._handle_rate_limit():
+                    if self._handle_rate_limit('upload'):
                         return None
 
-                print(f"⚠️ Upload attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
+                logger.warning(f"⚠️ Upload attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
 
                 # Cleanup failed upload
                 if uploaded_file_id:
@@ -931,13 +1769,13 @@ class DriveBackupManager:
 
                 # Retry with backoff (increased delay for rate limit errors)
                 if attempt < MAX_RETRIES - 1:
-                    backoff = self._exponential_backoff(attempt)
+                    backoff = self.backoff.next_sleep()
                     if self._is_rate_limit_error(e):
                         backoff = max(backoff, 30)  # At least 30s for rate limits
-                    print(f"⏳ Retrying in {backoff:.1f}s...")
+                    logger.info(f"⏳ Retrying in {backoff:.1f}s...")
                     time.sleep(backoff)
                 else:
-                    print(f"❌ Upload failed: {file_name}")
+                    logger.error(f"❌ Upload failed: {file_name}")
                     return None
 
         return None
@@ -951,16 +1789,17 @@ class DriveBackupManager:
         try:
             file_metadata = {
                 'name': folder_name,
-                'mimeType': 'application/vnd.google-apps.folder'
+                'mimeType': FOLDER_MIME
             }
 
             if parent_id:
                 file_metadata['parents'] = [parent_id]
 
-            folder = self.service.files().create(
+            self.global_rate_limiter.acquire()
+            folder = self._execute_with_retry(self.service.files().create(
                 body=file_metadata,
-                fields='id, name'
-            ).execute()
+                fields='id'
+            ))
 
             print(f"📁 Created folder: {folder_name}")
             return folder['id']
@@ -969,31 +1808,354 @@ class DriveBackupManager:
             print(f"❌ Error creating folder: {e}")
             return None
 
-    def list_files_in_folder(self, folder_id: str) -> List[Dict[str, Any]]:
-        """List all files in folder"""
-        items = []
+    def _list_children(self, parent_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """List children of several folders with one paginated query"""
+        children = {parent_id: [] for parent_id in parent_ids}
+        parents_query = ' or '.join(f"'{parent_id}' in parents" for parent_id in parent_ids)
         page_token = None
+        # Also runs on the listing thread: never share self.service across threads
+        service = self._get_thread_local_service()
+
+        while True:
+            self.global_rate_limiter.acquire()
+            response = self._execute_with_retry(service.files().list(
+                q=f"({parents_query}) and trashed=false",
+                fields='nextPageToken, files(id, name, mimeType, size, md5Checksum, parents)',
+                pageToken=page_token,
+                pageSize=1000
+            ))
+
+            for item in response.get('files', []):
+                for parent_id in item.get('parents', []):
+                    if parent_id in children:
+                        children[parent_id].append(item)
+
+            page_token = response.get('nextPageToken')
+
+            if not page_token:
+                break
 
+        return children
+
+    def _list_group(self, group: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Grouped listing for the listing thread ({} on failure)"""
         try:
-            while True:
-                response = self.service.files().list(
-                    q=f"'{folder_id}' in parents and trashed=false",
-                    fields='nextPageToken, files(id, name, mimeType, size, md5Checksum)',
-                    pageToken=page_token,
-                    pageSize=100
-                ).execute()
+            return self._list_children(group)
+        except Exception as e:
+            # Also socket timeouts (HTTP_TIMEOUT) and connection resets
+            # Not fatal: these folders are listed one by one instead
+            print(f"⚠️ Grouped listing failed: {e}")
+            return {}
 
-                items.extend(response.get('files', []))
-                page_token = response.get('nextPageToken')
+    def _prefetch_listings(self, folder_ids: List[str]):
+        """
+        Queue grouped listings of sibling folders, LIST_BATCH_FOLDERS at a time.
 
-                if not page_token:
-                    break
+        Runs in the background: the first subfolder is processed as soon as
+        its group arrives, while the later groups are still being listed.
+        """
+        for i in range(0, len(folder_ids), LIST_BATCH_FOLDERS):
+            group = folder_ids[i:i + LIST_BATCH_FOLDERS]
+            future = self.listing_executor.submit(self._list_group, group)
+            for folder_id in group:
+                self._listing_cache[folder_id] = future
+
+    def list_files_in_folder(self, folder_id: str) -> Optional[List[Dict[str, Any]]]:
+        """List all files in folder (None if the listing failed)"""
+        future = self._listing_cache.pop(folder_id, None)
+        if future is not None:
+            try:
+                children = future.result().get(folder_id)
+            except Exception:
+                children = None  # Cancelled by close(): list directly below
+            if children is not None:
+                return children
 
-            return items
+        try:
+            return self._list_children([folder_id])[folder_id]
 
-        except HttpError as e:
+        except (HttpError, OSError) as e:
             print(f"❌ Error listing files: {e}")
-            return []
+            return None
+
+    def _server_side_copy(
+        self,
+        item: Dict[str, Any],
+        backup_folder_id: str,
+        service
+    ) -> Optional[str]:
+        """
+        Copy file inside Drive, without any bytes passing through Colab.
+
+        Returns:
+            Optional[str]: Copied file ID, None if the copy is not possible
+            (caller falls back to download + upload)
+        """
+        item_name = item['name']
+        original_md5 = item.get('md5Checksum')
+
+        for attempt in range(MAX_RETRIES):
+            if self.shutdown_event.is_set():
+                return None
+
+            # Check circuit breaker
+            can_proceed, _ = self.circuit_breaker.can_proceed('copy')
+            if not can_proceed:
+                return None  # Copy quota cooling down: caller falls back to download + upload
+
+            copied_id = None
+
+            try:
+                # Apply global rate limit before API call
+                self.global_rate_limiter.acquire()
+
+                copied = service.files().copy(
+                    fileId=item['id'],
+                    body={'name': item_name, 'parents': [backup_folder_id]},
+                    fields='id, md5Checksum'
+                ).execute()
+
+                copied_id = copied['id']
+
+                # Verify MD5 from metadata - no re-hash needed
+                if original_md5 and copied.get('md5Checksum') != original_md5:
+                    raise Exception("MD5 checksum mismatch")
+
+                self._record_success('copy')
+                logger.info(f"✅ Copied: {item_name}")
+                return copied_id
+
+            except Exception as e:
+                # Cleanup copy that failed verification
+                if copied_id:
+                    try:
+                        service.files().delete(fileId=copied_id).execute()
+                    except:
+                        pass
+
+                if self._is_rate_limit_error(e):
+                    logger.warning(f"🚫 Rate limit on copy: {item_name}")
+                    self.global_rate_limiter.set_delay(min(self.global_rate_limiter.min_delay * 2, 10.0))
+                    if self._handle_rate_limit('copy'):
+                        return None
+
+                elif isinstance(e, HttpError) and e.resp.status in (400, 403, 404):
+                    # Not copyable (cannotCopyFile, cross-account): download + upload
+                    return None
+
+                logger.warning(f"⚠️ Copy attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
+
+                if attempt < MAX_RETRIES - 1:
+                    backoff = self.backoff.next_sleep()
+                    if self._is_rate_limit_error(e):
+                        backoff = max(backoff, 30)  # At least 30s for rate limits
+                    logger.info(f"⏳ Retrying in {backoff:.1f}s...")
+                    time.sleep(backoff)
+
+        return None
+
+    def _record_backed_up_file(
+        self,
+        item: Dict[str, Any],
+        backup_id: str,
+        blake3_digest: Optional[str] = None
+    ):
+        """Journal a backed-up file and advance the checkpoint"""
+        self._append_log(item['id'], {
+            'name': item['name'],
+            'type': 'file',
+            'size': item.get('size'),
+            'md5': item.get('md5Checksum'),
+            'blake3': blake3_digest,
+            'backup_id': backup_id,
+            'backup_time': self._now_iso()
+        })
+
+        self.backup_state.increment_processed()
+        self.backup_state.remove_from_pending(item['id'])
+
+    def _batch_copy(
+        self,
+        files: List[Dict[str, Any]],
+        backup_folder_id: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Server-side copy files COPY_BATCH_SIZE at a time, each group in one
+        batch HTTP request instead of one files.copy round trip per file.
+
+        Returns:
+            List[Dict[str, Any]]: Files still to process (not copyable or
+            failed - the per-file path handles them)
+        """
+        if not SERVER_SIDE_COPY:
+            return files
+
+        remaining = []
+        for start in range(0, len(files), COPY_BATCH_SIZE):
+            group = files[start:start + COPY_BATCH_SIZE]
+
+            can_proceed, _ = self.circuit_breaker.can_proceed('copy')
+            if self.shutdown_event.is_set() or not can_proceed:
+                remaining.extend(files[start:])
+                break
+
+            results = {}
+
+            def on_copy(request_id, response, exception):
+                results[request_id] = (response, exception)
+
+            batch = self.service.new_batch_http_request(callback=on_copy)
+            for item in group:
+                batch.add(
+                    self.service.files().copy(
+                        fileId=item['id'],
+                        body={'name': item['name'], 'parents': [backup_folder_id]},
+                        fields='id, md5Checksum'
+                    ),
+                    request_id=item['id']
+                )
+
+            try:
+                # Drive charges quota per sub-request: one token each
+                self.global_rate_limiter.acquire(len(group))
+                batch.execute()
+            except Exception as e:
+                logger.warning(f"⚠️ Batch copy failed: {e}")
+                remaining.extend(group)
+                if self._is_rate_limit_error(e):
+                    self._back_off_batch_copy()
+                continue
+
+            rate_limited = False
+            for item in group:
+                copied, error = results.get(item['id'], (None, None))
+                original_md5 = item.get('md5Checksum')
+
+                if copied and (not original_md5 or copied.get('md5Checksum') == original_md5):
+                    self._record_success('copy')
+                    self._count('copy', 'success')
+                    self._advance_progress(item.get('size'))
+                    self._record_backed_up_file(item, copied['id'])
+                    logger.info(f"✅ Copied: {item['name']}")
+                    continue
+
+                if copied:
+                    # MD5 mismatch: drop the copy, retry on the per-file path
+                    try:
+                        self.service.files().delete(fileId=copied['id']).execute()
+                    except HttpError as e:
+                        logger.warning(f"⚠️ Could not delete unverified copy of {item['name']} ({copied['id']}): {e}")
+                elif self._is_rate_limit_error(error):
+                    rate_limited = True
+                elif isinstance(error, HttpError) and error.resp.status in (400, 403, 404):
+                    # Not copyable (cannotCopyFile, cross-account): download + upload
+                    self._no_copy_ids.add(item['id'])
+
+                remaining.append(item)
+
+            self._flush_log()
+
+            if rate_limited:
+                self._back_off_batch_copy()
+
+        return remaining
+
+    def _back_off_batch_copy(self):
+        """Slow the global rate and wait out a rate-limited copy batch"""
+        logger.warning("🚫 Rate limit on batch copy")
+        self.global_rate_limiter.set_delay(min(self.global_rate_limiter.min_delay * 2, 10.0))
+        self._handle_rate_limit('copy')
+
+        # Same wait as the per-file retries, so the next group is not sent at once
+        # Advances this thread's jitter series, so repeated batch rate limits wait longer
+        backoff = max(self.backoff.next_sleep(), 30)  # At least 30s for rate limits
+        logger.info(f"⏳ Next copy batch in {backoff:.1f}s...")
+        self.shutdown_event.wait(backoff)
+
+    def _download_into(
+        self,
+        item: Dict[str, Any],
+        media: StreamingMedia,
+        digests: Dict[str, str]
+    ) -> bool:
+        """Download item into streaming buffer (runs on download_executor)"""
+        ok = False
+        try:
+            ok = self.download_file(
+                item['id'],
+                item['name'],
+                item.get('size'),
+                media=media,
+                original_md5=item.get('md5Checksum'),
+                digests=digests
+            ) is not None
+            return ok
+        finally:
+            if ok:
+                media.finish()
+            else:
+                media.abort(TransferAborted(f"Download failed: {item['name']}"))
+
+    def _stream_file(
+        self,
+        item: Dict[str, Any],
+        backup_folder_id: str,
+        service,
+        digests: Dict[str, str]
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Download and upload concurrently through a StreamingMedia buffer.
+
+        Returns:
+            Tuple[bool, Optional[str]]: (download ok, uploaded file ID)
+        """
+        media = StreamingMedia(
+            int(item['size']),
+            CHUNK_SIZE,
+            STREAM_SPOOL_SIZE,
+            self.local_temp_dir,
+            item.get('mimeType') or 'application/octet-stream',
+            md5=bool(item.get('md5Checksum')),
+            resumable=int(item['size']) >= SIMPLE_UPLOAD_MAX
+        )
+
+        try:
+            if not media.resumable():
+                # Small file: the one-request upload needs every byte first anyway,
+                # so download on this thread instead of handing off to the pool
+                if not self._download_into(item, media, digests):
+                    return False, None
+                download = None
+            else:
+                download = self.download_executor.submit(self._download_into, item, media, digests)
+
+            uploaded_id = self.upload_file(
+                None,
+                item['name'],
+                backup_folder_id,
+                item.get('md5Checksum'),
+                service=service,
+                media=media
+            )
+
+            upload_error = None
+            if not uploaded_id:
+                upload_error = TransferAborted(f"Upload failed: {item['name']}")
+                media.abort(upload_error)
+
+            if download is None:
+                return True, uploaded_id
+
+            downloaded = download.result()
+
+            # Download cancelled because the upload gave up: report the upload
+            if not downloaded and upload_error is not None and media.error is upload_error:
+                downloaded = True
+
+            return downloaded, uploaded_id
+
+        finally:
+            media.close()
 
     def process_single_file(
         self,
@@ -1017,96 +2179,112 @@ class DriveBackupManager:
 
         thread_service = None
         local_path = None
+        local_size = None
+        digests = {}
 
         try:
             # Get thread-local service
             thread_service = self._get_thread_local_service()
 
             # Check if already backed up
-            with self.log_lock:
-                if item_id in self.backup_log['backed_up_files']:
-                    print(f"⏭️ Skipped (already backed up): {item_name}")
-                    self.stats['download']['skipped'] += 1
-                    return True
+            if item_id in self._backed_up_ids:
+                logger.info(f"⏭️ Skipped (already backed up): {item_name}")
+                self._count('download', 'skipped')
+                self._advance_progress(file_size)
+                return True
 
-            # Download
-            local_path = self.download_file(
-                item_id,
-                item_name,
-                file_size,
-                service=thread_service
-            )
+            # Server-side copy first: no bytes pass through Colab
+            uploaded_id = None
+            if SERVER_SIDE_COPY and item_id not in self._no_copy_ids:
+                uploaded_id = self._server_side_copy(
+                    item,
+                    backup_folder_id,
+                    thread_service
+                )
 
-            if self.shutdown_event.is_set():
-                self.backup_state.add_pending(item)
-                return False
+            if uploaded_id:
+                self._count('copy', 'success')
+                self._advance_progress(file_size)
+            else:
+                if file_size is not None:
+                    # Known size: upload while downloading
+                    downloaded, uploaded_id = self._stream_file(
+                        item,
+                        backup_folder_id,
+                        thread_service,
+                        digests
+                    )
+                else:
+                    # Download
+                    result = self.download_file(
+                        item_id,
+                        item_name,
+                        file_size,
+                        original_md5=original_md5,
+                        digests=digests
+                    )
+                    downloaded = result is not None
+                    if downloaded:
+                        local_path, local_size = result
+                    uploaded_id = None
 
-            if not local_path or not os.path.exists(local_path):
-                self.stats['download']['failed'] += 1
-                self.backup_state.add_failed(item)
-                return False
+                if self.shutdown_event.is_set():
+                    self.backup_state.add_pending(item)
+                    return False
+
+                if not downloaded:
+                    self._count('download', 'failed')
+                    self.backup_state.add_failed(item)
+                    return False
+
+                self._count('download', 'success')
+
+                # Upload
+                if local_path:
+                    uploaded_id = self.upload_file(
+                        local_path,
+                        item_name,
+                        backup_folder_id,
+                        original_md5,
+                        service=thread_service,
+                        local_size=local_size
+                    )
 
-            self.stats['download']['success'] += 1
+                if self.shutdown_event.is_set():
+                    self.backup_state.add_pending(item)
+                    return False
 
-            # Upload
-            uploaded_id = self.upload_file(
-                local_path,
-                item_name,
-                backup_folder_id,
-                original_md5,
-                service=thread_service
-            )
+                if not uploaded_id:
+                    self._count('upload', 'failed')
+                    self.backup_state.add_failed(item)
+                    return False
 
-            if self.shutdown_event.is_set():
-                self.backup_state.add_pending(item)
-                return False
+                self._count('upload', 'success')
 
-            if not uploaded_id:
-                self.stats['upload']['failed'] += 1
-                self.backup_state.add_failed(item)
-                return False
-
-            self.stats['upload']['success'] += 1
-
-            # Save to log (atomic operation)
-            with self.log_lock:
-                self.backup_log['backed_up_files'][item_id] = {
-                    'name': item_name,
-                    'type': 'file',
-                    'size': file_size,
-                    'md5': original_md5,
-                    'backup_id': uploaded_id,
-                    'backup_time': datetime.now().isoformat()
-                }
+            # Save to log and checkpoint
+            self._record_backed_up_file(item, uploaded_id, digests.get('blake3'))
 
             # Cleanup local file
-            try:
-                os.remove(local_path)
-                local_path = None
-            except:
-                pass
-
-            # Checkpoint: Save log and increment counter
-            self._save_log()
-            self.backup_state.increment_processed()
-            self.backup_state.remove_from_pending(item_id)
-
-            # Memory cleanup check
-            self.memory_monitor.check_and_cleanup()
+            if local_path:
+                try:
+                    os.unlink(local_path)
+                    local_path = None
+                except OSError:
+                    pass
 
             return True
 
         except Exception as e:
-            print(f"❌ Error processing {item_name}: {e}")
+            logger.error(f"❌ Error processing {item_name}: {e}")
             self.backup_state.add_failed(item)
             return False
 
         finally:
             # Ensure local file cleanup
-            if local_path and os.path.exists(local_path):
+            if local_path:
                 try:
-                    os.remove(local_path)
-                except:
+                    os.unlink(local_path)
+                except OSError:
                     pass
 
     def process_files_batch(
@@ -1120,26 +2298,62 @@ class DriveBackupManager:
 
         print(f"\n🚀 Processing {len(files)} files...")
 
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_workers
-        ) as executor:
-            futures = {
-                executor.submit(
+        # Already backed up (resume): skip here instead of submitting them
+        todo = [f for f in files if f['id'] not in self._backed_up_ids]
+        skipped = len(files) - len(todo)
+        if skipped:
+            self._count('download', 'skipped', skipped)
+            print(f"⏭️ Skipped {skipped} already backed up files")
+        files = todo
+        if not files:
+            return
+
+        # Bounded window: only max_workers * 2 files are submitted at a time,
+        # so memory stays O(workers) instead of O(files)
+        in_flight = set()
+        submitted = {}  # future -> file item
+        window = self.max_workers * 2
+        completed = 0
+
+        # Imported here: only needed once a batch actually runs
+        from tqdm.notebook import tqdm
+
+        # One progress bar for the whole batch instead of one per file
+        self._pbar = tqdm(
+            total=sum(int(f.get('size') or 0) for f in files),
+            desc=f"📥 {len(files)} files",
+            unit='B',
+            unit_scale=True
+        )
+
+        # Batched server-side copies first; only the rest goes to the workers
+        pending_files = iter(self._batch_copy(files, backup_folder_id))
+
+        while True:
+            while len(in_flight) < window and not self.shutdown_event.is_set():
+                file_item = next(pending_files, None)
+                if file_item is None:
+                    break
+                future = self.file_executor.submit(
                     self.process_single_file,
                     file_item,
                     backup_folder_id
-                ): file_item
-                for file_item in files
-            }
+                )
+                in_flight.add(future)
+                submitted[future] = file_item
 
-            completed = 0
+            if not in_flight:
+                break
 
-            for future in concurrent.futures.as_completed(futures):
-                if self.shutdown_event.is_set():
-                    print("\n⏸️ Shutting down gracefully...")
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    break
+            # Timeout so a shutdown request is noticed without waiting for a file
+            done, in_flight = concurrent.futures.wait(
+                in_flight,
+                timeout=1.0,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
 
+            for future in done:
+                self._pbar.set_postfix_str(submitted.pop(future)['name'][:40], refresh=False)
                 completed += 1
 
                 try:
@@ -1147,75 +2361,126 @@ class DriveBackupManager:
                 except Exception as e:
                     print(f"⚠️ Future exception: {e}")
 
+                # Checkpoint: fsync journal every LOG_FLUSH_EVERY files or LOG_FLUSH_INTERVAL s
+                if (completed % LOG_FLUSH_EVERY == 0
+                        or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL):
+                    self._flush_log()
+
                 # Periodic memory cleanup
-                if completed % 20 == 0:
+                self._files_since_mem_check += 1
+                if self._files_since_mem_check >= MEMORY_CHECK_EVERY:
+                    self._files_since_mem_check = 0
                     if self.memory_monitor.check_and_cleanup():
                         print(f"♻️ Memory cleanup performed ({completed}/{len(files)})")
 
-        # Final cleanup for large batches
-        if len(files) > 50:
-            gc.collect()
+            if self.shutdown_event.is_set():
+                print("\n⏸️ Shutting down gracefully...")
+                # Files that never started stay pending for the resume
+                not_started = [submitted[f] for f in in_flight if f.cancel()]
+                not_started.extend(pending_files)
+                self.backup_state.add_pending_many(not_started)
+                break
 
-    def backup_folder_recursive(
+        # Wait for files already in flight (after a shutdown break)
+        concurrent.futures.wait(in_flight)
+        self._pbar.close()
+        self._pbar = None
+
+        # Persist whatever finished (also after a shutdown break)
+        self._flush_log()
+        self.backup_state.flush()
+
+    def _open_folder(
         self,
         source_folder_id: str,
-        backup_folder_id: str
-    ):
-        """Recursive backup with proper state management"""
-        if self.shutdown_event.is_set():
-            return
-
+        backup_folder_id: str,
+        folder_item: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """List a folder and start prefetching its subfolders (one stack frame of the walk)"""
         # List items
         items = self.list_files_in_folder(source_folder_id)
+        listed = items is not None
+        items = items or []
         print(f"\n📊 Found {len(items)} items in folder")
 
         # Separate folders and files
-        folders = [
-            i for i in items
-            if i['mimeType'] == 'application/vnd.google-apps.folder'
-        ]
-        files = [
-            i for i in items
-            if i['mimeType'] != 'application/vnd.google-apps.folder'
+        folders, files = [], []
+        add_folder, add_file = folders.append, files.append
+        for i in items:
+            (add_folder if i['mimeType'] == FOLDER_MIME else add_file)(i)
+
+        # Start listing all pending subfolders in grouped background queries
+        pending_folders = [
+            i['id'] for i in folders
+            if i['id'] not in self._backed_up_ids
         ]
+        self._prefetch_listings(pending_folders)
 
-        # Process folders recursively
-        for folder_item in folders:
-            if self.shutdown_event.is_set():
-                break
+        return {
+            'item': folder_item,  # None for the root folder
+            'backup_id': backup_folder_id,
+            'folders': iter(folders),
+            'files': files,
+            'listed': listed  # False: listing failed, so never mark the folder done
+        }
+
+    def backup_folder_recursive(
+        self,
+        source_folder_id: str,
+        backup_folder_id: str
+    ):
+        """
+        Back up a folder tree depth-first with proper state management.
+
+        Walks with an explicit stack instead of recursion, so deep trees are
+        not bounded by Python's recursion limit. A folder is logged as backed
+        up only after it was listed and its subfolders and files finished
+        without a shutdown. A paused resume does not walk folders again; it
+        only retries the files still pending or failed in the state.
+        """
+        if self.shutdown_event.is_set():
+            return
 
-            item_id = folder_item['id']
-            item_name = folder_item['name']
+        stack = [self._open_folder(source_folder_id, backup_folder_id, None)]
 
-            # Skip if already backed up
-            with self.log_lock:
-                if item_id in self.backup_log['backed_up_files']:
+        while stack and not self.shutdown_event.is_set():
+            frame = stack[-1]
+
+            # Process folders depth-first
+            folder_item = next(frame['folders'], None)
+            if folder_item is not None:
+                item_id = folder_item['id']
+                item_name = folder_item['name']
+
+                # Skip if already backed up
+                if item_id in self._backed_up_ids:
                     print(f"⏭️ Skipped folder: {item_name}")
                     continue
 
-            print(f"\n📁 Processing folder: {item_name}")
+                print(f"\n📁 Processing folder: {item_name}")
 
-            # Create folder in backup
-            new_folder_id = self.create_folder(item_name, backup_folder_id)
+                # Create folder in backup
+                new_folder_id = self.create_folder(item_name, frame['backup_id'])
 
-            if new_folder_id:
-                # Recurse
-                self.backup_folder_recursive(item_id, new_folder_id)
+                if new_folder_id:
+                    stack.append(self._open_folder(item_id, new_folder_id, folder_item))
+                continue
 
-                # Mark folder as backed up
-                with self.log_lock:
-                    self.backup_log['backed_up_files'][item_id] = {
-                        'name': item_name,
-                        'type': 'folder',
-                        'backup_id': new_folder_id,
-                        'backup_time': datetime.now().isoformat()
-                    }
-
-                self._save_log()
+            # Subfolders done: process files in batch
+            stack.pop()
+            if frame['files']:
+                self.process_files_batch(frame['files'], frame['backup_id'])
 
-        # Process files in batch
-        if files and not self.shutdown_event.is_set():
-            self.process_files_batch(files, backup_folder_id)
+            # Mark folder as backed up
+            if (frame['item'] is not None and frame['listed']
+                    and not self.shutdown_event.is_set()):
+                self._append_log(frame['item']['id'], {
+                    'name': frame['item']['name'],
+                    'type': 'folder',
+                    'backup_id': frame['backup_id'],
+                    'backup_time': self._now_iso()
+                })
+                self._flush_log()
 
     def smart_backup(self) -> Optional[str]:
         """
@@ -1235,10 +2500,17 @@ class DriveBackupManager:
                 print("💡 Come back later to resume\n")
                 return None
 
+            # Cooldown persisted at pause time (the breaker starts fresh every run)
+            remaining = (snapshot.get('resumable_at') or 0) - time.time()
+            if remaining > 0:
+                print(f"\n⏰ Rate limit cooldown: {remaining / 3600:.1f}h remaining")
+                print("💡 Come back later to resume\n")
+                return None
+
             # Resume
-            print("\n" + "="*80)
+            print("\n" + _RULE)
             print("🔄 AUTO-RESUME DETECTED")
-            print("="*80)
+            print(_RULE)
 
             backup_folder_id = snapshot.get('backup_folder_id')
             if not backup_folder_id:
@@ -1247,13 +2519,13 @@ class DriveBackupManager:
 
             print(f"📁 Backup folder: {backup_folder_id}")
 
-            pending = snapshot.get('pending_files', [])
-            failed = snapshot.get('failed_files', [])
+            pending = snapshot.get('pending_files', {})
+            failed = snapshot.get('failed_files', {})
 
             print(f"📊 Pending: {len(pending)} | Failed: {len(failed)}")
 
-            # Retry all pending and failed files
-            all_retry = pending + failed
+            # Retry all pending and failed files (once each, even if in both)
+            all_retry = list({**pending, **failed}.values())
 
             if all_retry:
                 print(f"\n🔄 Retrying {len(all_retry)} files...")
@@ -1261,8 +2533,8 @@ class DriveBackupManager:
 
                 if not self.shutdown_event.is_set():
                     self.backup_state.update(
-                        pending_files=[],
-                        failed_files=[],
+                        pending_files={},
+                        failed_files={},
                         status='completed',
                         circuit_breaker_state='CLOSED'
                     )
@@ -1274,9 +2546,9 @@ class DriveBackupManager:
             return backup_folder_id
 
         # New backup
-        print("\n" + "="*80)
+        print("\n" + _RULE)
         print("🆕 STARTING NEW BACKUP")
-        print("="*80)
+        print(_RULE)
 
         # Get source info
         source_info = self.get_file_info(SOURCE_FOLDER_ID)
@@ -1320,13 +2592,15 @@ class DriveBackupManager:
 
     def print_stats(self):
         """Print comprehensive statistics"""
+        stats = self.stats
         print(f"\n📊 STATISTICS:")
-        print("="*80)
-        print(f"Download: ✅ {self.stats['download']['success']} | "
-              f"❌ {self.stats['download']['failed']} | "
-              f"⏭️ {self.stats['download']['skipped']}")
-        print(f"Upload:   ✅ {self.stats['upload']['success']} | "
-              f"❌ {self.stats['upload']['failed']}")
+        print(_RULE)
+        print(f"Download: ✅ {stats['download']['success']} | "
+              f"❌ {stats['download']['failed']} | "
+              f"⏭️ {stats['download']['skipped']}")
+        print(f"Upload:   ✅ {stats['upload']['success']} | "
+              f"❌ {stats['upload']['failed']}")
+        print(f"Copy:     ✅ {stats['copy']['success']}")
 
         total_backed_up = len(self.backup_log['backed_up_files'])
         files_count = sum(
@@ -1353,23 +2627,38 @@ class DriveBackupManager:
             print(f"\nMemory: {mem_usage['percent']:.1f}% used "
                   f"({mem_usage['available_gb']:.1f}GB available)")
 
-        print("="*80 + "\n")
+        print(_RULE + "\n")
 
     def get_backup_summary(self):
         """Get backup summary"""
         snapshot = self.backup_state.get_snapshot()
 
-        print("\n" + "="*80)
+        print("\n" + _RULE)
         print("📊 BACKUP SUMMARY")
-        print("="*80)
+        print(_RULE)
         print(f"Status: {snapshot['status']}")
         print(f"Total processed: {snapshot['total_files_processed']}")
         print(f"Pending: {len(snapshot.get('pending_files', []))}")
         print(f"Failed: {len(snapshot.get('failed_files', []))}")
         print(f"Last run: {self.backup_log.get('last_run', 'Never')}")
-        print("="*80 + "\n")
+        print(_RULE + "\n")
 
 
+# Parse state/log files on a worker thread while the OAuth prompt is open
+_preload_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+_preload_future = _preload_pool.submit(DriveBackupManager.preload, LOG_FILE, STATE_FILE)
+_preload_pool.shutdown(wait=False)
+
+# ============================================================
+# AUTHENTICATION
+# ============================================================
+
+print("🔐 Authenticating with Google Drive...")
+auth.authenticate_user()
+creds, _ = default()
+drive_service = build('drive', 'v3', credentials=creds, cache_discovery=False)
+print("✅ Authentication successful!\n")
+
 # ============================================================
 # MAIN EXECUTION
 # ============================================================
@@ -1380,7 +2669,8 @@ backup_manager = DriveBackupManager(
     log_file=LOG_FILE,
     state_file=STATE_FILE,
     max_workers=MAX_WORKERS,
-    manual_mode=MANUAL_RESUME_MODE
+    manual_mode=MANUAL_RESUME_MODE,
+    preloaded=_preload_future.result()
 )
 
 # Show current status
@@ -1390,20 +2680,26 @@ backup_manager.get_backup_summary()
 # RUN BACKUP
 # ============================================================
 
-print("\n" + "="*80)
-print("🎯 RECOMMENDED WORKFLOW:")
-print("="*80)
-print("1. Run backup normally")
-print("2. If rate limit occurs → STOP RUNTIME")
-print("3. Wait 24 hours")
-print("4. Restart notebook → Auto-resume")
-print("="*80 + "\n")
+print(_WORKFLOW_BANNER)
 
 print("🚀 STARTING BACKUP...")
 start_time = time.time()
 
 # Run smart backup
-backup_folder_id = backup_manager.smart_backup()
+# Full collections stop every worker; a high gen0 threshold lets the
+# generational GC run rarely and amortized, with one collection at the
+# end. freeze() keeps the loaded log out of those collections.
+_gc_threshold = gc.get_threshold()
+gc.freeze()
+gc.set_threshold(50000, 20, 20)
+try:
+    backup_folder_id = backup_manager.smart_backup()
+finally:
+    # The Colab kernel outlives the run, so atexit alone would keep temp files
+    backup_manager.close()
+    gc.set_threshold(*_gc_threshold)
+    gc.unfreeze()
+    gc.collect()
 
 end_time = time.time()
 
@@ -1421,13 +2717,7 @@ if backup_folder_id:
     backup_manager.get_backup_summary()
 
 elif backup_manager.shutdown_event.is_set():
-    print(f"\n💡 NEXT STEPS:")
-    print("="*80)
-    print("✅ State saved safely")
-    print("✅ STOP RUNTIME NOW (Runtime → Disconnect)")
-    print("✅ Wait 24 hours")
-    print("✅ Reopen notebook → Run all → Auto-resume")
-    print("="*80 + "\n")
+    print(_NEXT_STEPS_BANNER)
 
 else:
     print("\n❌ BACKUP FAILED!")
@@ -1436,30 +2726,133 @@ else:
 # UTILITIES
 # ============================================================
 
+# path -> ((mtime_ns, size), parsed JSON or its summary)
+_json_cache = {}
+
+# Reads the state and log files concurrently for view_all
+_io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='view')
+
+def _load_json_cached(path, summarize=None):
+    """
+    Parse a JSON file, reusing the last result while the file is unchanged.
+
+    If `summarize` is given, only summarize(document) is kept, so a large
+    document is freed right after parsing instead of staying cached.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != key:
+        document = _read_json(path)
+        cached = (key, summarize(document) if summarize else document)
+        _json_cache[path] = cached
+    return cached[1]
+
+def _summarize_log(log):
+    """Keep only what view_log prints from a parsed log snapshot"""
+    summary = {'backed_up_files': len(log['backed_up_files'])}
+    if 'last_run' in log:
+        summary['last_run'] = log['last_run']
+    return summary
+
+def _load_log_summary():
+    """Count and last run of the log snapshot, or None if there is none"""
+    try:
+        log_mtime = os.stat(LOG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    # Summary sidecar is written after each snapshot; older means stale
+    summary_file = os.path.splitext(LOG_FILE)[0] + '.summary.json'
+    try:
+        if os.stat(summary_file).st_mtime_ns >= log_mtime:
+            return _load_json_cached(summary_file)
+    except (OSError, ValueError):
+        pass
+    try:
+        return _load_json_cached(LOG_FILE, _summarize_log)
+    except FileNotFoundError:
+        return None
+
 def view_state():
     """View current state"""
-    if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, 'r') as f:
-            state = json.load(f)
-            print("\n📊 CURRENT STATE:")
-            print(json.dumps(state, indent=2, ensure_ascii=False))
-
-def view_log():
-    """View backup log"""
-    if os.path.exists(LOG_FILE):
-        with open(LOG_FILE, 'r') as f:
-            log = json.load(f)
-            print(f"\n📊 BACKUP LOG:")
-            print(f"Total items: {len(log['backed_up_files'])}")
-            print(f"Last run: {log.get('last_run', 'Never')}")
+    # Prefer live in-memory state over re-parsing the file
+    if 'backup_manager' in globals():
+        state = backup_manager.backup_state.get_snapshot()
+    else:
+        try:
+            state = _load_json_cached(STATE_FILE)
+        except FileNotFoundError:
+            return
+
+    print("\n📊 CURRENT STATE:")
+    print(orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode())
+
+def view_log(recent: int = 20):
+    """View backup log and the most recent per-file events"""
+    journal_file = os.path.splitext(LOG_FILE)[0] + '.jsonl'
+    if 'backup_manager' in globals():
+        log = backup_manager.backup_log
+        total = len(log['backed_up_files'])
+    else:
+        # Missing files are found by open/stat failing, not a prior exists()
+        log = _load_log_summary()
+
+        # Entries not yet compacted into the snapshot: one per complete journal
+        # line, counted per block with bytes.count (no per-line objects)
+        try:
+            with open(journal_file, 'rb', buffering=0) as f:
+                journaled = sum(
+                    block.count(b'\n') for block in iter(lambda: f.read(LOG_IO_BUFFER), b'')
+                )
+        except FileNotFoundError:
+            if log is None:
+                return
+            journaled = 0
+
+        log = log or {}
+        total = log.get('backed_up_files', 0) + journaled
+
+    print(f"\n📊 BACKUP LOG:")
+    print(f"Total items: {total}")
+    print(f"Last run: {log.get('last_run', 'Never')}")
+
+    events = list(_recent_events)[-recent:]
+    if events:
+        print(f"\nRecent events ({len(events)}):")
+        for line in events:
+            print(f"  {line}")
+
+def view_all(recent: int = 20):
+    """View state and log, reading both files at the same time"""
+    if 'backup_manager' not in globals():
+        # Overlap the two reads; the views below then hit the parse cache
+        concurrent.futures.wait([
+            _io_pool.submit(_load_json_cached, STATE_FILE),
+            _io_pool.submit(_load_log_summary)
+        ])
+    view_state()
+    view_log(recent)
 
 def download_files():
-    """Download state and log files"""
-    from google.colab import files
-    for filename in [STATE_FILE, LOG_FILE]:
-        if os.path.exists(filename):
-            files.download(filename)
-            print(f"✅ Downloaded: {filename}")
+    """Download state and log files as one zip (one browser transfer)"""
+    journal_file = os.path.splitext(LOG_FILE)[0] + '.jsonl'
+    # Level 1: JSON still shrinks several-fold, at little CPU cost
+    bundle = os.path.join(tempfile.gettempdir(), 'driveguard_files.zip')
+    present = []
+    with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for filename in (STATE_FILE, LOG_FILE, journal_file):
+            try:
+                zf.write(filename, os.path.basename(filename))
+                present.append(filename)
+            except FileNotFoundError:
+                pass
+    if not present:
+        os.unlink(bundle)
+        return
+
+    files.download(bundle)
+    print(f"✅ Downloaded: {', '.join(present)} ({os.path.basename(bundle)})")
 
 def get_circuit_breaker_status():
     """Get circuit breaker status"""
@@ -1467,32 +2860,23 @@ def get_circuit_breaker_status():
         status = backup_manager.circuit_breaker.get_status()
         print("\n🔌 CIRCUIT BREAKER STATUS:")
         print(f"  State: {status['state']}")
-        print(f"  Failures: {status['failures_in_window']}/{status['threshold']}")
-        if status['last_failure']:
-            last = datetime.fromtimestamp(status['last_failure'])
-            print(f"  Last failure: {last.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"  {'Operation':<10} {'State':<10} {'Failures':<9} Last failure")
+        for op, op_status in status['ops'].items():
+            last = op_status['last_failure']
+            last_text = datetime.fromtimestamp(last).strftime('%Y-%m-%d %H:%M:%S') if last else '-'
+            failures = f"{op_status['failures_in_window']}/{status['threshold']}"
+            print(f"  {op:<10} {op_status['state']:<10} {failures:<9} {last_text}")
 
 def force_reset_circuit_breaker():
     """Force reset circuit breaker (use with caution)"""
     if 'backup_manager' in globals():
-        backup_manager.circuit_breaker.state = 'CLOSED'
-        backup_manager.circuit_breaker.failures.clear()
+        backup_manager.circuit_breaker.reset()
+        backup_manager.backoff.reset_all()
         backup_manager.backup_state.update(
             circuit_breaker_state='CLOSED',
-            last_rate_limit_time=None
+            last_rate_limit_time=None,
+            resumable_at=None
         )
         print("✅ Circuit breaker reset!")
 
-print("""
-================================================================================
-                        UTILITIES
-================================================================================
-
-view_state()                    # View current backup state
-view_log()                      # View backup log
-download_files()                # Download state + log files
-get_circuit_breaker_status()    # Check circuit breaker
-force_reset_circuit_breaker()   # Reset circuit breaker (caution!)
-
-================================================================================
-""")
+print(_UTILITIES_BANNER)
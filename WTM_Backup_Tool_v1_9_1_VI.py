@@ -49,19 +49,33 @@ TỐI ƯU HÓA BỘ NHỚ:
 print("📦 Đang cài đặt các thư viện phụ thuộc...")
 import subprocess
 import sys
+import importlib.util
+
+# Tên gói pip -> tên module khi import
+packages = {
+    'google-auth': 'google.auth',
+    'google-auth-oauthlib': 'google_auth_oauthlib',
+    'google-auth-httplib2': 'google_auth_httplib2',
+    'google-api-python-client': 'googleapiclient',
+    'tqdm': 'tqdm',
+    'requests': 'requests',
+    'psutil': 'psutil',
+    'orjson': 'orjson',
+    'blake3': 'blake3'
+}
+
+
+def _is_installed(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
 
-packages = [
-    'google-auth',
-    'google-auth-oauthlib',
-    'google-auth-httplib2',
-    'google-api-python-client',
-    'tqdm',
-    'requests',
-    'psutil'
-]
 
-for package in packages:
-    subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-q', package])
+# Chỉ chạy pip một lần cho các gói còn thiếu (Colab đã cài sẵn phần lớn)
+missing = [package for package, module in packages.items() if not _is_installed(module)]
+if missing:
+    subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-q', *missing])
 
 print("✅ Đã cài đặt xong các thư viện!\n")
 
@@ -70,40 +84,126 @@ print("✅ Đã cài đặt xong các thư viện!\n")
 # ============================================================
 
 import os
-import json
 import hashlib
 import time
 import random
-from datetime import datetime, timedelta
-from pathlib import Path
-import io
+import tempfile
+import mmap
+import zipfile
+import shutil
+from datetime import datetime, timedelta, timezone
 import logging
+import logging.handlers
+import queue
 import gc
 import signal
 import atexit
-from threading import Lock, Event, RLock
-from contextlib import contextmanager
+from threading import Lock, Event, RLock, Condition, local
+from contextlib import contextmanager, nullcontext
 import concurrent.futures
 import multiprocessing
-from collections import deque
+from collections import Counter, deque
 from typing import Optional, Dict, List, Any, Tuple
 
 # Google Drive API
-from google.colab import auth
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
+from google.colab import auth, files
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import MediaFileUpload, MediaUpload
 from googleapiclient.errors import HttpError
 from google.auth import default
+from google.auth.transport.requests import AuthorizedSession
+import httplib2
+import google_auth_httplib2
 
-# Progress bar
-from tqdm.notebook import tqdm
+# HTTP dùng chung (pool) cho tải xuống media
+import requests
 
 # System monitoring
 import psutil
 
+# JSON tốc độ cao (C extension) cho log sao lưu
+import orjson
+
+# Băm SIMD cho sổ kiểm tra toàn vẹn cục bộ
+from blake3 import blake3
+
 # Suppress warnings
 logging.getLogger('google_auth_httplib2').setLevel(logging.ERROR)
 
+# Thông báo theo từng file: worker chỉ đưa record vào hàng đợi, một luồng listener in ra
+logger = logging.getLogger('driveguard')
+
+
+class _RecentEventsHandler(logging.Handler):
+    """Giữ các sự kiện theo file gần nhất trong bộ nhớ cho view_log()"""
+
+    def __init__(self, events: deque):
+        super().__init__()
+        self.events = events
+
+    def emit(self, record):
+        self.events.append(self.format(record))
+
+
+if not logger.handlers:
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    _log_queue = queue.Queue()
+    _recent_events = deque(maxlen=200)
+    _console_handler = logging.StreamHandler(sys.stdout)
+    _console_handler.setFormatter(logging.Formatter('%(message)s'))
+    # Thông báo thành công theo file chỉ in ra console ở chế độ verbose; thanh tiến độ đã thể hiện
+    _console_handler.addFilter(lambda record: VERBOSE_FILE_LOG or record.levelno >= logging.WARNING)
+    _recent_handler = _RecentEventsHandler(_recent_events)
+    _recent_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s', '%H:%M:%S'))
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _console_handler, _recent_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# ============================================================
+# BANNER HIỂN THỊ (CONSOLE BANNERS)
+# ============================================================
+
+_RULE = "=" * 80
+
+_WORKFLOW_BANNER = (
+    f"\n{_RULE}\n"
+    "🎯 QUY TRÌNH KHUYẾN NGHỊ:\n"
+    f"{_RULE}\n"
+    "1. Chạy sao lưu bình thường\n"
+    "2. Nếu gặp lỗi giới hạn tốc độ (rate limit) → DỪNG RUNTIME\n"
+    "3. Đợi 24 giờ\n"
+    "4. Khởi động lại notebook → Tự động khôi phục (Auto-resume)\n"
+    f"{_RULE}\n"
+)
+
+_NEXT_STEPS_BANNER = (
+    "\n💡 CÁC BƯỚC TIẾP THEO:\n"
+    f"{_RULE}\n"
+    "✅ Trạng thái đã được lưu an toàn\n"
+    "✅ DỪNG RUNTIME NGAY LẬP TỨC (Runtime → Disconnect)\n"
+    "✅ Đợi 24 giờ\n"
+    "✅ Mở lại notebook → Chạy tất cả → Tự động khôi phục\n"
+    f"{_RULE}\n"
+)
+
+_UTILITIES_BANNER = (
+    f"\n{_RULE}\n"
+    "                        CÁC TIỆN ÍCH HỖ TRỢ (UTILITIES)\n"
+    f"{_RULE}\n"
+    "\n"
+    "view_state()                    # Xem trạng thái sao lưu hiện tại\n"
+    "view_log()                      # Xem log sao lưu + sự kiện gần nhất\n"
+    "view_all()                      # Cả hai mục trên (đọc file song song)\n"
+    "download_files()                # Tải xuống file trạng thái + log\n"
+    "get_circuit_breaker_status()    # Kiểm tra circuit breaker\n"
+    "force_reset_circuit_breaker()   # Reset circuit breaker (cẩn thận!)\n"
+    "\n"
+    f"{_RULE}\n"
+)
+
 # ============================================================
 # CẤU HÌNH (CONFIGURATION)
 # ============================================================
@@ -115,6 +215,7 @@ BACKUP_PARENT_ID = '1l22l645436789axxttuii'  # ⚠️ THAY ĐỔI CÁI NÀY
 # 🏷️ Cài đặt
 FOLDER_SUFFIX = '_BACKUP'
 MAX_WORKERS = None  # Tự động phát hiện
+SERVER_SIDE_COPY = True  # Ưu tiên sao chép trong Drive, chỉ tải xuống + tải lên khi không được
 
 # 🛡️ Bảo vệ giới hạn tốc độ (Mô hình Circuit Breaker)
 RATE_LIMIT_THRESHOLD = 3          # Số lỗi trước khi ngắt mạch
@@ -130,35 +231,58 @@ MANUAL_RESUME_MODE = True
 
 # 🔧 Cài đặt nâng cao
 CHUNK_SIZE = 10 * 1024 * 1024      # 10MB chunks
+MIN_CHUNK_SIZE = 256 * 1024         # Giới hạn dưới của chunk tải lên thích ứng
+MAX_CHUNK_SIZE = 32 * 1024 * 1024   # Giới hạn trên của chunk tải lên thích ứng
+MEDIA_READ_SIZE = 1024 * 1024       # Kích thước mỗi lần đọc khi tải xuống (một GET streaming mỗi file)
+HTTP_TIMEOUT = 120                  # Số giây không có dữ liệu trước khi tải xuống thất bại
 MAX_RETRIES = 3                     # Số lần thử lại mỗi thao tác
 INITIAL_BACKOFF = 5                 # Thời gian chờ ban đầu (giây)
 MAX_BACKOFF = 300                   # Thời gian chờ tối đa (giây)
 MEMORY_CLEANUP_THRESHOLD = 80       # Ngưỡng RAM % để dọn dẹp
+MEMORY_CHECK_EVERY = 200            # Số file giữa các lần kiểm tra RAM (mỗi lần đọc /proc)
 MAX_FILE_HANDLES = 10               # Số file handle tối đa đồng thời
+VERBOSE_FILE_LOG = False            # In mọi sự kiện theo file (nếu không: chỉ cảnh báo; view_log() xem gần nhất)
+LOG_PRETTY_JSON = False             # Thụt lề snapshot log và file trạng thái (chỉ để debug)
+LOG_FLUSH_EVERY = 50                # Số file giữa các lần fsync journal
+LOG_FLUSH_INTERVAL = 30             # Số giây tối đa giữa các lần fsync journal
+LOG_COMPACT_EVERY = 1000            # Số bản ghi journal tối thiểu giữa các lần ghi snapshot log (hoặc 1/4 log)
+LOG_IO_BUFFER = 1 << 20             # Bộ đệm đọc/ghi thêm journal (mặc định 8 KB gây nhiều syscall nhỏ)
+JSON_MMAP_MIN_SIZE = 1 << 20        # File JSON từ cỡ này được parse từ mmap, không sao chép
+STATE_FLUSH_EVERY = 25              # Số thay đổi trạng thái theo file giữa các lần ghi file trạng thái
+STATE_FLUSH_INTERVAL = 5            # Số giây tối đa giữa các lần ghi file trạng thái
+LIST_BATCH_FOLDERS = 50             # Số thư mục anh em liệt kê trong một truy vấn
+COPY_BATCH_SIZE = 100               # Số lệnh sao chép phía máy chủ mỗi batch HTTP (Drive tối đa 100)
+STREAM_SPOOL_SIZE = 4 * CHUNK_SIZE  # Bộ đệm RAM mỗi file trước khi ghi ra đĩa
+SIMPLE_UPLOAD_MAX = 5 * 1024 * 1024 # File nhỏ hơn được tải lên bằng một POST multipart
 
 # 🚦 Giới hạn tốc độ toàn cục (MỚI - ngăn chặn vượt quá hạn ngạch API)
 GLOBAL_RATE_LIMIT_DELAY = 1.0      # Giây giữa các lần gọi API (toàn cục)
+GLOBAL_RATE_LIMIT_BURST = 3        # Số lần gọi API liên tiếp được phép trước khi giãn nhịp
 MAX_CONCURRENT_WORKERS = 3          # Số worker tối đa (người dùng chọn)
+DRIVE_QPS_LIMIT = 10                # Hạn ngạch Drive API mỗi người dùng (truy vấn/giây)
+
+# MIME type của thư mục trong Drive
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+
+# Mã HTTP đáng thử lại cho các lệnh gọi API thông thường
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Các lý do lỗi Drive được coi là rate limit
+RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded', 'quotaExceeded'})
+
+_CONFIG_BANNER = (
+    f"{_RULE}\n"
+    "⚙️  CẤU HÌNH:\n"
+    f"{_RULE}\n"
+    f"📁 Nguồn: {SOURCE_FOLDER_ID}\n"
+    f"📁 Thư mục cha sao lưu: {BACKUP_PARENT_ID}\n"
+    f"🎯 Chế độ: {'KHÔI PHỤC THỦ CÔNG' if MANUAL_RESUME_MODE else 'TỰ ĐỘNG KHÔI PHỤC'}\n"
+    f"🛡️ Giới hạn tốc độ: {RATE_LIMIT_THRESHOLD} lỗi trong {RATE_LIMIT_WINDOW_SECONDS}s\n"
+    f"💾 Kích thước Chunk: {CHUNK_SIZE / (1024*1024):.0f}MB\n"
+    f"{_RULE}\n"
+)
 
-print("="*80)
-print("⚙️  CẤU HÌNH:")
-print("="*80)
-print(f"📁 Nguồn: {SOURCE_FOLDER_ID}")
-print(f"📁 Thư mục cha sao lưu: {BACKUP_PARENT_ID}")
-print(f"🎯 Chế độ: {'KHÔI PHỤC THỦ CÔNG' if MANUAL_RESUME_MODE else 'TỰ ĐỘNG KHÔI PHỤC'}")
-print(f"🛡️ Giới hạn tốc độ: {RATE_LIMIT_THRESHOLD} lỗi trong {RATE_LIMIT_WINDOW_SECONDS}s")
-print(f"💾 Kích thước Chunk: {CHUNK_SIZE / (1024*1024):.0f}MB")
-print("="*80 + "\n")
-
-# ============================================================
-# XÁC THỰC (AUTHENTICATION)
-# ============================================================
-
-print("🔐 Đang xác thực với Google Drive...")
-auth.authenticate_user()
-creds, _ = default()
-drive_service = build('drive', 'v3', credentials=creds)
-print("✅ Xác thực thành công!\n")
+print(_CONFIG_BANNER)
 
 # ============================================================
 # CÁC LỚP TIỆN ÍCH (UTILITY CLASSES)
@@ -168,7 +292,10 @@ class CircuitBreaker:
     """
     Mô hình Circuit breaker để bảo vệ giới hạn tốc độ.
 
-    Trạng thái:
+    Tách riêng theo thao tác ('download', 'upload', 'copy'): Drive áp dụng
+    hạn ngạch riêng, nên một thao tác hết hạn ngạch không chặn các thao tác khác.
+
+    Trạng thái (theo từng thao tác):
     - CLOSED: Hoạt động bình thường
     - OPEN: Quá nhiều lỗi, chặn tất cả yêu cầu
     - HALF_OPEN: Đang kiểm tra xem dịch vụ đã khôi phục chưa
@@ -179,19 +306,29 @@ class CircuitBreaker:
         self.window_seconds = window_seconds
         self.cooldown_seconds = cooldown_hours * 3600
 
-        self.state = 'CLOSED'
-        self.failures = deque()  # Thời gian xảy ra lỗi
-        self.last_failure_time = None
+        # op -> 'CLOSED' | 'OPEN' | 'HALF_OPEN' (không có nghĩa là CLOSED)
+        self.state = {}
+        self.failures = {}  # op -> thời gian xảy ra lỗi
+        # Đồng hồ monotonic để tính khoảng thời gian, giờ thực chỉ để hiển thị
+        self.last_failure_time = {}
+        self.last_failure_wall_time = {}
         self.lock = RLock()
 
-    def record_success(self):
-        """Ghi nhận thao tác thành công"""
+    def record_success(self, op: str) -> bool:
+        """
+        Ghi nhận thao tác thành công
+
+        Returns:
+            bool: True nếu circuit vừa đóng lại (đã phục hồi)
+        """
         with self.lock:
-            if self.state == 'HALF_OPEN':
-                self.state = 'CLOSED'
-                self.failures.clear()
+            if self.state.get(op) == 'HALF_OPEN':
+                self.state[op] = 'CLOSED'
+                self.failures[op].clear()
+                return True
+            return False
 
-    def record_failure(self) -> bool:
+    def record_failure(self, op: str) -> bool:
         """
         Ghi nhận lỗi và trả về True nếu mạch nên mở.
 
@@ -199,65 +336,82 @@ class CircuitBreaker:
             bool: True nếu circuit breaker bị kích hoạt
         """
         with self.lock:
-            now = time.time()
-            self.last_failure_time = now
-            self.failures.append(now)
+            now = time.monotonic()
+            self.last_failure_time[op] = now
+            self.last_failure_wall_time[op] = time.time()
+            failures = self.failures.setdefault(op, deque())
+            failures.append(now)
 
             # Xóa các lỗi cũ ngoài cửa sổ thời gian
             cutoff = now - self.window_seconds
-            while self.failures and self.failures[0] < cutoff:
-                self.failures.popleft()
+            while failures and failures[0] < cutoff:
+                failures.popleft()
 
             # Kiểm tra nếu vượt quá ngưỡng
-            if len(self.failures) >= self.threshold:
-                self.state = 'OPEN'
+            if len(failures) >= self.threshold:
+                self.state[op] = 'OPEN'
                 return True
 
             return False
 
-    def can_proceed(self) -> Tuple[bool, Optional[str]]:
+    def can_proceed(self, op: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
         Kiểm tra xem thao tác có thể tiếp tục không.
 
+        Không truyền `op` thì mọi thao tác đều phải được phép.
+
         Returns:
             Tuple[bool, Optional[str]]: (có_thể_tiếp_tục, lý_do_nếu_bị_chặn)
         """
         with self.lock:
-            if self.state == 'CLOSED':
-                return True, None
+            for name in ([op] if op else list(self.state)):
+                state = self.state.get(name, 'CLOSED')
 
-            if self.state == 'OPEN':
-                if self.last_failure_time:
-                    elapsed = time.time() - self.last_failure_time
+                if state == 'OPEN':
+                    elapsed = time.monotonic() - self.last_failure_time[name]
 
                     if elapsed >= self.cooldown_seconds:
-                        self.state = 'HALF_OPEN'
-                        return True, None
+                        self.state[name] = 'HALF_OPEN'
+                        continue
 
                     remaining = self.cooldown_seconds - elapsed
                     next_time = datetime.fromtimestamp(
-                        self.last_failure_time + self.cooldown_seconds
+                        self.last_failure_wall_time[name] + self.cooldown_seconds
                     )
 
                     return False, (
-                        f"Circuit breaker đang MỞ (OPEN). "
+                        f"Circuit breaker đang MỞ (OPEN) ({name}). "
                         f"Vui lòng đợi thêm {remaining/3600:.1f} giờ. "
                         f"Tiếp tục sau: {next_time.strftime('%Y-%m-%d %H:%M:%S')}"
                     )
 
-            if self.state == 'HALF_OPEN':
-                return True, None
+            return True, None
 
-            return False, "Trạng thái circuit breaker không xác định"
+    def reset(self):
+        """Đóng mọi circuit và xóa các lỗi đã ghi nhận"""
+        with self.lock:
+            self.state.clear()
+            self.failures.clear()
 
     def get_status(self) -> Dict[str, Any]:
-        """Lấy trạng thái hiện tại"""
+        """Lấy trạng thái hiện tại (tổng hợp và theo từng thao tác)"""
         with self.lock:
+            ops = {
+                name: {
+                    'state': self.state.get(name, 'CLOSED'),
+                    'failures_in_window': len(self.failures.get(name, ())),
+                    'last_failure': self.last_failure_wall_time.get(name)
+                }
+                for name in sorted(set(self.state) | set(self.failures))
+            }
+            states = {status['state'] for status in ops.values()}
+            overall = next((st for st in ('OPEN', 'HALF_OPEN') if st in states), 'CLOSED')
             return {
-                'state': self.state,
-                'failures_in_window': len(self.failures),
+                'state': overall,
+                'failures_in_window': max((st['failures_in_window'] for st in ops.values()), default=0),
                 'threshold': self.threshold,
-                'last_failure': self.last_failure_time
+                'last_failure': max((st['last_failure'] for st in ops.values() if st['last_failure']), default=None),
+                'ops': ops
             }
 
 
@@ -329,9 +483,9 @@ class MemoryMonitor:
             bool: True nếu đã thực hiện dọn dẹp
         """
         try:
-            mem = psutil.virtual_memory()
-            if mem.percent > self.threshold:
-                gc.collect()
+            # % RAM toàn hệ thống, cùng con số mà get_usage() và print_stats báo cáo
+            if psutil.virtual_memory().percent > self.threshold:
+                gc.collect(generation=2)
                 return True
         except:
             pass
@@ -352,85 +506,447 @@ class MemoryMonitor:
 
 class GlobalRateLimiter:
     """
-    Bộ giới hạn tốc độ toàn cục để kiểm soát tần suất gọi API trên tất cả các luồng.
-    Ngăn chặn việc chạm hạn ngạch Google Drive.
+    Token bucket toàn cục dùng chung cho tất cả các luồng.
+
+    Mỗi `min_delay` giây thêm một token, tối đa `burst` token, nên các đợt
+    gọi ngắn đi qua ngay trong khi tốc độ dài hạn vẫn không vượt quá
+    1/min_delay lần gọi mỗi giây. Việc chờ diễn ra bên ngoài lock.
     """
 
-    def __init__(self, min_delay: float = 1.0):
+    def __init__(self, min_delay: float = 1.0, burst: int = 1):
         self.min_delay = min_delay
-        self.last_call_time = 0.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
         self.lock = Lock()
 
-    def acquire(self):
+    def _refill(self):
+        """Cộng các token tích lũy từ lần nạp trước (phải gọi bên trong lock)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) / self.min_delay)
+        self.last_refill = now
+
+    def acquire(self, n: int = 1):
         """
-        Đợi nếu cần thiết để tuân thủ giới hạn tốc độ.
-        An toàn với luồng (Thread-safe) - chỉ một luồng được phép qua tại một thời điểm.
+        Lấy `n` token (mỗi lời gọi API một token), đợi cho đến khi có.
+        An toàn với luồng (Thread-safe) - số dư âm xếp hàng các luồng mà không giữ lock.
         """
         with self.lock:
-            now = time.time()
-            elapsed = now - self.last_call_time
-
-            if elapsed < self.min_delay:
-                sleep_time = self.min_delay - elapsed
-                time.sleep(sleep_time)
+            self._refill()
+            self.tokens -= n
+            wait = -self.tokens * self.min_delay if self.tokens < 0 else 0.0
 
-            self.last_call_time = time.time()
+        if wait > 0:
+            time.sleep(wait)
 
     def set_delay(self, delay: float):
         """Điều chỉnh độ trễ động (ví dụ: tăng lên sau khi gặp lỗi rate limit)"""
         with self.lock:
+            self._refill()
             self.min_delay = delay
 
 
+class BackoffScheduler:
+    """
+    Bộ lập lịch thử lại dùng backoff "decorrelated jitter".
+
+    sleep = min(cap, uniform(base, thời_gian_chờ_trước * 3))
+
+    Mỗi luồng worker có chuỗi thời gian chờ riêng (thread-local), nên các
+    worker gặp rate limit cùng lúc sẽ không thử lại cùng lúc.
+    """
+
+    def __init__(self, base: float, cap: float):
+        self.base = base
+        self.cap = cap
+        self._local = local()  # Thời gian chờ gần nhất của luồng hiện tại
+        self._generation = 0   # Tăng bởi reset_all() để khởi động lại mọi chuỗi
+
+    def next_sleep(self) -> float:
+        """
+        Tính thời gian chờ tiếp theo cho luồng hiện tại.
+
+        Returns:
+            float: Số giây cần đợi trước khi thử lại
+        """
+        prev = self.base
+        if getattr(self._local, 'generation', None) == self._generation:
+            prev = self._local.sleep
+
+        sleep = min(self.cap, random.uniform(self.base, prev * 3))
+        self._local.sleep = sleep
+        self._local.generation = self._generation
+        return sleep
+
+    def reset(self):
+        """Reset chuỗi thời gian chờ của luồng hiện tại sau khi thao tác thành công"""
+        self._local.generation = None
+
+    def reset_all(self):
+        """Reset chuỗi của mọi luồng (ví dụ: circuit breaker đã phục hồi)"""
+        self._generation += 1
+
+
+class ChunkSizer:
+    """
+    Kích thước chunk AIMD cho tải lên resumable (mỗi luồng worker một cái).
+
+    Tăng 25% sau `grow_after` chunk thành công liên tiếp, giảm một nửa khi
+    timeout hoặc rate limit. Luôn là bội số của 256KB (yêu cầu của Drive).
+    """
+
+    QUANTUM = 256 * 1024
+
+    def __init__(self, initial: int, minimum: int, maximum: int, grow_after: int = 3):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.grow_after = grow_after
+        self.value = self._clamp(initial)
+        self._streak = 0
+
+    def _clamp(self, size: int) -> int:
+        size = max(self.minimum, min(self.maximum, size))
+        return max(self.QUANTUM, size - size % self.QUANTUM)
+
+    def record_success(self):
+        """Chunk đã tải lên"""
+        self._streak += 1
+        if self._streak >= self.grow_after:
+            self._streak = 0
+            self.value = self._clamp(self.value + self.value // 4)
+
+    def record_failure(self):
+        """Timeout hoặc rate limit"""
+        self._streak = 0
+        self.value = self._clamp(self.value // 2)
+
+
+class HashingWriter:
+    """
+    Proxy dạng file băm byte trong khi ghi.
+
+    MD5 dùng để so với md5Checksum của Drive, nên chỉ được tính khi có
+    checksum để so (`md5=True`); BLAKE3 được lưu vào log sao lưu làm bản
+    ghi kiểm tra toàn vẹn cục bộ nhanh hơn.
+    """
+
+    def __init__(self, inner, md5: bool = True):
+        self.inner = inner
+        self._md5 = hashlib.md5() if md5 else None
+        self._blake3 = blake3()
+
+    def write(self, data: bytes) -> int:
+        if self._md5 is not None:
+            self._md5.update(data)
+        self._blake3.update(data)
+        return self.inner.write(data)
+
+    def md5_hexdigest(self) -> Optional[str]:
+        return self._md5.hexdigest() if self._md5 is not None else None
+
+    def blake3_hexdigest(self) -> str:
+        return self._blake3.hexdigest()
+
+
+class TransferAborted(Exception):
+    """Truyền dữ liệu streaming bị hủy (tắt chương trình, hoặc phía bên kia bỏ cuộc)"""
+
+
+class StreamingMedia(MediaUpload):
+    """
+    Bộ đệm dùng chung giữa tải xuống và tải lên của cùng một file.
+
+    Phía tải xuống ghi tuần tự vào (giống file, qua write()), còn phía tải lên
+    resumable đọc từng đoạn byte qua getbytes(), chờ cho tới khi đoạn đó đã
+    về. Dữ liệu nằm trong RAM tối đa `spool_size` byte, sau đó được ghi ra
+    file tạm. Byte đã ghi ra file dùng I/O theo vị trí bên ngoài lock, nên
+    tải lên đọc các đoạn trước từ đĩa trong khi tải xuống vẫn ghi tiếp.
+
+    MD5 được tính ngay khi byte về. Chunk cuối chỉ được nhả ra khi tải xuống
+    hoàn tất, nên tải xuống lỗi sẽ không bao giờ hoàn tất file tải lên. Với
+    `resumable=False`, tải lên đọc cả file trong một lần getbytes(), tức là
+    chờ tải xuống kết thúc.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        chunksize: int,
+        spool_size: int,
+        temp_dir: str,
+        mimetype: str = 'application/octet-stream',
+        md5: bool = True,
+        resumable: bool = True
+    ):
+        self._size = size
+        self._resumable = resumable
+        self._chunksize = chunksize
+        self._mimetype = mimetype
+        self._spool_size = spool_size
+        self._temp_dir = temp_dir
+        self._mem = bytearray()   # Bộ đệm cho tới khi vượt spool_size
+        self._file = None         # File tạm sau khi tràn ra đĩa
+        self._md5 = hashlib.md5() if md5 else None
+        self._blake3 = blake3()
+        self._write_pos = 0   # Vị trí ghi của tải xuống
+        self._available = 0   # Số byte phía tải lên đọc được
+        self._complete = False
+        self._error = None
+        self._cond = Condition()
+
+    # Phía tải xuống
+
+    def write(self, data: bytes) -> int:
+        """Ghi thêm byte đã tải xuống"""
+        # Băm bên ngoài lock (bộ băm chỉ thuộc luồng tải xuống và nhả GIL),
+        # để getbytes() của luồng tải lên không bị chặn trong lúc băm
+        if self._md5 is not None:
+            self._md5.update(data)
+        self._blake3.update(data)
+
+        pos = self._write_pos
+        end = pos + len(data)
+        with self._cond:
+            if self._error is not None:
+                raise TransferAborted(str(self._error))
+
+            if self._file is None and end > self._spool_size:
+                self._file = tempfile.TemporaryFile(dir=self._temp_dir)
+                self._file.write(self._mem)
+                self._file.flush()
+                self._mem = bytearray()
+
+            if self._file is None:
+                self._mem[pos:end] = data
+            else:
+                fd = self._file.fileno()
+
+        if self._file is not None:
+            # Chỉ luồng tải xuống ghi, sau đoạn đã đọc được (hoặc ghi lại đúng các
+            # byte cũ sau rewind), nên ghi đĩa không cần giữ lock
+            os.pwrite(fd, data, pos)
+
+        with self._cond:
+            self._write_pos = end
+            if end > self._available:
+                self._available = end
+                self._cond.notify_all()
+
+        return len(data)
+
+    def rewind(self):
+        """Tải xuống lại từ byte 0 (byte đã nhận vẫn đọc được)"""
+        with self._cond:
+            self._write_pos = 0
+            if self._md5 is not None:
+                self._md5 = hashlib.md5()
+            self._blake3 = blake3()
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """Lỗi đã hủy việc truyền dữ liệu, nếu có"""
+        return self._error
+
+    @property
+    def received(self) -> int:
+        """Số byte lần tải xuống hiện tại đã ghi"""
+        return self._write_pos
+
+    def md5_hexdigest(self) -> Optional[str]:
+        """MD5 của các byte lần tải xuống hiện tại đã ghi (None nếu tắt)"""
+        with self._cond:
+            return self._md5.hexdigest() if self._md5 is not None else None
+
+    def blake3_hexdigest(self) -> str:
+        """BLAKE3 của các byte lần tải xuống hiện tại đã ghi"""
+        with self._cond:
+            return self._blake3.hexdigest()
+
+    def finish(self):
+        """Đánh dấu tải xuống hoàn tất và nhả chunk cuối"""
+        with self._cond:
+            self._complete = True
+            self._cond.notify_all()
+
+    def abort(self, error: Exception):
+        """Hủy cả hai phía của việc truyền dữ liệu"""
+        with self._cond:
+            if self._error is None and not self._complete:
+                self._error = error
+            self._cond.notify_all()
+
+    def close(self):
+        """Giải phóng bộ đệm"""
+        self._mem = bytearray()
+        if self._file is not None:
+            self._file.close()
+
+    # Phía tải lên (giao diện MediaUpload của googleapiclient)
+
+    def chunksize(self) -> int:
+        return self._chunksize
+
+    def set_chunksize(self, chunksize: int):
+        """Kích thước chunk cho lần tải lên tiếp theo"""
+        self._chunksize = chunksize
+
+    def mimetype(self) -> str:
+        return self._mimetype
+
+    def size(self) -> int:
+        return self._size
+
+    def resumable(self) -> bool:
+        return self._resumable
+
+    def has_stream(self) -> bool:
+        return False
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        """Trả về các byte [begin, begin + length), chờ phía tải xuống"""
+        end = min(begin + length, self._size)
+
+        with self._cond:
+            while self._error is None:
+                if self._complete:
+                    break
+                if end < self._size and self._available >= end:
+                    break
+                self._cond.wait()
+
+            if self._error is not None:
+                raise TransferAborted(str(self._error))
+
+            if self._file is None:
+                return bytes(self._mem[begin:end])
+            fd = self._file.fileno()
+
+        # Đọc từ đĩa mà không chặn lần ghi tiếp theo của tải xuống
+        return os.pread(fd, end - begin, begin)
+
+
 # ============================================================
 # QUẢN LÝ TRẠNG THÁI (STATE MANAGEMENT)
 # ============================================================
 
+def _fsync_dir(path: str):
+    """Đảm bảo thao tác đổi tên được lưu bằng cách sync thư mục chứa"""
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_json(path: str) -> Any:
+    """
+    Parse file JSON bằng một lần đọc không đệm (không isatty hay lseek).
+
+    File từ JSON_MMAP_MIN_SIZE trở lên, tức snapshot log lớn, được parse
+    trực tiếp từ mmap thay vì sao chép vào một đối tượng bytes trước.
+    """
+    with open(path, 'rb', buffering=0) as f:
+        if os.fstat(f.fileno()).st_size < JSON_MMAP_MIN_SIZE:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def _load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Tải file JSON được ghi qua file tạm + os.replace.
+
+    Dự phòng bằng bản '.tmp', bản này đầy đủ nếu crash xảy ra giữa lúc fsync
+    và lúc đổi tên. Trả về None nếu không đọc được file nào.
+    """
+    for candidate in (path, path + '.tmp'):
+        try:
+            return _read_json(candidate)
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            print(f"⚠️ Không thể đọc {candidate}: {e}")
+    return None
+
+
 class BackupState:
     """Quản lý trạng thái sao lưu an toàn với luồng và cập nhật nguyên tử"""
 
     def __init__(self, state_file: str = 'backup_state.json'):
         self.state_file = state_file
         self.lock = RLock()
+        # Số thay đổi chưa ghi, và thời điểm ghi file gần nhất
+        self._dirty = 0
+        self._last_flush = time.monotonic()
         self.state = self._load_state()
 
     def _load_state(self) -> Dict[str, Any]:
         """Tải trạng thái từ file"""
-        if os.path.exists(self.state_file):
-            try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    state = json.load(f)
-                    print(f"📂 Đã tải trạng thái từ {self.state_file}")
-                    return state
-            except Exception as e:
-                print(f"⚠️ Không thể tải trạng thái: {e}")
-
+        state = _load_checkpoint(self.state_file)
+        if state is not None:
+            print(f"📂 Đã tải trạng thái từ {self.state_file}")
+            # File trạng thái cũ lưu danh sách các dict file
+            for key in ('pending_files', 'failed_files'):
+                files = state.get(key) or {}
+                if isinstance(files, list):
+                    files = {f['id']: f for f in files}
+                state[key] = files
+            return state
+
+        now = self._format_ts(time.time())
         return {
             'status': 'new',
             'version': '2.0',
             'backup_folder_id': None,
             'current_folder': None,
-            'pending_files': [],
-            'failed_files': [],
+            'pending_files': {},
+            'failed_files': {},
             'total_files_processed': 0,
             'circuit_breaker_state': 'CLOSED',
             'last_rate_limit_time': None,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
+            'resumable_at': None,
+            'created_at': now,
+            'updated_at': now
         }
 
+    @staticmethod
+    def _format_ts(ts: float) -> str:
+        """Định dạng unix timestamp thành chuỗi ISO UTC (độ chính xác giây)"""
+        return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec='seconds')
+
     def _save_state(self):
+        """Ghi nhận một thay đổi; chỉ ghi file khi đã dồn đủ (phải được gọi trong lock)"""
+        self._dirty += 1
+        if (self._dirty >= STATE_FLUSH_EVERY
+                or time.monotonic() - self._last_flush >= STATE_FLUSH_INTERVAL):
+            self._write_state()
+
+    def flush(self):
+        """Ghi ngay các thay đổi đang chờ xuống đĩa"""
+        with self.lock:
+            if self._dirty:
+                self._write_state()
+
+    def _write_state(self):
         """Lưu trạng thái vào file (phải được gọi trong lock)"""
         try:
-            self.state['updated_at'] = datetime.now().isoformat()
+            # Gắn mỗi lần ghi: các thay đổi được gộp dùng chung thời điểm của thay đổi cuối
+            self.state['updated_at'] = self._format_ts(time.time())
 
             # Ghi nguyên tử sử dụng file tạm
             temp_file = self.state_file + '.tmp'
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, indent=2, ensure_ascii=False)
+            with open(temp_file, 'wb') as f:
+                options = orjson.OPT_INDENT_2 if LOG_PRETTY_JSON else 0
+                f.write(orjson.dumps(self.state, option=options))
+                # Ghi bền trước khi đổi tên để crash không để lại checkpoint hỏng
+                f.flush()
+                os.fsync(f.fileno())
 
             # Đổi tên nguyên tử
             os.replace(temp_file, self.state_file)
+            _fsync_dir(self.state_file)
+            self._dirty = 0
+            self._last_flush = time.monotonic()
 
         except Exception as e:
             print(f"⚠️ Không thể lưu trạng thái: {e}")
@@ -439,30 +955,37 @@ class BackupState:
         """Cập nhật nguyên tử an toàn với luồng"""
         with self.lock:
             self.state.update(kwargs)
-            self._save_state()
+            # Thay đổi trạng thái (tạm dừng, hoàn thành) phải được ghi bền ngay
+            self._write_state()
 
     def add_pending(self, file_item: Dict[str, Any]):
         """Thêm file vào danh sách chờ"""
         with self.lock:
-            if file_item not in self.state['pending_files']:
-                self.state['pending_files'].append(file_item)
+            if file_item['id'] not in self.state['pending_files']:
+                self.state['pending_files'][file_item['id']] = file_item
+                self._save_state()
+
+    def add_pending_many(self, file_items: List[Dict[str, Any]]):
+        """Thêm nhiều file vào danh sách chờ với một lần lưu"""
+        with self.lock:
+            pending = self.state['pending_files']
+            added = {f['id']: f for f in file_items if f['id'] not in pending}
+            if added:
+                pending.update(added)
                 self._save_state()
 
     def add_failed(self, file_item: Dict[str, Any]):
         """Thêm file vào danh sách thất bại"""
         with self.lock:
-            if file_item not in self.state['failed_files']:
-                self.state['failed_files'].append(file_item)
+            if file_item['id'] not in self.state['failed_files']:
+                self.state['failed_files'][file_item['id']] = file_item
                 self._save_state()
 
     def remove_from_pending(self, file_id: str):
         """Xóa file khỏi danh sách chờ theo ID"""
         with self.lock:
-            self.state['pending_files'] = [
-                f for f in self.state['pending_files']
-                if f.get('id') != file_id
-            ]
-            self._save_state()
+            if self.state['pending_files'].pop(file_id, None) is not None:
+                self._save_state()
 
     def increment_processed(self):
         """Tăng bộ đếm file đã xử lý"""
@@ -473,7 +996,10 @@ class BackupState:
     def get_snapshot(self) -> Dict[str, Any]:
         """Lấy bản chụp (snapshot) an toàn của trạng thái"""
         with self.lock:
-            return self.state.copy()
+            snapshot = self.state.copy()
+            snapshot['pending_files'] = dict(self.state['pending_files'])
+            snapshot['failed_files'] = dict(self.state['failed_files'])
+            return snapshot
 
 
 # ============================================================
@@ -491,15 +1017,31 @@ class DriveBackupManager:
         log_file: str = 'backup_log.json',
         state_file: str = 'backup_state.json',
         max_workers: Optional[int] = None,
-        manual_mode: bool = True
+        manual_mode: bool = True,
+        preloaded: Optional[Tuple['BackupState', Dict[str, Any], int]] = None
     ):
         self.service = service
         self.log_file = log_file
+        self.journal_file = os.path.splitext(log_file)[0] + '.jsonl'
+        self.summary_file = os.path.splitext(log_file)[0] + '.summary.json'
+        self._journal_entries = 0
+        self._journal_buffer = []
+        # Worker đưa (id, entry, line) vào hàng đợi; luồng lô áp dụng chúng trong _flush_log
+        self._log_queue = queue.SimpleQueue()
+        self._last_flush = time.monotonic()
+        self._iso_cache = (0, '')  # (giây, chuỗi ISO) cho _now_iso
         self.manual_mode = manual_mode
 
         # Quản lý trạng thái
-        self.backup_state = BackupState(state_file)
-        self.backup_log = self._load_log()
+        if preloaded is not None:
+            self.backup_state, self.backup_log, self._journal_entries = preloaded
+        else:
+            self.backup_state = BackupState(state_file)
+            self.backup_log, self._journal_entries = self._read_log(
+                self.log_file, self.journal_file
+            )
+        # Tập ID chủ yếu để đọc, kiểm tra 'đã sao lưu' không cần khóa
+        self._backed_up_ids = set(self.backup_log['backed_up_files'])
         self.log_lock = RLock()
 
         # Circuit breaker cho giới hạn tốc độ
@@ -514,7 +1056,16 @@ class DriveBackupManager:
         self.memory_monitor = MemoryMonitor(MEMORY_CLEANUP_THRESHOLD)
         
         # Giới hạn tốc độ toàn cục (MỚI - ngăn chặn vượt quá hạn ngạch)
-        self.global_rate_limiter = GlobalRateLimiter(GLOBAL_RATE_LIMIT_DELAY)
+        self.global_rate_limiter = GlobalRateLimiter(GLOBAL_RATE_LIMIT_DELAY, GLOBAL_RATE_LIMIT_BURST)
+
+        # Backoff thử lại (decorrelated jitter, theo từng luồng worker)
+        self.backoff = BackoffScheduler(INITIAL_BACKOFF, MAX_BACKOFF)
+
+        # ID thư mục anh em -> future của lần liệt kê nhóm (liệt kê trước)
+        self._listing_cache = {}
+
+        # Các file Drive từ chối sao chép (lượt batch): chuyển thẳng sang tải xuống + tải lên
+        self._no_copy_ids = set()
 
         # Thư mục làm việc
         self.local_temp_dir = '/content/temp_backup'
@@ -526,18 +1077,46 @@ class DriveBackupManager:
         else:
             self.max_workers = min(max_workers, MAX_CONCURRENT_WORKERS)
 
+        # Pool worker cố định: các luồng (và Drive service của chúng) tồn tại
+        # qua nhiều batch. Tải xuống streaming chạy song song với worker batch.
+        self.file_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='backup'
+        )
+        self.download_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='download'
+        )
+        # Liệt kê thư mục anh em chạy trước thư mục đang xử lý
+        self.listing_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='listing'
+        )
+
         # Xử lý tắt chương trình
         self.shutdown_event = Event()
         self._setup_signal_handlers()
 
-        # Thống kê
-        self.stats = {
-            'download': {'success': 0, 'failed': 0, 'skipped': 0},
-            'upload': {'success': 0, 'failed': 0}
-        }
+        # Thống kê: mỗi luồng một Counter, chỉ gộp khi đọc (xem stats)
+        self._stat_counters = []
+
+        # Thanh tiến độ (byte) chung cho cả batch đang chạy
+        self._pbar = None
+        # Số file hoàn thành kể từ lần kiểm tra bộ nhớ / GC thủ công gần nhất
+        self._files_since_mem_check = 0
 
         # Credentials cho thread-local services
         self.creds, _ = default()
+        self._thread_local = local()
+        # Tài liệu discovery của Drive, đọc từ đĩa một lần cho service của mọi worker
+        self._drive_doc = get_static_doc('drive', 'v3')
+
+        # Session keep-alive dùng chung cho tải xuống media (mọi luồng)
+        self.media_session = AuthorizedSession(self.creds)
+        self.media_session.mount('https://', requests.adapters.HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers * 4
+        ))
 
         print(f"🚀 Số luồng (Workers): {self.max_workers}")
         print(f"🎯 Chế độ: {'THỦ CÔNG' if manual_mode else 'TỰ ĐỘNG'}")
@@ -546,7 +1125,7 @@ class DriveBackupManager:
 
     def __del__(self):
         """Dọn dẹp khi hủy đối tượng"""
-        self._cleanup()
+        self.close()
 
     def _setup_signal_handlers(self):
         """Thiết lập xử lý tắt chương trình nhẹ nhàng"""
@@ -560,21 +1139,19 @@ class DriveBackupManager:
         except:
             pass  # Tín hiệu có thể không hoạt động trên Colab
 
-        atexit.register(self._cleanup)
+        atexit.register(self.close)
 
-    def _cleanup(self):
-        """Dọn dẹp tài nguyên"""
+    def close(self):
+        """Ghi trạng thái, dừng các pool worker và xóa file tạm (gọi hai lần vẫn an toàn)"""
         try:
+            self._flush_log()
+            self.backup_state.flush()
+            self.file_executor.shutdown(wait=False, cancel_futures=True)
+            self.download_executor.shutdown(wait=False, cancel_futures=True)
+            self.listing_executor.shutdown(wait=False, cancel_futures=True)
             self.resource_manager.cleanup_all()
 
-            if os.path.exists(self.local_temp_dir):
-                for file in os.listdir(self.local_temp_dir):
-                    try:
-                        os.remove(os.path.join(self.local_temp_dir, file))
-                    except:
-                        pass
-
-            gc.collect()
+            shutil.rmtree(self.local_temp_dir, ignore_errors=True)
         except:
             pass
 
@@ -586,46 +1163,188 @@ class DriveBackupManager:
             cpu_count = multiprocessing.cpu_count()
 
             workers_by_ram = max(1, int(available_gb / 0.3))
-            workers_by_cpu = cpu_count
-            optimal = max(3, min(workers_by_ram, workers_by_cpu, 8))
+            # Worker chủ yếu chờ I/O mạng: giới hạn bởi hạn ngạch QPS của Drive, không phải số nhân CPU
+            workers_by_io = min(DRIVE_QPS_LIMIT, cpu_count * 2)
+            optimal = max(3, min(workers_by_ram, workers_by_io))
 
             print(f"💾 RAM: {available_gb:.1f}GB | 🖥️ CPU: {cpu_count}")
             return optimal
         except:
             return 4
 
-    def _load_log(self) -> Dict[str, Any]:
-        """Tải log sao lưu"""
-        if os.path.exists(self.log_file):
+    @staticmethod
+    def preload(log_file: str, state_file: str) -> Tuple['BackupState', Dict[str, Any], int]:
+        """Đọc file trạng thái và log; an toàn khi chạy ngoài luồng chính"""
+        journal_file = os.path.splitext(log_file)[0] + '.jsonl'
+        return (BackupState(state_file),) + DriveBackupManager._read_log(log_file, journal_file)
+
+    @staticmethod
+    def _read_log(log_file: str, journal_file: str) -> Tuple[Dict[str, Any], int]:
+        """
+        Tải snapshot log sao lưu, sau đó đọc lại journal ghi từ lúc đó.
+
+        Là static để có thể chạy trên luồng tải trước khi manager được tạo.
+        Trả về log và số mục journal đã đọc lại.
+        """
+        log = _load_checkpoint(log_file)
+        journal_entries = 0
+        if log is None:
+            log = {
+                'version': '2.0',
+                'backed_up_files': {},
+                'last_run': None
+            }
+
+        if os.path.exists(journal_file):
             try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                pass
+                with open(journal_file, 'rb+', buffering=LOG_IO_BUFFER) as f:
+                    valid_bytes = 0
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            break  # Ghi dở dang do crash
+                        try:
+                            entry = orjson.loads(line)
+                        except ValueError:
+                            break
 
-        return {
-            'version': '2.0',
-            'backed_up_files': {},
-            'last_run': None
-        }
+                        log['backed_up_files'][entry.pop('id')] = entry
+                        valid_bytes += len(line)
+                        journal_entries += 1
+
+                    # Bỏ phần đuôi dở dang để lần ghi tiếp theo bắt đầu ở dòng mới
+                    f.truncate(valid_bytes)
+            except Exception as e:
+                print(f"⚠️ Không thể đọc journal log: {e}")
+
+        return log, journal_entries
 
     def _save_log(self):
-        """Lưu log sao lưu với ghi nguyên tử"""
+        """
+        Ghi snapshot log đầy đủ một cách nguyên tử, sau đó làm rỗng journal.
+
+        Chỉ là bước nén - tiến độ từng mục được ghi qua _append_log.
+        """
         with self.log_lock:
+            self._drain_log_queue()
             try:
-                self.backup_log['last_run'] = datetime.now().isoformat()
+                self.backup_log['last_run'] = self._now_iso()
+
+                options = orjson.OPT_NON_STR_KEYS
+                if LOG_PRETTY_JSON:
+                    options |= orjson.OPT_INDENT_2
 
                 temp_file = self.log_file + '.tmp'
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.backup_log, f, indent=2, ensure_ascii=False)
+                with open(temp_file, 'wb') as f:
+                    f.write(orjson.dumps(self.backup_log, option=options))
+                    f.flush()
+                    os.fsync(f.fileno())
 
                 os.replace(temp_file, self.log_file)
+                _fsync_dir(self.log_file)
+
+                # Snapshot đã chứa mọi bản ghi trong journal và bộ đệm
+                with open(self.journal_file, 'w', encoding='utf-8'):
+                    pass
+                self._journal_entries = 0
+                self._journal_buffer.clear()
+
+                # File phụ cho view_log: số mục và lần chạy cuối mà không cần parse snapshot
+                with open(self.summary_file, 'wb') as f:
+                    f.write(orjson.dumps({
+                        'backed_up_files': len(self.backup_log['backed_up_files']),
+                        'last_run': self.backup_log['last_run']
+                    }))
             except Exception as e:
                 print(f"⚠️ Không thể lưu log: {e}")
 
+    def _append_log(self, item_id: str, entry: Dict[str, Any]):
+        """
+        Đưa mục đã sao lưu vào hàng đợi log (không khóa; an toàn từ mọi worker).
+
+        Dict log và bộ đệm journal chỉ được _drain_log_queue sửa khi giữ
+        log_lock, nên các worker không tranh chấp khóa cho từng file.
+        """
+        line = orjson.dumps({'id': item_id, **entry}, option=orjson.OPT_NON_STR_KEYS)
+        self._log_queue.put((item_id, entry, line + b'\n'))
+        self._backed_up_ids.add(item_id)
+
+    def _drain_log_queue(self):
+        """Áp dụng các mục trong hàng đợi vào log và bộ đệm journal (giữ log_lock)"""
+        backed_up_files = self.backup_log['backed_up_files']
+        while True:
+            try:
+                item_id, entry, line = self._log_queue.get_nowait()
+            except queue.Empty:
+                return
+            backed_up_files[item_id] = entry
+            self._journal_buffer.append(line)
+
+    def _flush_log(self):
+        """Ghi các bản ghi đang chờ vào journal với một lần fsync"""
+        with self.log_lock:
+            self._drain_log_queue()
+            if self._journal_buffer:
+                try:
+                    with open(self.journal_file, 'ab', buffering=LOG_IO_BUFFER) as f:
+                        f.writelines(self._journal_buffer)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._journal_entries += len(self._journal_buffer)
+                    self._journal_buffer.clear()
+                except Exception as e:
+                    print(f"⚠️ Không thể ghi thêm bản ghi log: {e}")
+
+            self._last_flush = time.monotonic()
+
+            # Khoảng cách snapshot tăng theo kích thước log, nên tổng số byte ghi lại
+            # tuyến tính theo số file (khoảng cố định làm nó thành bậc hai)
+            backed_up = len(self.backup_log['backed_up_files'])
+            if self._journal_entries >= max(LOG_COMPACT_EVERY, backed_up // 4):
+                self._save_log()
+
     def _get_thread_local_service(self):
-        """Lấy Drive service cục bộ cho thread"""
-        return build('drive', 'v3', credentials=self.creds)
+        """Lấy Drive service cục bộ cho thread (chỉ tạo một lần mỗi luồng worker)"""
+        service = getattr(self._thread_local, 'service', None)
+        if service is None:
+            # httplib2 không an toàn đa luồng: mỗi worker một kết nối keep-alive
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.creds, http=httplib2.Http(timeout=HTTP_TIMEOUT)
+            )
+            if self._drive_doc:
+                service = build_from_document(self._drive_doc, http=http)
+            else:
+                service = build('drive', 'v3', http=http, cache_discovery=False)
+            self._thread_local.service = service
+        return service
+
+    def _get_chunk_sizer(self) -> ChunkSizer:
+        """Lấy kích thước chunk tải lên thích ứng của luồng worker hiện tại"""
+        sizer = getattr(self._thread_local, 'chunk_sizer', None)
+        if sizer is None:
+            sizer = ChunkSizer(CHUNK_SIZE, MIN_CHUNK_SIZE, MAX_CHUNK_SIZE)
+            self._thread_local.chunk_sizer = sizer
+        return sizer
+
+    def _count(self, op: str, outcome: str, n: int = 1):
+        """Cộng vào bộ đếm thống kê của luồng này (không khóa hay dict dùng chung)"""
+        counter = getattr(self._thread_local, 'stats', None)
+        if counter is None:
+            counter = Counter()
+            self._thread_local.stats = counter
+            self._stat_counters.append(counter)
+        counter[op, outcome] += n
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Gộp bộ đếm của các luồng thành {op: {outcome: count}}"""
+        totals = Counter()
+        for counter in list(self._stat_counters):
+            totals.update(dict(counter))
+        return {
+            'download': {k: totals['download', k] for k in ('success', 'failed', 'skipped')},
+            'upload': {k: totals['upload', k] for k in ('success', 'failed')},
+            'copy': {'success': totals['copy', 'success']}
+        }
 
     def _is_rate_limit_error(self, error: Exception) -> bool:
         """
@@ -636,27 +1355,67 @@ class DriveBackupManager:
         - userRateLimitExceeded (hạn ngạch người dùng cụ thể)
         - quotaExceeded (hạn ngạch chung)
         """
-        if isinstance(error, HttpError):
-            error_str = str(error).lower()
-            return (
-                error.resp.status == 403 and
-                ('ratelimitexceeded' in error_str or 
-                 'userratelimitexceeded' in error_str or
-                 'quotaexceeded' in error_str or
-                 'quota exceeded' in error_str)
-            )
-        return False
+        if not isinstance(error, HttpError) or error.resp.status != 403:
+            return False
 
-    def _exponential_backoff(self, attempt: int, jitter: bool = True) -> float:
-        """Tính toán thời gian chờ backoff với jitter"""
-        backoff = min(INITIAL_BACKOFF * (2 ** attempt), MAX_BACKOFF)
+        # HttpError đã parse body sẵn; không cần render str(error)
+        details = error.error_details
+        if isinstance(details, list):
+            for detail in details:
+                if isinstance(detail, dict) and detail.get('reason') in RATE_LIMIT_REASONS:
+                    return True
+        return 'quota exceeded' in error.reason.lower()
+
+    def _now_iso(self) -> str:
+        """Mốc thời gian ISO UTC, độ chính xác 1 giây, chỉ định dạng một lần mỗi giây"""
+        second = int(time.time())
+        cached_second, text = self._iso_cache
+        if cached_second != second:
+            text = datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+            self._iso_cache = (second, text)
+        return text
+
+    def _record_success(self, op: str):
+        """Ghi nhận thành công vào circuit breaker và reset backoff thử lại"""
+        if self.circuit_breaker.record_success(op):
+            # Circuit đã phục hồi: mọi worker bắt đầu chuỗi backoff mới
+            self.backoff.reset_all()
+        else:
+            self.backoff.reset()
 
-        if jitter:
-            backoff = backoff * (0.5 + random.random())
+    def _record_progress(self, op: str):
+        """Tính tiến độ truyền là thành công cho circuit breaker, không reset chuỗi retry"""
+        if self.circuit_breaker.record_success(op):
+            self.backoff.reset_all()
+
+    def _advance_progress(self, nbytes):
+        """Cập nhật thanh tiến độ chung của batch (số âm để hoàn tác lần thử lỗi)"""
+        pbar = self._pbar
+        if pbar is not None and nbytes:
+            pbar.update(int(nbytes))
+
+    def _execute_with_retry(self, request, max_retries: int = MAX_RETRIES):
+        """
+        Thực thi request Drive API, thử lại với lỗi 429/5xx và 403 rate limit.
 
-        return backoff
+        Dùng exponential backoff cộng thêm tối đa 1s jitter ngẫu nhiên
+        (min(MAX_BACKOFF, INITIAL_BACKOFF * 2^n) + U(0, 1)). Đối tượng
+        request được thực thi lại nguyên vẹn, nên không được bọc trong
+        closure đã dùng.
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                return request.execute()
+            except HttpError as e:
+                retryable = (
+                    e.resp.status in RETRYABLE_STATUSES or
+                    self._is_rate_limit_error(e)
+                )
+                if not retryable or attempt == max_retries or self.shutdown_event.is_set():
+                    raise
+                time.sleep(min(MAX_BACKOFF, INITIAL_BACKOFF * 2 ** attempt) + random.random())
 
-    def _handle_rate_limit(self) -> bool:
+    def _handle_rate_limit(self, op: str) -> bool:
         """
         Xử lý lỗi giới hạn tốc độ.
 
@@ -664,18 +1423,25 @@ class DriveBackupManager:
             bool: True nếu nên dừng thực thi
         """
         # Ghi nhận thất bại trong circuit breaker
-        circuit_tripped = self.circuit_breaker.record_failure()
+        circuit_tripped = self.circuit_breaker.record_failure(op)
+
+        if circuit_tripped and op == 'copy':
+            # Sao chép có phương án dự phòng tải xuống + tải lên: tiếp tục sao lưu
+            print(f"\n⚠️ Hết hạn ngạch sao chép - dùng tải xuống + tải lên trong {RATE_LIMIT_COOLDOWN_HOURS} giờ")
+            return False
 
         if circuit_tripped:
             self.backup_state.update(
                 status='paused',
                 circuit_breaker_state='OPEN',
-                last_rate_limit_time=datetime.now().isoformat()
+                last_rate_limit_time=self._now_iso(),
+                resumable_at=time.time() + RATE_LIMIT_COOLDOWN_HOURS * 3600
             )
+            self._flush_log()
 
-            print("\n" + "="*80)
+            print("\n" + _RULE)
             print("🚫 PHÁT HIỆN GIỚI HẠN TỐC ĐỘ - NGẮT MẠCH (CIRCUIT BREAKER TRIPPED)")
-            print("="*80)
+            print(_RULE)
             print(f"❌ Phát hiện {RATE_LIMIT_THRESHOLD} lỗi giới hạn tốc độ trong {RATE_LIMIT_WINDOW_SECONDS}s")
             print(f"💾 Trạng thái đã lưu vào: {self.backup_state.state_file}")
 
@@ -684,7 +1450,7 @@ class DriveBackupManager:
             else:
                 print(f"\n⏰ Tự động tiếp tục sau {RATE_LIMIT_COOLDOWN_HOURS} giờ")
 
-            print("="*80 + "\n")
+            print(_RULE + "\n")
 
             self.shutdown_event.set()
             return True
@@ -696,7 +1462,7 @@ class DriveBackupManager:
         next_run = datetime.now() + timedelta(hours=RATE_LIMIT_COOLDOWN_HOURS)
 
         print("\n🎯 HƯỚNG DẪN KHÔI PHỤC THỦ CÔNG:")
-        print("="*80)
+        print(_RULE)
         print("1️⃣ DỪNG RUNTIME NGAY LẬP TỨC:")
         print("   → Runtime → Disconnect and delete runtime")
         print()
@@ -709,18 +1475,19 @@ class DriveBackupManager:
         print("📊 TIẾN ĐỘ ĐÃ LƯU:")
 
         snapshot = self.backup_state.get_snapshot()
-        print(f"   ✅ Đã hoàn thành: {len(self.backup_log['backed_up_files'])}")
+        print(f"   ✅ Đã hoàn thành: {len(self._backed_up_ids)}")
         print(f"   ⏳ Đang chờ: {len(snapshot['pending_files'])}")
         print(f"   ❌ Thất bại: {len(snapshot['failed_files'])}")
-        print("="*80)
+        print(_RULE)
 
     def get_file_info(self, file_id: str) -> Optional[Dict[str, Any]]:
         """Lấy thông tin file"""
         try:
-            return self.service.files().get(
+            self.global_rate_limiter.acquire()
+            return self._execute_with_retry(self.service.files().get(
                 fileId=file_id,
                 fields='id, name, size, md5Checksum, mimeType'
-            ).execute()
+            ))
         except HttpError as e:
             print(f"❌ Lỗi khi lấy thông tin file: {e}")
             return None
@@ -730,125 +1497,168 @@ class DriveBackupManager:
         file_id: str,
         file_name: str,
         file_size: Optional[str] = None,
-        service=None
-    ) -> Optional[str]:
+        media: Optional[StreamingMedia] = None,
+        original_md5: Optional[str] = None,
+        digests: Optional[Dict[str, str]] = None
+    ) -> Optional[Tuple[str, int]]:
         """
         Tải xuống file với xử lý lỗi và quản lý tài nguyên.
 
+        File được lấy bằng một GET streaming trên session media dùng chung,
+        thay vì một request cho mỗi chunk.
+
+        MD5 được tính trong lúc tải xuống và xác minh với `original_md5`.
+        Khi có `media`, byte được ghi thẳng vào đó thay vì file cục bộ.
+        Nếu có `digests`, nó sẽ nhận các giá trị băm 'md5' và 'blake3'.
+
         Returns:
-            Optional[str]: Đường dẫn cục bộ nếu thành công, None nếu thất bại
+            Optional[Tuple[str, int]]: (đường dẫn cục bộ, kích thước byte)
+            nếu thành công, None nếu thất bại
         """
         if self.shutdown_event.is_set():
             return None
 
         # Kiểm tra circuit breaker
-        can_proceed, reason = self.circuit_breaker.can_proceed()
+        can_proceed, reason = self.circuit_breaker.can_proceed('download')
         if not can_proceed:
-            print(f"🚫 {reason}")
+            logger.warning(f"🚫 {reason}")
             return None
 
-        if service is None:
-            service = self.service
-
         local_path = os.path.join(self.local_temp_dir, file_name)
 
         for attempt in range(MAX_RETRIES):
             fh = None
-            pbar = None
+            received = 0  # Số byte đã cộng vào thanh tiến độ (hoàn lại khi thất bại)
+            size = 0
+            created = False  # File cục bộ đã tồn tại, lỗi thì phải xóa
 
             try:
                 # Áp dụng giới hạn tốc độ toàn cục trước khi gọi API
                 self.global_rate_limiter.acquire()
                 
-                request = service.files().get_media(fileId=file_id)
+                url = f"https://www.googleapis.com/drive/v3/files/{file_id}?alt=media"
 
-                with self.resource_manager.get_file_handle(local_path, 'wb') as fh:
-                    downloader = MediaIoBaseDownload(
-                        fh,
-                        request,
-                        chunksize=CHUNK_SIZE
-                    )
+                if media is not None:
+                    media.rewind()
+                    sink = nullcontext(media)
+                else:
+                    sink = self.resource_manager.get_file_handle(local_path, 'wb')
 
+                with sink as fh:
+                    created = media is None
+                    writer = media if media is not None else HashingWriter(fh, md5=bool(original_md5))
                     done = False
-                    pbar = tqdm(
-                        total=100,
-                        desc=f"📥 {file_name[:30]}",
-                        unit='%',
-                        leave=False
-                    )
-
-                    while not done and not self.shutdown_event.is_set():
-                        status, done = downloader.next_chunk()
-                        if status:
-                            progress = int(status.progress() * 100)
-                            pbar.update(progress - pbar.n)
 
-                    if pbar:
-                        pbar.close()
-                        pbar = None
+                    with self.media_session.get(url, stream=True, timeout=HTTP_TIMEOUT) as response:
+                        if response.status_code >= 400:
+                            # Cùng kiểu lỗi với lệnh gọi API để phát hiện rate limit
+                            raise HttpError(
+                                httplib2.Response({'status': response.status_code}),
+                                response.content,
+                                uri=url
+                            )
+
+                        unreported = 0
+                        for data in response.iter_content(chunk_size=MEDIA_READ_SIZE):
+                            if self.shutdown_event.is_set():
+                                break
+                            writer.write(data)
+                            size += len(data)
+                            # Thanh tiến độ chung và breaker được cập nhật mỗi CHUNK_SIZE byte, không phải mỗi lần đọc
+                            unreported += len(data)
+                            if unreported >= CHUNK_SIZE:
+                                self._advance_progress(unreported)
+                                received += unreported
+                                unreported = 0
+                                self._record_progress('download')
+                        else:
+                            done = True
+                            self._advance_progress(unreported)
+                            received += unreported
+
+                if not done:
+                    raise TransferAborted("Đã yêu cầu dừng")
 
                 # Xác minh kích thước file nếu được cung cấp
                 if file_size:
-                    local_size = os.path.getsize(local_path)
-                    if local_size != int(file_size):
+                    if size != int(file_size):
                         raise Exception(
-                            f"Kích thước không khớp: mong đợi {file_size}, nhận được {local_size}"
+                            f"Kích thước không khớp: mong đợi {file_size}, nhận được {size}"
                         )
 
+                # Xác minh MD5 tính trong lúc tải xuống (không đọc lại; khi
+                # streaming, trước khi hoàn tất tải lên)
+                if original_md5 and writer.md5_hexdigest() != original_md5:
+                    raise Exception("MD5 checksum không khớp")
+
+                if digests is not None:
+                    digests['md5'] = writer.md5_hexdigest()
+                    digests['blake3'] = writer.blake3_hexdigest()
+
                 # Thành công - ghi nhận vào circuit breaker
-                self.circuit_breaker.record_success()
-                print(f"✅ Đã tải xuống: {file_name}")
-                return local_path
+                self._record_success('download')
+                logger.info(f"✅ Đã tải xuống: {file_name}")
+                return local_path, size
+
+            except TransferAborted:
+                self._advance_progress(-received)
+                if created:
+                    try:
+                        os.unlink(local_path)
+                    except OSError:
+                        pass
+                return None
 
             except Exception as e:
                 # Xử lý rate limit
                 if self._is_rate_limit_error(e):
-                    print(f"🚫 Gặp giới hạn tốc độ khi tải xuống: {file_name}")
+                    logger.warning(f"🚫 Gặp giới hạn tốc độ khi tải xuống: {file_name}")
                     # Tăng delay toàn cục khi bị rate limit
                     self.global_rate_limiter.set_delay(min(self.global_rate_limiter.min_delay * 2, 10.0))
-                    if self._handle_rate_limit():
+                    if self._handle_rate_limit('download'):
                         return None
 
-                print(f"⚠️ Thử tải xuống lần {attempt + 1}/{MAX_RETRIES} thất bại: {e}")
+                logger.warning(f"⚠️ Thử tải xuống lần {attempt + 1}/{MAX_RETRIES} thất bại: {e}")
+
+                self._advance_progress(-received)
 
                 # Dọn dẹp file tải lỗi
-                if os.path.exists(local_path):
+                if created:
                     try:
-                        os.remove(local_path)
-                    except:
+                        os.unlink(local_path)
+                    except OSError:
                         pass
 
                 # Thử lại với backoff (tăng delay nếu lỗi rate limit)
                 if attempt < MAX_RETRIES - 1:
-                    backoff = self._exponential_backoff(attempt)
+                    backoff = self.backoff.next_sleep()
                     if self._is_rate_limit_error(e):
                         backoff = max(backoff, 30)  # Ít nhất 30s cho lỗi rate limits
-                    print(f"⏳ Thử lại sau {backoff:.1f}s...")
+                    logger.info(f"⏳ Thử lại sau {backoff:.1f}s...")
                     time.sleep(backoff)
                 else:
-                    print(f"❌ Tải xuống thất bại: {file_name}")
+                    logger.error(f"❌ Tải xuống thất bại: {file_name}")
                     return None
 
-            finally:
-                if pbar:
-                    try:
-                        pbar.close()
-                    except:
-                        pass
-
         return None
 
     def upload_file(
         self,
-        local_path: str,
+        local_path: Optional[str],
         file_name: str,
         parent_folder_id: str,
         original_md5: Optional[str] = None,
-        service=None
+        service=None,
+        media: Optional[StreamingMedia] = None,
+        local_size: Optional[int] = None
     ) -> Optional[str]:
         """
         Tải lên file với xử lý lỗi đúng cách.
 
+        Khi có `media`, `local_path` bị bỏ qua và byte được đọc từ bộ đệm
+        streaming trong lúc tải xuống vẫn đang chạy.
+        `local_size` là kích thước của `local_path` nếu đã biết.
+
         Returns:
             Optional[str]: ID file đã tải lên nếu thành công, None nếu thất bại
         """
@@ -856,14 +1666,19 @@ class DriveBackupManager:
             return None
 
         # Kiểm tra circuit breaker
-        can_proceed, reason = self.circuit_breaker.can_proceed()
+        can_proceed, reason = self.circuit_breaker.can_proceed('upload')
         if not can_proceed:
-            print(f"🚫 {reason}")
+            logger.warning(f"🚫 {reason}")
             return None
 
         if service is None:
             service = self.service
 
+        chunk_sizer = self._get_chunk_sizer()
+
+        if media is None and local_size is None:
+            local_size = os.path.getsize(local_path)
+
         for attempt in range(MAX_RETRIES):
             uploaded_file_id = None
 
@@ -876,17 +1691,32 @@ class DriveBackupManager:
                     'parents': [parent_folder_id]
                 }
 
-                media = MediaFileUpload(
-                    local_path,
-                    resumable=True,
-                    chunksize=CHUNK_SIZE
-                )
+                media_body = media
+                if media_body is None:
+                    media_body = MediaFileUpload(
+                        local_path,
+                        resumable=local_size >= SIMPLE_UPLOAD_MAX,
+                        chunksize=chunk_sizer.value
+                    )
+                elif media_body.resumable():
+                    media_body.set_chunksize(chunk_sizer.value)
 
-                file = service.files().create(
+                request = service.files().create(
                     body=file_metadata,
-                    media_body=media,
-                    fields='id, name, size, md5Checksum'
-                ).execute()
+                    media_body=media_body,
+                    fields='id, md5Checksum'
+                )
+
+                if media_body.resumable():
+                    # Tải lên resumable từng chunk để điều chỉnh kích thước chunk
+                    file = None
+                    while file is None:
+                        _, file = request.next_chunk()
+                        chunk_sizer.record_success()
+                        self._record_progress('upload')
+                else:
+                    # File nhỏ: một POST multipart, không cần lượt khởi tạo phiên
+                    file = request.execute()
 
                 uploaded_file_id = file['id']
 
@@ -899,14 +1729,20 @@ class DriveBackupManager:
                     raise Exception("MD5 checksum không khớp")
 
                 # Thành công
-                self.circuit_breaker.record_success()
-                print(f"✅ Đã tải lên: {file_name}")
+                self._record_success('upload')
+                logger.info(f"✅ Đã tải lên: {file_name}")
                 return uploaded_file_id
 
+            except TransferAborted:
+                return None
+
             except Exception as e:
+                if isinstance(e, TimeoutError) or self._is_rate_limit_error(e):
+                    chunk_sizer.record_failure()
+
                 # Xử lý rate limit
                 if self._is_rate_limit_error(e):
-                    print(f"🚫 Gặp giới hạn tốc độ khi tải lên: {file_name}")
+                    logger.warning(f"🚫 Gặp giới hạn tốc độ khi tải lên: {file_name}")
                     # Tăng delay toàn cục khi bị rate limit
                     self.global_rate_limiter.set_delay(min(self.global_rate_limiter.min_delay * 2, 10.0))
 
@@ -917,10 +1753,10 @@ class DriveBackupManager:
                         except:
                             pass
 
-                    if self._handle_rate_limit():
+                    if self._handle_rate_limit('upload'):
                         return None
 
-                print(f"⚠️ Thử tải lên lần {attempt + 1}/{MAX_RETRIES} thất bại: {e}")
+                logger.warning(f"⚠️ Thử tải lên lần {attempt + 1}/{MAX_RETRIES} thất bại: {e}")
 
                 # Dọn dẹp file tải lên thất bại
                 if uploaded_file_id:
@@ -931,13 +1767,13 @@ class DriveBackupManager:
 
                 # Thử lại với backoff (tăng delay nếu lỗi rate limit)
                 if attempt < MAX_RETRIES - 1:
-                    backoff = self._exponential_backoff(attempt)
+                    backoff = self.backoff.next_sleep()
                     if self._is_rate_limit_error(e):
                         backoff = max(backoff, 30)  # Ít nhất 30s cho lỗi rate limits
-                    print(f"⏳ Thử lại sau {backoff:.1f}s...")
+                    logger.info(f"⏳ Thử lại sau {backoff:.1f}s...")
                     time.sleep(backoff)
                 else:
-                    print(f"❌ Tải lên thất bại: {file_name}")
+                    logger.error(f"❌ Tải lên thất bại: {file_name}")
                     return None
 
         return None
@@ -951,16 +1787,17 @@ class DriveBackupManager:
         try:
             file_metadata = {
                 'name': folder_name,
-                'mimeType': 'application/vnd.google-apps.folder'
+                'mimeType': FOLDER_MIME
             }
 
             if parent_id:
                 file_metadata['parents'] = [parent_id]
 
-            folder = self.service.files().create(
+            self.global_rate_limiter.acquire()
+            folder = self._execute_with_retry(self.service.files().create(
                 body=file_metadata,
-                fields='id, name'
-            ).execute()
+                fields='id'
+            ))
 
             print(f"📁 Đã tạo thư mục: {folder_name}")
             return folder['id']
@@ -969,31 +1806,354 @@ class DriveBackupManager:
             print(f"❌ Lỗi khi tạo thư mục: {e}")
             return None
 
-    def list_files_in_folder(self, folder_id: str) -> List[Dict[str, Any]]:
-        """Liệt kê tất cả file trong thư mục"""
-        items = []
+    def _list_children(self, parent_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Liệt kê nội dung của nhiều thư mục bằng một truy vấn phân trang"""
+        children = {parent_id: [] for parent_id in parent_ids}
+        parents_query = ' or '.join(f"'{parent_id}' in parents" for parent_id in parent_ids)
         page_token = None
+        # Cũng chạy trên luồng liệt kê: không dùng chung self.service giữa các luồng
+        service = self._get_thread_local_service()
+
+        while True:
+            self.global_rate_limiter.acquire()
+            response = self._execute_with_retry(service.files().list(
+                q=f"({parents_query}) and trashed=false",
+                fields='nextPageToken, files(id, name, mimeType, size, md5Checksum, parents)',
+                pageToken=page_token,
+                pageSize=1000
+            ))
+
+            for item in response.get('files', []):
+                for parent_id in item.get('parents', []):
+                    if parent_id in children:
+                        children[parent_id].append(item)
+
+            page_token = response.get('nextPageToken')
+
+            if not page_token:
+                break
 
+        return children
+
+    def _list_group(self, group: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Liệt kê theo nhóm trên luồng liệt kê ({} nếu thất bại)"""
         try:
-            while True:
-                response = self.service.files().list(
-                    q=f"'{folder_id}' in parents and trashed=false",
-                    fields='nextPageToken, files(id, name, mimeType, size, md5Checksum)',
-                    pageToken=page_token,
-                    pageSize=100
-                ).execute()
+            return self._list_children(group)
+        except Exception as e:
+            # Cả timeout socket (HTTP_TIMEOUT) và kết nối bị ngắt
+            # Không nghiêm trọng: các thư mục này sẽ được liệt kê từng cái
+            print(f"⚠️ Liệt kê theo nhóm thất bại: {e}")
+            return {}
 
-                items.extend(response.get('files', []))
-                page_token = response.get('nextPageToken')
+    def _prefetch_listings(self, folder_ids: List[str]):
+        """
+        Xếp hàng liệt kê các thư mục anh em theo nhóm LIST_BATCH_FOLDERS.
 
-                if not page_token:
-                    break
+        Chạy nền: thư mục con đầu tiên được xử lý ngay khi nhóm của nó về,
+        trong khi các nhóm sau vẫn đang được liệt kê.
+        """
+        for i in range(0, len(folder_ids), LIST_BATCH_FOLDERS):
+            group = folder_ids[i:i + LIST_BATCH_FOLDERS]
+            future = self.listing_executor.submit(self._list_group, group)
+            for folder_id in group:
+                self._listing_cache[folder_id] = future
+
+    def list_files_in_folder(self, folder_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Liệt kê tất cả file trong thư mục (None nếu liệt kê thất bại)"""
+        future = self._listing_cache.pop(folder_id, None)
+        if future is not None:
+            try:
+                children = future.result().get(folder_id)
+            except Exception:
+                children = None  # Bị close() hủy: liệt kê trực tiếp bên dưới
+            if children is not None:
+                return children
 
-            return items
+        try:
+            return self._list_children([folder_id])[folder_id]
 
-        except HttpError as e:
+        except (HttpError, OSError) as e:
             print(f"❌ Lỗi khi liệt kê files: {e}")
-            return []
+            return None
+
+    def _server_side_copy(
+        self,
+        item: Dict[str, Any],
+        backup_folder_id: str,
+        service
+    ) -> Optional[str]:
+        """
+        Sao chép file ngay trong Drive, không có byte nào đi qua Colab.
+
+        Returns:
+            Optional[str]: ID file đã sao chép, None nếu không thể sao chép
+            (bên gọi sẽ chuyển sang tải xuống + tải lên)
+        """
+        item_name = item['name']
+        original_md5 = item.get('md5Checksum')
+
+        for attempt in range(MAX_RETRIES):
+            if self.shutdown_event.is_set():
+                return None
+
+            # Kiểm tra circuit breaker
+            can_proceed, _ = self.circuit_breaker.can_proceed('copy')
+            if not can_proceed:
+                return None  # Hạn ngạch sao chép đang hồi: bên gọi chuyển sang tải xuống + tải lên
+
+            copied_id = None
+
+            try:
+                # Áp dụng giới hạn tốc độ toàn cục trước khi gọi API
+                self.global_rate_limiter.acquire()
+
+                copied = service.files().copy(
+                    fileId=item['id'],
+                    body={'name': item_name, 'parents': [backup_folder_id]},
+                    fields='id, md5Checksum'
+                ).execute()
+
+                copied_id = copied['id']
+
+                # Xác minh MD5 từ metadata - không cần băm lại
+                if original_md5 and copied.get('md5Checksum') != original_md5:
+                    raise Exception("MD5 checksum không khớp")
+
+                self._record_success('copy')
+                logger.info(f"✅ Đã sao chép: {item_name}")
+                return copied_id
+
+            except Exception as e:
+                # Dọn dẹp bản sao không qua được xác minh
+                if copied_id:
+                    try:
+                        service.files().delete(fileId=copied_id).execute()
+                    except:
+                        pass
+
+                if self._is_rate_limit_error(e):
+                    logger.warning(f"🚫 Gặp giới hạn tốc độ khi sao chép: {item_name}")
+                    self.global_rate_limiter.set_delay(min(self.global_rate_limiter.min_delay * 2, 10.0))
+                    if self._handle_rate_limit('copy'):
+                        return None
+
+                elif isinstance(e, HttpError) and e.resp.status in (400, 403, 404):
+                    # Không sao chép được (cannotCopyFile, khác tài khoản): tải xuống + tải lên
+                    return None
+
+                logger.warning(f"⚠️ Thử sao chép lần {attempt + 1}/{MAX_RETRIES} thất bại: {e}")
+
+                if attempt < MAX_RETRIES - 1:
+                    backoff = self.backoff.next_sleep()
+                    if self._is_rate_limit_error(e):
+                        backoff = max(backoff, 30)  # Ít nhất 30s cho lỗi rate limits
+                    logger.info(f"⏳ Thử lại sau {backoff:.1f}s...")
+                    time.sleep(backoff)
+
+        return None
+
+    def _record_backed_up_file(
+        self,
+        item: Dict[str, Any],
+        backup_id: str,
+        blake3_digest: Optional[str] = None
+    ):
+        """Ghi file đã sao lưu vào journal và cập nhật checkpoint"""
+        self._append_log(item['id'], {
+            'name': item['name'],
+            'type': 'file',
+            'size': item.get('size'),
+            'md5': item.get('md5Checksum'),
+            'blake3': blake3_digest,
+            'backup_id': backup_id,
+            'backup_time': self._now_iso()
+        })
+
+        self.backup_state.increment_processed()
+        self.backup_state.remove_from_pending(item['id'])
+
+    def _batch_copy(
+        self,
+        files: List[Dict[str, Any]],
+        backup_folder_id: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Sao chép phía máy chủ theo nhóm COPY_BATCH_SIZE file, mỗi nhóm trong
+        một batch HTTP request thay vì mỗi file một lượt files.copy.
+
+        Returns:
+            List[Dict[str, Any]]: Các file còn cần xử lý (không sao chép
+            được hoặc lỗi - xử lý tiếp theo từng file)
+        """
+        if not SERVER_SIDE_COPY:
+            return files
+
+        remaining = []
+        for start in range(0, len(files), COPY_BATCH_SIZE):
+            group = files[start:start + COPY_BATCH_SIZE]
+
+            can_proceed, _ = self.circuit_breaker.can_proceed('copy')
+            if self.shutdown_event.is_set() or not can_proceed:
+                remaining.extend(files[start:])
+                break
+
+            results = {}
+
+            def on_copy(request_id, response, exception):
+                results[request_id] = (response, exception)
+
+            batch = self.service.new_batch_http_request(callback=on_copy)
+            for item in group:
+                batch.add(
+                    self.service.files().copy(
+                        fileId=item['id'],
+                        body={'name': item['name'], 'parents': [backup_folder_id]},
+                        fields='id, md5Checksum'
+                    ),
+                    request_id=item['id']
+                )
+
+            try:
+                # Drive tính quota theo từng request con: mỗi cái một token
+                self.global_rate_limiter.acquire(len(group))
+                batch.execute()
+            except Exception as e:
+                logger.warning(f"⚠️ Sao chép theo batch thất bại: {e}")
+                remaining.extend(group)
+                if self._is_rate_limit_error(e):
+                    self._back_off_batch_copy()
+                continue
+
+            rate_limited = False
+            for item in group:
+                copied, error = results.get(item['id'], (None, None))
+                original_md5 = item.get('md5Checksum')
+
+                if copied and (not original_md5 or copied.get('md5Checksum') == original_md5):
+                    self._record_success('copy')
+                    self._count('copy', 'success')
+                    self._advance_progress(item.get('size'))
+                    self._record_backed_up_file(item, copied['id'])
+                    logger.info(f"✅ Đã sao chép: {item['name']}")
+                    continue
+
+                if copied:
+                    # MD5 không khớp: xóa bản sao, thử lại theo từng file
+                    try:
+                        self.service.files().delete(fileId=copied['id']).execute()
+                    except HttpError as e:
+                        logger.warning(f"⚠️ Không xóa được bản sao chưa xác minh của {item['name']} ({copied['id']}): {e}")
+                elif self._is_rate_limit_error(error):
+                    rate_limited = True
+                elif isinstance(error, HttpError) and error.resp.status in (400, 403, 404):
+                    # Không sao chép được (cannotCopyFile, khác tài khoản): tải xuống + tải lên
+                    self._no_copy_ids.add(item['id'])
+
+                remaining.append(item)
+
+            self._flush_log()
+
+            if rate_limited:
+                self._back_off_batch_copy()
+
+        return remaining
+
+    def _back_off_batch_copy(self):
+        """Giảm tốc độ toàn cục và chờ sau một batch sao chép bị giới hạn tốc độ"""
+        logger.warning("🚫 Gặp giới hạn tốc độ khi sao chép theo batch")
+        self.global_rate_limiter.set_delay(min(self.global_rate_limiter.min_delay * 2, 10.0))
+        self._handle_rate_limit('copy')
+
+        # Chờ giống các lần thử lại theo từng file, để nhóm kế tiếp không gửi ngay
+        # Tiến chuỗi jitter của luồng này, nên rate limit batch lặp lại sẽ chờ lâu hơn
+        backoff = max(self.backoff.next_sleep(), 30)  # Ít nhất 30s cho lỗi rate limits
+        logger.info(f"⏳ Batch sao chép tiếp theo sau {backoff:.1f}s...")
+        self.shutdown_event.wait(backoff)
+
+    def _download_into(
+        self,
+        item: Dict[str, Any],
+        media: StreamingMedia,
+        digests: Dict[str, str]
+    ) -> bool:
+        """Tải xuống item vào bộ đệm streaming (chạy trên download_executor)"""
+        ok = False
+        try:
+            ok = self.download_file(
+                item['id'],
+                item['name'],
+                item.get('size'),
+                media=media,
+                original_md5=item.get('md5Checksum'),
+                digests=digests
+            ) is not None
+            return ok
+        finally:
+            if ok:
+                media.finish()
+            else:
+                media.abort(TransferAborted(f"Tải xuống thất bại: {item['name']}"))
+
+    def _stream_file(
+        self,
+        item: Dict[str, Any],
+        backup_folder_id: str,
+        service,
+        digests: Dict[str, str]
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Tải xuống và tải lên đồng thời qua bộ đệm StreamingMedia.
+
+        Returns:
+            Tuple[bool, Optional[str]]: (tải xuống thành công, ID file đã tải lên)
+        """
+        media = StreamingMedia(
+            int(item['size']),
+            CHUNK_SIZE,
+            STREAM_SPOOL_SIZE,
+            self.local_temp_dir,
+            item.get('mimeType') or 'application/octet-stream',
+            md5=bool(item.get('md5Checksum')),
+            resumable=int(item['size']) >= SIMPLE_UPLOAD_MAX
+        )
+
+        try:
+            if not media.resumable():
+                # File nhỏ: tải lên một request vốn cần đủ byte trước, nên tải xuống
+                # ngay trên luồng này thay vì chuyển sang pool
+                if not self._download_into(item, media, digests):
+                    return False, None
+                download = None
+            else:
+                download = self.download_executor.submit(self._download_into, item, media, digests)
+
+            uploaded_id = self.upload_file(
+                None,
+                item['name'],
+                backup_folder_id,
+                item.get('md5Checksum'),
+                service=service,
+                media=media
+            )
+
+            upload_error = None
+            if not uploaded_id:
+                upload_error = TransferAborted(f"Tải lên thất bại: {item['name']}")
+                media.abort(upload_error)
+
+            if download is None:
+                return True, uploaded_id
+
+            downloaded = download.result()
+
+            # Tải xuống bị hủy vì tải lên bỏ cuộc: báo lỗi tải lên
+            if not downloaded and upload_error is not None and media.error is upload_error:
+                downloaded = True
+
+            return downloaded, uploaded_id
+
+        finally:
+            media.close()
 
     def process_single_file(
         self,
@@ -1017,96 +2177,112 @@ class DriveBackupManager:
 
         thread_service = None
         local_path = None
+        local_size = None
+        digests = {}
 
         try:
             # Lấy thread-local service
             thread_service = self._get_thread_local_service()
 
             # Kiểm tra xem đã sao lưu chưa
-            with self.log_lock:
-                if item_id in self.backup_log['backed_up_files']:
-                    print(f"⏭️ Bỏ qua (đã sao lưu): {item_name}")
-                    self.stats['download']['skipped'] += 1
-                    return True
+            if item_id in self._backed_up_ids:
+                logger.info(f"⏭️ Bỏ qua (đã sao lưu): {item_name}")
+                self._count('download', 'skipped')
+                self._advance_progress(file_size)
+                return True
 
-            # Tải xuống
-            local_path = self.download_file(
-                item_id,
-                item_name,
-                file_size,
-                service=thread_service
-            )
+            # Ưu tiên sao chép phía máy chủ: không có byte nào đi qua Colab
+            uploaded_id = None
+            if SERVER_SIDE_COPY and item_id not in self._no_copy_ids:
+                uploaded_id = self._server_side_copy(
+                    item,
+                    backup_folder_id,
+                    thread_service
+                )
 
-            if self.shutdown_event.is_set():
-                self.backup_state.add_pending(item)
-                return False
+            if uploaded_id:
+                self._count('copy', 'success')
+                self._advance_progress(file_size)
+            else:
+                if file_size is not None:
+                    # Đã biết kích thước: tải lên trong lúc tải xuống
+                    downloaded, uploaded_id = self._stream_file(
+                        item,
+                        backup_folder_id,
+                        thread_service,
+                        digests
+                    )
+                else:
+                    # Tải xuống
+                    result = self.download_file(
+                        item_id,
+                        item_name,
+                        file_size,
+                        original_md5=original_md5,
+                        digests=digests
+                    )
+                    downloaded = result is not None
+                    if downloaded:
+                        local_path, local_size = result
+                    uploaded_id = None
 
-            if not local_path or not os.path.exists(local_path):
-                self.stats['download']['failed'] += 1
-                self.backup_state.add_failed(item)
-                return False
+                if self.shutdown_event.is_set():
+                    self.backup_state.add_pending(item)
+                    return False
+
+                if not downloaded:
+                    self._count('download', 'failed')
+                    self.backup_state.add_failed(item)
+                    return False
+
+                self._count('download', 'success')
+
+                # Tải lên
+                if local_path:
+                    uploaded_id = self.upload_file(
+                        local_path,
+                        item_name,
+                        backup_folder_id,
+                        original_md5,
+                        service=thread_service,
+                        local_size=local_size
+                    )
 
-            self.stats['download']['success'] += 1
+                if self.shutdown_event.is_set():
+                    self.backup_state.add_pending(item)
+                    return False
 
-            # Tải lên
-            uploaded_id = self.upload_file(
-                local_path,
-                item_name,
-                backup_folder_id,
-                original_md5,
-                service=thread_service
-            )
+                if not uploaded_id:
+                    self._count('upload', 'failed')
+                    self.backup_state.add_failed(item)
+                    return False
 
-            if self.shutdown_event.is_set():
-                self.backup_state.add_pending(item)
-                return False
+                self._count('upload', 'success')
 
-            if not uploaded_id:
-                self.stats['upload']['failed'] += 1
-                self.backup_state.add_failed(item)
-                return False
-
-            self.stats['upload']['success'] += 1
-
-            # Lưu vào log (thao tác nguyên tử)
-            with self.log_lock:
-                self.backup_log['backed_up_files'][item_id] = {
-                    'name': item_name,
-                    'type': 'file',
-                    'size': file_size,
-                    'md5': original_md5,
-                    'backup_id': uploaded_id,
-                    'backup_time': datetime.now().isoformat()
-                }
+            # Lưu vào log và checkpoint
+            self._record_backed_up_file(item, uploaded_id, digests.get('blake3'))
 
             # Dọn dẹp file cục bộ
-            try:
-                os.remove(local_path)
-                local_path = None
-            except:
-                pass
-
-            # Checkpoint: Lưu log và tăng bộ đếm
-            self._save_log()
-            self.backup_state.increment_processed()
-            self.backup_state.remove_from_pending(item_id)
-
-            # Kiểm tra dọn dẹp bộ nhớ
-            self.memory_monitor.check_and_cleanup()
+            if local_path:
+                try:
+                    os.unlink(local_path)
+                    local_path = None
+                except OSError:
+                    pass
 
             return True
 
         except Exception as e:
-            print(f"❌ Lỗi khi xử lý {item_name}: {e}")
+            logger.error(f"❌ Lỗi khi xử lý {item_name}: {e}")
             self.backup_state.add_failed(item)
             return False
 
         finally:
             # Đảm bảo dọn dẹp file cục bộ
-            if local_path and os.path.exists(local_path):
+            if local_path:
                 try:
-                    os.remove(local_path)
-                except:
+                    os.unlink(local_path)
+                except OSError:
                     pass
 
     def process_files_batch(
@@ -1120,26 +2296,62 @@ class DriveBackupManager:
 
         print(f"\n🚀 Đang xử lý {len(files)} files...")
 
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_workers
-        ) as executor:
-            futures = {
-                executor.submit(
+        # Đã sao lưu (resume): bỏ qua tại đây thay vì gửi cho worker
+        todo = [f for f in files if f['id'] not in self._backed_up_ids]
+        skipped = len(files) - len(todo)
+        if skipped:
+            self._count('download', 'skipped', skipped)
+            print(f"⏭️ Đã bỏ qua {skipped} file đã sao lưu")
+        files = todo
+        if not files:
+            return
+
+        # Cửa sổ giới hạn: mỗi lúc chỉ gửi max_workers * 2 file,
+        # nên bộ nhớ là O(workers) thay vì O(files)
+        in_flight = set()
+        submitted = {}  # future -> file
+        window = self.max_workers * 2
+        completed = 0
+
+        # Import tại đây: chỉ cần khi một batch thực sự chạy
+        from tqdm.notebook import tqdm
+
+        # Một thanh tiến độ cho cả batch thay vì mỗi file một thanh
+        self._pbar = tqdm(
+            total=sum(int(f.get('size') or 0) for f in files),
+            desc=f"📥 {len(files)} files",
+            unit='B',
+            unit_scale=True
+        )
+
+        # Sao chép phía máy chủ theo batch trước; phần còn lại giao cho các worker
+        pending_files = iter(self._batch_copy(files, backup_folder_id))
+
+        while True:
+            while len(in_flight) < window and not self.shutdown_event.is_set():
+                file_item = next(pending_files, None)
+                if file_item is None:
+                    break
+                future = self.file_executor.submit(
                     self.process_single_file,
                     file_item,
                     backup_folder_id
-                ): file_item
-                for file_item in files
-            }
+                )
+                in_flight.add(future)
+                submitted[future] = file_item
 
-            completed = 0
+            if not in_flight:
+                break
 
-            for future in concurrent.futures.as_completed(futures):
-                if self.shutdown_event.is_set():
-                    print("\n⏸️ Đang tắt chương trình nhẹ nhàng...")
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    break
+            # Có timeout để nhận yêu cầu dừng mà không phải chờ một file xong
+            done, in_flight = concurrent.futures.wait(
+                in_flight,
+                timeout=1.0,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
 
+            for future in done:
+                self._pbar.set_postfix_str(submitted.pop(future)['name'][:40], refresh=False)
                 completed += 1
 
                 try:
@@ -1147,75 +2359,126 @@ class DriveBackupManager:
                 except Exception as e:
                     print(f"⚠️ Lỗi tương lai (Future exception): {e}")
 
+                # Checkpoint: fsync journal mỗi LOG_FLUSH_EVERY file hoặc LOG_FLUSH_INTERVAL giây
+                if (completed % LOG_FLUSH_EVERY == 0
+                        or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL):
+                    self._flush_log()
+
                 # Dọn dẹp bộ nhớ định kỳ
-                if completed % 20 == 0:
+                self._files_since_mem_check += 1
+                if self._files_since_mem_check >= MEMORY_CHECK_EVERY:
+                    self._files_since_mem_check = 0
                     if self.memory_monitor.check_and_cleanup():
                         print(f"♻️ Đã dọn dẹp bộ nhớ ({completed}/{len(files)})")
 
-        # Dọn dẹp cuối cùng cho các lô lớn
-        if len(files) > 50:
-            gc.collect()
+            if self.shutdown_event.is_set():
+                print("\n⏸️ Đang tắt chương trình nhẹ nhàng...")
+                # Các file chưa bắt đầu vẫn nằm trong danh sách chờ để khôi phục
+                not_started = [submitted[f] for f in in_flight if f.cancel()]
+                not_started.extend(pending_files)
+                self.backup_state.add_pending_many(not_started)
+                break
 
-    def backup_folder_recursive(
+        # Chờ các file đang xử lý dở (sau khi dừng giữa chừng)
+        concurrent.futures.wait(in_flight)
+        self._pbar.close()
+        self._pbar = None
+
+        # Lưu những gì đã xong (kể cả sau khi dừng giữa chừng)
+        self._flush_log()
+        self.backup_state.flush()
+
+    def _open_folder(
         self,
         source_folder_id: str,
-        backup_folder_id: str
-    ):
-        """Sao lưu đệ quy với quản lý trạng thái"""
-        if self.shutdown_event.is_set():
-            return
-
+        backup_folder_id: str,
+        folder_item: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Liệt kê một thư mục và bắt đầu liệt kê trước thư mục con (một frame của stack duyệt)"""
         # Liệt kê các mục
         items = self.list_files_in_folder(source_folder_id)
+        listed = items is not None
+        items = items or []
         print(f"\n📊 Tìm thấy {len(items)} mục trong thư mục")
 
         # Tách thư mục và file
-        folders = [
-            i for i in items
-            if i['mimeType'] == 'application/vnd.google-apps.folder'
-        ]
-        files = [
-            i for i in items
-            if i['mimeType'] != 'application/vnd.google-apps.folder'
+        folders, files = [], []
+        add_folder, add_file = folders.append, files.append
+        for i in items:
+            (add_folder if i['mimeType'] == FOLDER_MIME else add_file)(i)
+
+        # Bắt đầu liệt kê nền tất cả thư mục con chưa xử lý theo nhóm
+        pending_folders = [
+            i['id'] for i in folders
+            if i['id'] not in self._backed_up_ids
         ]
+        self._prefetch_listings(pending_folders)
 
-        # Xử lý thư mục đệ quy
-        for folder_item in folders:
-            if self.shutdown_event.is_set():
-                break
+        return {
+            'item': folder_item,  # None với thư mục gốc
+            'backup_id': backup_folder_id,
+            'folders': iter(folders),
+            'files': files,
+            'listed': listed  # False: liệt kê lỗi, không bao giờ đánh dấu thư mục đã xong
+        }
+
+    def backup_folder_recursive(
+        self,
+        source_folder_id: str,
+        backup_folder_id: str
+    ):
+        """
+        Sao lưu cây thư mục theo chiều sâu với quản lý trạng thái.
+
+        Duyệt bằng stack tường minh thay vì đệ quy, nên cây sâu không bị giới
+        hạn bởi recursion limit của Python. Thư mục chỉ được ghi là đã sao lưu
+        khi đã liệt kê được và thư mục con, file của nó xong mà không bị dừng.
+        Lần resume sau tạm dừng không duyệt lại thư mục; nó chỉ thử lại các
+        file còn pending hoặc failed trong trạng thái.
+        """
+        if self.shutdown_event.is_set():
+            return
 
-            item_id = folder_item['id']
-            item_name = folder_item['name']
+        stack = [self._open_folder(source_folder_id, backup_folder_id, None)]
 
-            # Bỏ qua nếu đã sao lưu
-            with self.log_lock:
-                if item_id in self.backup_log['backed_up_files']:
+        while stack and not self.shutdown_event.is_set():
+            frame = stack[-1]
+
+            # Xử lý thư mục theo chiều sâu
+            folder_item = next(frame['folders'], None)
+            if folder_item is not None:
+                item_id = folder_item['id']
+                item_name = folder_item['name']
+
+                # Bỏ qua nếu đã sao lưu
+                if item_id in self._backed_up_ids:
                     print(f"⏭️ Bỏ qua thư mục: {item_name}")
                     continue
 
-            print(f"\n📁 Đang xử lý thư mục: {item_name}")
+                print(f"\n📁 Đang xử lý thư mục: {item_name}")
 
-            # Tạo thư mục trong backup
-            new_folder_id = self.create_folder(item_name, backup_folder_id)
+                # Tạo thư mục trong backup
+                new_folder_id = self.create_folder(item_name, frame['backup_id'])
 
-            if new_folder_id:
-                # Đệ quy
-                self.backup_folder_recursive(item_id, new_folder_id)
+                if new_folder_id:
+                    stack.append(self._open_folder(item_id, new_folder_id, folder_item))
+                continue
 
-                # Đánh dấu thư mục đã sao lưu
-                with self.log_lock:
-                    self.backup_log['backed_up_files'][item_id] = {
-                        'name': item_name,
-                        'type': 'folder',
-                        'backup_id': new_folder_id,
-                        'backup_time': datetime.now().isoformat()
-                    }
-
-                self._save_log()
+            # Thư mục con đã xong: xử lý files theo lô
+            stack.pop()
+            if frame['files']:
+                self.process_files_batch(frame['files'], frame['backup_id'])
 
-        # Xử lý files theo lô
-        if files and not self.shutdown_event.is_set():
-            self.process_files_batch(files, backup_folder_id)
+            # Đánh dấu thư mục đã sao lưu
+            if (frame['item'] is not None and frame['listed']
+                    and not self.shutdown_event.is_set()):
+                self._append_log(frame['item']['id'], {
+                    'name': frame['item']['name'],
+                    'type': 'folder',
+                    'backup_id': frame['backup_id'],
+                    'backup_time': self._now_iso()
+                })
+                self._flush_log()
 
     def smart_backup(self) -> Optional[str]:
         """
@@ -1235,10 +2498,17 @@ class DriveBackupManager:
                 print("💡 Vui lòng quay lại sau để tiếp tục\n")
                 return None
 
+            # Thời gian chờ lưu lúc tạm dừng (circuit breaker khởi tạo lại mỗi lần chạy)
+            remaining = (snapshot.get('resumable_at') or 0) - time.time()
+            if remaining > 0:
+                print(f"\n⏰ Đang chờ hết giới hạn: còn {remaining / 3600:.1f} giờ")
+                print("💡 Vui lòng quay lại sau để tiếp tục\n")
+                return None
+
             # Tiếp tục
-            print("\n" + "="*80)
+            print("\n" + _RULE)
             print("🔄 PHÁT HIỆN TỰ ĐỘNG KHÔI PHỤC (AUTO-RESUME)")
-            print("="*80)
+            print(_RULE)
 
             backup_folder_id = snapshot.get('backup_folder_id')
             if not backup_folder_id:
@@ -1247,13 +2517,13 @@ class DriveBackupManager:
 
             print(f"📁 Thư mục sao lưu: {backup_folder_id}")
 
-            pending = snapshot.get('pending_files', [])
-            failed = snapshot.get('failed_files', [])
+            pending = snapshot.get('pending_files', {})
+            failed = snapshot.get('failed_files', {})
 
             print(f"📊 Đang chờ: {len(pending)} | Thất bại trước đó: {len(failed)}")
 
-            # Thử lại tất cả file đang chờ và thất bại
-            all_retry = pending + failed
+            # Thử lại tất cả file đang chờ và thất bại (mỗi file một lần, kể cả khi ở cả hai)
+            all_retry = list({**pending, **failed}.values())
 
             if all_retry:
                 print(f"\n🔄 Đang thử lại {len(all_retry)} files...")
@@ -1261,8 +2531,8 @@ class DriveBackupManager:
 
                 if not self.shutdown_event.is_set():
                     self.backup_state.update(
-                        pending_files=[],
-                        failed_files=[],
+                        pending_files={},
+                        failed_files={},
                         status='completed',
                         circuit_breaker_state='CLOSED'
                     )
@@ -1274,9 +2544,9 @@ class DriveBackupManager:
             return backup_folder_id
 
         # Sao lưu mới
-        print("\n" + "="*80)
+        print("\n" + _RULE)
         print("🆕 BẮT ĐẦU SAO LƯU MỚI")
-        print("="*80)
+        print(_RULE)
 
         # Lấy thông tin nguồn
         source_info = self.get_file_info(SOURCE_FOLDER_ID)
@@ -1320,13 +2590,15 @@ class DriveBackupManager:
 
     def print_stats(self):
         """In thống kê chi tiết"""
+        stats = self.stats
         print(f"\n📊 THỐNG KÊ CHI TIẾT:")
-        print("="*80)
-        print(f"Tải xuống: ✅ {self.stats['download']['success']} | "
-              f"❌ {self.stats['download']['failed']} | "
-              f"⏭️ {self.stats['download']['skipped']}")
-        print(f"Tải lên:   ✅ {self.stats['upload']['success']} | "
-              f"❌ {self.stats['upload']['failed']}")
+        print(_RULE)
+        print(f"Tải xuống: ✅ {stats['download']['success']} | "
+              f"❌ {stats['download']['failed']} | "
+              f"⏭️ {stats['download']['skipped']}")
+        print(f"Tải lên:   ✅ {stats['upload']['success']} | "
+              f"❌ {stats['upload']['failed']}")
+        print(f"Sao chép:  ✅ {stats['copy']['success']}")
 
         total_backed_up = len(self.backup_log['backed_up_files'])
         files_count = sum(
@@ -1353,23 +2625,38 @@ class DriveBackupManager:
             print(f"\nBộ nhớ: {mem_usage['percent']:.1f}% đã dùng "
                   f"({mem_usage['available_gb']:.1f}GB còn trống)")
 
-        print("="*80 + "\n")
+        print(_RULE + "\n")
 
     def get_backup_summary(self):
         """Lấy tóm tắt sao lưu"""
         snapshot = self.backup_state.get_snapshot()
 
-        print("\n" + "="*80)
+        print("\n" + _RULE)
         print("📊 TÓM TẮT SAO LƯU")
-        print("="*80)
+        print(_RULE)
         print(f"Trạng thái: {snapshot['status']}")
         print(f"Tổng đã xử lý: {snapshot['total_files_processed']}")
         print(f"Đang chờ: {len(snapshot.get('pending_files', []))}")
         print(f"Thất bại: {len(snapshot.get('failed_files', []))}")
         print(f"Chạy lần cuối: {self.backup_log.get('last_run', 'Chưa bao giờ')}")
-        print("="*80 + "\n")
+        print(_RULE + "\n")
 
 
+# Phân tích file trạng thái/log trên luồng phụ trong lúc chờ xác thực OAuth
+_preload_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+_preload_future = _preload_pool.submit(DriveBackupManager.preload, LOG_FILE, STATE_FILE)
+_preload_pool.shutdown(wait=False)
+
+# ============================================================
+# XÁC THỰC (AUTHENTICATION)
+# ============================================================
+
+print("🔐 Đang xác thực với Google Drive...")
+auth.authenticate_user()
+creds, _ = default()
+drive_service = build('drive', 'v3', credentials=creds, cache_discovery=False)
+print("✅ Xác thực thành công!\n")
+
 # ============================================================
 # THỰC THI CHÍNH (MAIN EXECUTION)
 # ============================================================
@@ -1380,7 +2667,8 @@ backup_manager = DriveBackupManager(
     log_file=LOG_FILE,
     state_file=STATE_FILE,
     max_workers=MAX_WORKERS,
-    manual_mode=MANUAL_RESUME_MODE
+    manual_mode=MANUAL_RESUME_MODE,
+    preloaded=_preload_future.result()
 )
 
 # Hiển thị trạng thái hiện tại
@@ -1390,20 +2678,26 @@ backup_manager.get_backup_summary()
 # CHẠY SAO LƯU (RUN BACKUP)
 # ============================================================
 
-print("\n" + "="*80)
-print("🎯 QUY TRÌNH KHUYẾN NGHỊ:")
-print("="*80)
-print("1. Chạy sao lưu bình thường")
-print("2. Nếu gặp lỗi giới hạn tốc độ (rate limit) → DỪNG RUNTIME")
-print("3. Đợi 24 giờ")
-print("4. Khởi động lại notebook → Tự động khôi phục (Auto-resume)")
-print("="*80 + "\n")
+print(_WORKFLOW_BANNER)
 
 print("🚀 ĐANG BẮT ĐẦU SAO LƯU...")
 start_time = time.time()
 
 # Chạy sao lưu thông minh
-backup_folder_id = backup_manager.smart_backup()
+# Thu gom toàn phần dừng mọi worker; ngưỡng gen0 cao để GC thế hệ chạy
+# thưa và dàn trải, chỉ thu gom một lần ở cuối. freeze() loại log đã
+# tải khỏi các lần thu gom đó.
+_gc_threshold = gc.get_threshold()
+gc.freeze()
+gc.set_threshold(50000, 20, 20)
+try:
+    backup_folder_id = backup_manager.smart_backup()
+finally:
+    # Kernel Colab sống lâu hơn lần chạy, chỉ atexit thì file tạm sẽ còn lại
+    backup_manager.close()
+    gc.set_threshold(*_gc_threshold)
+    gc.unfreeze()
+    gc.collect()
 
 end_time = time.time()
 
@@ -1421,13 +2715,7 @@ if backup_folder_id:
     backup_manager.get_backup_summary()
 
 elif backup_manager.shutdown_event.is_set():
-    print(f"\n💡 CÁC BƯỚC TIẾP THEO:")
-    print("="*80)
-    print("✅ Trạng thái đã được lưu an toàn")
-    print("✅ DỪNG RUNTIME NGAY LẬP TỨC (Runtime → Disconnect)")
-    print("✅ Đợi 24 giờ")
-    print("✅ Mở lại notebook → Chạy tất cả → Tự động khôi phục")
-    print("="*80 + "\n")
+    print(_NEXT_STEPS_BANNER)
 
 else:
     print("\n❌ SAO LƯU THẤT BẠI!")
@@ -1436,30 +2724,133 @@ else:
 # TIỆN ÍCH (UTILITIES)
 # ============================================================
 
+# path -> ((mtime_ns, size), JSON đã parse hoặc bản tóm tắt)
+_json_cache = {}
+
+# Đọc đồng thời file trạng thái và log cho view_all
+_io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='view')
+
+def _load_json_cached(path, summarize=None):
+    """
+    Parse file JSON, dùng lại kết quả trước nếu file chưa thay đổi.
+
+    Nếu có `summarize`, chỉ giữ summarize(document), nên tài liệu lớn được
+    giải phóng ngay sau khi parse thay vì nằm lại trong cache.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != key:
+        document = _read_json(path)
+        cached = (key, summarize(document) if summarize else document)
+        _json_cache[path] = cached
+    return cached[1]
+
+def _summarize_log(log):
+    """Chỉ giữ những gì view_log in ra từ snapshot log đã parse"""
+    summary = {'backed_up_files': len(log['backed_up_files'])}
+    if 'last_run' in log:
+        summary['last_run'] = log['last_run']
+    return summary
+
+def _load_log_summary():
+    """Số mục và lần chạy cuối của snapshot log, hoặc None nếu chưa có"""
+    try:
+        log_mtime = os.stat(LOG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    # File tóm tắt được ghi sau mỗi snapshot; cũ hơn nghĩa là đã lỗi thời
+    summary_file = os.path.splitext(LOG_FILE)[0] + '.summary.json'
+    try:
+        if os.stat(summary_file).st_mtime_ns >= log_mtime:
+            return _load_json_cached(summary_file)
+    except (OSError, ValueError):
+        pass
+    try:
+        return _load_json_cached(LOG_FILE, _summarize_log)
+    except FileNotFoundError:
+        return None
+
 def view_state():
     """Xem trạng thái hiện tại"""
-    if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, 'r') as f:
-            state = json.load(f)
-            print("\n📊 TRẠNG THÁI HIỆN TẠI:")
-            print(json.dumps(state, indent=2, ensure_ascii=False))
-
-def view_log():
-    """Xem log sao lưu"""
-    if os.path.exists(LOG_FILE):
-        with open(LOG_FILE, 'r') as f:
-            log = json.load(f)
-            print(f"\n📊 LOG SAO LƯU:")
-            print(f"Tổng số mục: {len(log['backed_up_files'])}")
-            print(f"Lần chạy cuối: {log.get('last_run', 'Chưa bao giờ')}")
+    # Ưu tiên trạng thái trong bộ nhớ thay vì đọc lại file
+    if 'backup_manager' in globals():
+        state = backup_manager.backup_state.get_snapshot()
+    else:
+        try:
+            state = _load_json_cached(STATE_FILE)
+        except FileNotFoundError:
+            return
+
+    print("\n📊 TRẠNG THÁI HIỆN TẠI:")
+    print(orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode())
+
+def view_log(recent: int = 20):
+    """Xem log sao lưu và các sự kiện theo file gần nhất"""
+    journal_file = os.path.splitext(LOG_FILE)[0] + '.jsonl'
+    if 'backup_manager' in globals():
+        log = backup_manager.backup_log
+        total = len(log['backed_up_files'])
+    else:
+        # File thiếu được phát hiện khi open/stat lỗi, không cần exists() trước
+        log = _load_log_summary()
+
+        # Các mục chưa gộp vào snapshot: mỗi dòng journal hoàn chỉnh là một mục,
+        # đếm theo từng khối bằng bytes.count (không tạo đối tượng cho mỗi dòng)
+        try:
+            with open(journal_file, 'rb', buffering=0) as f:
+                journaled = sum(
+                    block.count(b'\n') for block in iter(lambda: f.read(LOG_IO_BUFFER), b'')
+                )
+        except FileNotFoundError:
+            if log is None:
+                return
+            journaled = 0
+
+        log = log or {}
+        total = log.get('backed_up_files', 0) + journaled
+
+    print(f"\n📊 LOG SAO LƯU:")
+    print(f"Tổng số mục: {total}")
+    print(f"Lần chạy cuối: {log.get('last_run', 'Chưa bao giờ')}")
+
+    events = list(_recent_events)[-recent:]
+    if events:
+        print(f"\nSự kiện gần nhất ({len(events)}):")
+        for line in events:
+            print(f"  {line}")
+
+def view_all(recent: int = 20):
+    """Xem trạng thái và log, đọc cả hai file cùng lúc"""
+    if 'backup_manager' not in globals():
+        # Đọc song song hai file; các hàm xem bên dưới dùng lại cache đã parse
+        concurrent.futures.wait([
+            _io_pool.submit(_load_json_cached, STATE_FILE),
+            _io_pool.submit(_load_log_summary)
+        ])
+    view_state()
+    view_log(recent)
 
 def download_files():
-    """Tải xuống file trạng thái và log"""
-    from google.colab import files
-    for filename in [STATE_FILE, LOG_FILE]:
-        if os.path.exists(filename):
-            files.download(filename)
-            print(f"✅ Đã tải xuống: {filename}")
+    """Tải xuống file trạng thái và log trong một file zip (một lần truyền)"""
+    journal_file = os.path.splitext(LOG_FILE)[0] + '.jsonl'
+    # Mức 1: JSON vẫn nhỏ đi nhiều lần mà tốn ít CPU
+    bundle = os.path.join(tempfile.gettempdir(), 'driveguard_files.zip')
+    present = []
+    with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for filename in (STATE_FILE, LOG_FILE, journal_file):
+            try:
+                zf.write(filename, os.path.basename(filename))
+                present.append(filename)
+            except FileNotFoundError:
+                pass
+    if not present:
+        os.unlink(bundle)
+        return
+
+    files.download(bundle)
+    print(f"✅ Đã tải xuống: {', '.join(present)} ({os.path.basename(bundle)})")
 
 def get_circuit_breaker_status():
     """Lấy trạng thái circuit breaker"""
@@ -1467,32 +2858,23 @@ def get_circuit_breaker_status():
         status = backup_manager.circuit_breaker.get_status()
         print("\n🔌 TRẠNG THÁI CIRCUIT BREAKER:")
         print(f"  Trạng thái: {status['state']}")
-        print(f"  Lỗi: {status['failures_in_window']}/{status['threshold']}")
-        if status['last_failure']:
-            last = datetime.fromtimestamp(status['last_failure'])
-            print(f"  Lỗi cuối cùng: {last.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"  {'Thao tác':<10} {'Trạng thái':<10} {'Lỗi':<9} Lỗi cuối cùng")
+        for op, op_status in status['ops'].items():
+            last = op_status['last_failure']
+            last_text = datetime.fromtimestamp(last).strftime('%Y-%m-%d %H:%M:%S') if last else '-'
+            failures = f"{op_status['failures_in_window']}/{status['threshold']}"
+            print(f"  {op:<10} {op_status['state']:<10} {failures:<9} {last_text}")
 
 def force_reset_circuit_breaker():
     """Buộc reset circuit breaker (cẩn thận!)"""
     if 'backup_manager' in globals():
-        backup_manager.circuit_breaker.state = 'CLOSED'
-        backup_manager.circuit_breaker.failures.clear()
+        backup_manager.circuit_breaker.reset()
+        backup_manager.backoff.reset_all()
         backup_manager.backup_state.update(
             circuit_breaker_state='CLOSED',
-            last_rate_limit_time=None
+            last_rate_limit_time=None,
+            resumable_at=None
         )
         print("✅ Đã reset circuit breaker!")
 
-print("""
-================================================================================
-                        CÁC TIỆN ÍCH HỖ TRỢ (UTILITIES)
-================================================================================
-
-view_state()                    # Xem trạng thái sao lưu hiện tại
-view_log()                      # Xem log sao lưu
-download_files()                # Tải xuống file trạng thái + log
-get_circuit_breaker_status()    # Kiểm tra circuit breaker
-force_reset_circuit_breaker()   # Reset circuit breaker (cẩn thận!)
-
-================================================================================
-""")
+print(_UTILITIES_BANNER)